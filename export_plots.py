@@ -0,0 +1,315 @@
+"""
+    PlotDock과 같은 그래프를 화면 없이(offscreen) 만들어 PNG/SVG로 내보내는 명령줄 도구.
+    그래프마다 process pool의 worker 하나가 데이터를 읽고(DataLoadWorker와 같은 parser) 그려서 파일로 저장한다.
+
+        python export_plots.py session.json
+        python export_plots.py session.json --config config.json --jobs 8 --formats png,svg
+
+    session 파일 형식 (json):
+
+        {
+            "output_dir": "export",                 # 선택. output 경로의 기준 폴더
+            "formats": ["png", "svg"],              # 선택. 그래프마다 덮어쓸 수 있음
+            "width": 1600, "height": 1000,          # 선택. 픽셀 크기
+            "ssh": {"host": "...", "port": 22, "user": "...", "key_path": "..."},  # 선택. 없으면 config 파일의 SSH 설정
+            "plots": [
+                {
+                    "title": "Graph 0",
+                    "output": "graph0",             # 확장자 없이. 없으면 title
+                    "sources": [
+                        {"path": "/home/me/sim/out.csv", "x": "TIME", "ys": ["v(out)", "i(vdd)"],
+                         "length": 5000, "sweep_family": false, "title": "IF 0"},
+                        {"path": "/home/me/sim/layout.png", "pos": [0, 0, 10, 10], "opacity": 0.5, "z": 0}
+                    ]
+                }
+            ]
+        }
+
+    로컬에 있는 경로는 로컬 파일을, 없는 경로는 SSH 서버의 파일을 읽는다.
+"""
+
+import os, sys, json, time, logging, argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import multiprocessing
+
+# Qt를 import하기 전에 설정해야 창 없이 그릴 수 있음
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+DEFAULT_FORMATS = ["png"]
+DEFAULT_WIDTH = 1600
+DEFAULT_HEIGHT = 1000
+# worker 하나가 읽어 둘 파일 수 (여러 그래프가 같은 파일을 쓰면 다시 읽지 않음)
+FILE_CACHE_SIZE = 16
+
+class LocalFiles:
+
+    """DataLoadWorker가 SSHManager 대신 쓰는 로컬 파일 접근 (get_bytes, stat만 필요)"""
+
+    def get_bytes(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    def stat(self, path: str) -> os.stat_result:
+        return os.stat(path)
+
+# ---- worker process ----
+# worker마다 QApplication, SSH 연결, 읽은 파일을 하나씩 두고 그 worker가 맡는 그래프들이 공유
+_app = None
+_ssh = None
+_sshConfig: dict = None
+_ingest = None
+_files: dict[str, tuple[object, str]] = {}
+
+def _init_worker(ssh_config: dict, ingest_config: dict):
+    global _app, _sshConfig, _ingest
+    from PyQt6.QtWidgets import QApplication
+    from utils.CsvIngest import IngestOptions
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s [%(levelname)s] %(message)s")
+    _app = QApplication.instance() or QApplication(["export_plots"])
+    _sshConfig = ssh_config
+    _ingest = IngestOptions.from_config(ingest_config)
+
+def _file_access(path: str):
+    global _ssh
+    if os.path.exists(path): return LocalFiles()
+    if _ssh is None:
+        from utils.SSHManager import SSHManager
+        if not _sshConfig or not _sshConfig.get("host"):
+            raise FileNotFoundError(f"로컬에 없는 파일이고 SSH 설정이 없습니다: {path}")
+        _ssh = SSHManager(
+            _sshConfig["host"], int(_sshConfig.get("port") or 22), _sshConfig.get("user"),
+            _sshConfig.get("key_path") or None, _sshConfig.get("password")
+        )
+    return _ssh
+
+def _load(path: str, columns: list[str]) -> tuple[object, str]:
+
+    """path를 읽어 (data, file type). csv/lis는 LazyColumnTable로 두고 필요한 컬럼만 파싱한다."""
+
+    import threading
+    from utils.DataLoadWorker import DataLoadWorker
+
+    loaded = _files.get(path)
+    if loaded is None:
+        worker = DataLoadWorker(
+            _file_access(path), path, 0, threading.Event(), f"export{os.getpid()}",
+            lazy_columns=True, preload_columns=columns, ingest=_ingest
+        )
+        loaded = _files[path] = worker.load()
+        while len(_files) > FILE_CACHE_SIZE: _files.pop(next(iter(_files)))
+    return loaded
+
+def _plot_data(index: int, source: dict) -> dict:
+
+    """source 하나를 PlotDock.data 항목으로 (DataInterface.updatePlot과 같은 형식)"""
+
+    from utils.ColumnStore import ColumnStore, union_bounds
+    from utils.CurveFamily import CurveFamily, sweep_offsets
+
+    path = source["path"]
+    x_name, y_names = source.get("x"), list(source.get("ys", []))
+    data, file_type = _load(path, [x_name, *y_names] if x_name else [])
+    plot_data = {'title': source.get("title", f"IF {index}"), 'file_type': file_type}
+
+    if file_type == 'png':
+        plot_data['image'] = data
+        plot_data['image_pos'] = tuple(source.get("pos", (0.0, 0.0, 10.0, 10.0)))
+        plot_data['image_opacity'] = float(source.get("opacity", 1.0))
+        plot_data['image_z'] = int(source.get("z", 0))
+        return plot_data
+
+    missing = [c for c in [x_name, *y_names] if c not in data.columns]
+    if missing:
+        raise KeyError(f"{path}: 없는 컬럼 {missing}")
+    store = ColumnStore(data.load([x_name, *y_names]))
+    n = len(store) if source.get("length") is None else min(int(source["length"]), len(store))
+
+    x = store.get(x_name)[:n]
+    ys = {y_name: store.get(y_name)[:n] for y_name in y_names}
+    if source.get("sweep_family"):
+        offsets = sweep_offsets(x)
+        if len(offsets) > 1:
+            ys = {y_name: CurveFamily.from_sweeps(x, y, offsets) for y_name, y in ys.items()}
+
+    plot_data['x'] = x
+    plot_data['ys'] = ys
+    x_range = store.bounds(x_name, n)
+    y_range = union_bounds(store.bounds(y_name, n) for y_name in y_names)
+    plot_data['bounds'] = (*x_range, *y_range) if x_range is not None and y_range is not None else None
+    return plot_data
+
+def _export_svg(plotItem, path: str, title: str):
+
+    """
+        plotItem 영역을 QSvgGenerator로 그려 SVG로 저장.
+        (pyqtgraph SVGExporter는 Qt 6.11의 path 형식("... Z")을 읽지 못해 실패하므로 Qt의 SVG 출력을 그대로 사용)
+    """
+
+    from PyQt6.QtCore import QRectF, QSize
+    from PyQt6.QtGui import QPainter
+    from PyQt6.QtSvg import QSvgGenerator
+
+    source = plotItem.sceneBoundingRect()
+    generator = QSvgGenerator()
+    generator.setFileName(path)
+    generator.setTitle(title)
+    generator.setSize(QSize(int(source.width()), int(source.height())))
+    generator.setViewBox(QRectF(0, 0, source.width(), source.height()))
+    painter = QPainter(generator)
+    try:
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        plotItem.scene().render(painter, QRectF(0, 0, source.width(), source.height()), source)
+    finally:
+        painter.end()
+
+def render_plot(spec: dict) -> tuple[str, list[str], float]:
+
+    """
+        그래프 하나를 PlotDock으로 그려 spec의 형식들로 저장 (worker process에서 실행).
+
+        Returns:
+            tuple[str, list[str], float]: (title, 저장한 파일들, 걸린 시간(초))
+    """
+
+    import pyqtgraph.exporters
+    from PyQt6.QtCore import Qt
+    from ui.PlotDock import PlotDock
+
+    t0 = time.perf_counter()
+    title = spec.get("title", "Graph")
+    dock = PlotDock(title, None)
+    try:
+        # 화면에 그리지는 않고 layout(view 크기)만 잡음
+        dock.setAttribute(Qt.WidgetAttribute.WA_DontShowOnScreen)
+        dock.resize(int(spec["width"]), int(spec["height"]))
+        # hover 라벨/marker는 그림에 넣지 않음
+        dock.setHoverEnabled(False)
+        dock.show()
+        _app.processEvents()
+
+        for i, source in enumerate(spec.get("sources", [])):
+            dock.data[i] = _plot_data(i, source)
+        dock.scheduleRefresh()
+        dock.renderNow()
+
+        plotItem = dock.plotWidget.getPlotItem()
+        written = []
+        os.makedirs(os.path.dirname(spec["output"]) or ".", exist_ok=True)
+        for fmt in spec["formats"]:
+            path = f"{spec['output']}.{fmt}"
+            if fmt == "svg":
+                _export_svg(plotItem, path, title)
+            else:
+                exporter = pyqtgraph.exporters.ImageExporter(plotItem)
+                exporter.parameters()['width'] = int(spec["width"])
+                exporter.export(path)
+            written.append(path)
+        return title, written, time.perf_counter() - t0
+    finally:
+        dock.deleteLater()
+        _app.processEvents()
+
+# ---- main process ----
+def load_session(session_path: str, formats: list[str] = None) -> list[dict]:
+
+    """session 파일의 그래프 목록을 기본값(크기, 형식, 출력 경로)을 채운 spec 리스트로"""
+
+    with open(session_path, "r", encoding="utf-8") as f:
+        session: dict = json.load(f)
+
+    output_dir = session.get("output_dir", "export")
+    specs = []
+    for i, plot in enumerate(session.get("plots", [])):
+        spec = dict(plot)
+        spec.setdefault("title", f"Graph {i}")
+        spec.setdefault("width", session.get("width", DEFAULT_WIDTH))
+        spec.setdefault("height", session.get("height", DEFAULT_HEIGHT))
+        spec["formats"] = formats or spec.get("formats") or session.get("formats") or DEFAULT_FORMATS
+        name = spec.get("output") or "".join(c if c.isalnum() or c in "-_." else "_" for c in spec["title"])
+        spec["output"] = os.path.join(output_dir, name)
+        specs.append(spec)
+    return specs
+
+def ssh_settings(session_path: str, config_path: str) -> dict:
+
+    """session의 "ssh" 항목, 없으면 config.json(메인 프로그램의 SSH Settings 탭)의 값"""
+
+    with open(session_path, "r", encoding="utf-8") as f:
+        ssh = json.load(f).get("ssh")
+    if ssh: return ssh
+    if not os.path.exists(config_path): return {}
+    with open(config_path, "r") as f:
+        config_dict: dict = json.load(f)
+    return {
+        "host": config_dict.get("hostLineEdit", ""),
+        "port": config_dict.get("portLineEdit", ""),
+        "user": config_dict.get("userIdLineEdit", ""),
+        "key_path": config_dict.get("keyPathLineEdit", ""),
+    }
+
+def ingest_settings(config_path: str) -> dict:
+    if not os.path.exists(config_path): return {}
+    with open(config_path, "r") as f:
+        return json.load(f)
+
+def export_all(specs: list[dict], ssh_config: dict, ingest_config: dict, jobs: int) -> int:
+
+    """
+        모든 그래프를 jobs개의 process로 나누어 내보냄. (jobs가 1이면 현재 process에서)
+        실패한 그래프는 기록만 하고 나머지는 계속 진행한다.
+
+        Returns:
+            int: 실패한 그래프 수
+    """
+
+    failed = 0
+    t0 = time.perf_counter()
+
+    if jobs <= 1:
+        _init_worker(ssh_config, ingest_config)
+        results = []
+        for spec in specs:
+            try: results.append(render_plot(spec))
+            except Exception as e:
+                failed += 1
+                logging.error(f"{spec['title']}: {e}")
+        for title, written, seconds in results:
+            logging.info(f"{title}: {', '.join(written)} ({seconds * 1e3:.0f} ms)")
+    else:
+        # Qt는 fork된 process에서 안전하지 않으므로 spawn (Windows와도 같은 동작)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(jobs, mp_context=context, initializer=_init_worker, initargs=(ssh_config, ingest_config)) as pool:
+            futures = {pool.submit(render_plot, spec): spec for spec in specs}
+            for future in as_completed(futures):
+                try:
+                    title, written, seconds = future.result()
+                    logging.info(f"{title}: {', '.join(written)} ({seconds * 1e3:.0f} ms)")
+                except Exception as e:
+                    failed += 1
+                    logging.error(f"{futures[future]['title']}: {e}")
+
+    logging.info(f"Exported {len(specs) - failed} of {len(specs)} plots in {time.perf_counter() - t0:.1f} s ({jobs} jobs)")
+    return failed
+
+def main(argv: list[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Biwa-DataPlotter 그래프를 화면 없이 PNG/SVG로 내보냄")
+    parser.add_argument("session", help="그래프 목록 session 파일 (json)")
+    parser.add_argument("--config", default="config.json", help="SSH/csv 설정을 읽을 config 파일 (기본값: config.json)")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="동시에 그릴 process 수 (기본값: CPU 수)")
+    parser.add_argument("--formats", default=None, help="session의 형식 대신 사용할 형식들 (예: png,svg)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
+    formats = [f.strip().lower() for f in args.formats.split(",") if f.strip()] if args.formats else None
+    specs = load_session(args.session, formats)
+    if not specs:
+        logging.info("내보낼 그래프가 없습니다.")
+        return 0
+
+    jobs = max(1, min(args.jobs, len(specs)))
+    failed = export_all(specs, ssh_settings(args.session, args.config), ingest_settings(args.config), jobs)
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
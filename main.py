@@ -8,8 +8,11 @@ from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont, QShortcut, QKeySequence, QAction, QPixmap, QIcon
 
 # utils에서 import
-from utils.utils import lisToCSV, patch_modelcard_content_inplace
+from utils.utils import lisToCSV
 from utils.HSPICEParser import HSPICEParser
+from utils.HistoryStore import HistoryStore
+from utils.CsvIngest import IngestOptions
+from utils.DatasetRegistry import DatasetRegistry
 
 # ui에서 import
 from ui.ParamRowWidget import ParamRowWidget
@@ -17,10 +20,12 @@ from ui.tabs.SSHSettingsTab import createSSHSettingsTab, connectButtonHandler
 from ui.tabs.PlotSettingsTab import createPlotSettingsTab
 from ui.tabs.QuickChangeTab import createQuickChangeTab
 from ui.tabs.QuickParamsTab import initializeQuickParamsTab, createQuickParamsTab
+from ui.tabs.FittingTab import createFittingTab
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from utils.SSHManager import SSHManager
+    from utils.RemoteFileCache import RemoteFileCache
 
     # ui에서 import
     from ui.PlotDock import PlotDock
@@ -47,9 +52,16 @@ class MainWindow(QMainWindow):
 
         # 필요 변수 선언
         self.ssh: SSHManager = None
+        self.remoteFileCache: RemoteFileCache = None
         self.serverFileWatcherThread = None
         self.data = None
-        self.data_history = []
+        self.data_history = HistoryStore()
+        self.historyMemoryBudgetMB = 512
+        self.lazyColumnLoading = True
+        self.ingestOptions = IngestOptions()
+        self.streamLoading = True
+        # 같은 서버 파일을 보는 DataInterface끼리 감시/다운로드/파싱 공유
+        self.datasetRegistry = DatasetRegistry()
         self.plotIndex = 0
         self.fav_params = set()
         self.config_path = "./config.json"
@@ -61,11 +73,13 @@ class MainWindow(QMainWindow):
             'userIdLineEdit',
             'keyPathLineEdit',
             'editorFilePathLineEdit',
-            'outputParamsFileNameLineEdit'
+            'outputParamsFileNameLineEdit',
+            'fitWorkDirLineEdit'
         ]
 
         self.textEditComponents = [
-            'shellCommandTextEdit'
+            'shellCommandTextEdit',
+            'fitCommandTextEdit'
         ]
 
         self.checkBoxComponents = [
@@ -152,6 +166,7 @@ class MainWindow(QMainWindow):
 
         initializeQuickParamsTab(self)
         createQuickParamsTab(self)
+        createFittingTab(self)
 
         # *************** 단축키 설정 **************
         self.shellCommandShortcut = QShortcut(QKeySequence("F6"), self)
@@ -197,10 +212,9 @@ class MainWindow(QMainWindow):
                 # 현재 에디터 내용을 읽어 서버 측 경로로 저장
                 self.showTooltip("Saving file...")
                 logging.info(f"Saving file to: {file_path}")
-                local_file_path = './temp/editor_file.txt'
-                with open(local_file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                self.ssh.put_file(local_file_path, file_path)
+                self.ssh.put_bytes(content.encode('utf-8'), file_path)
+                # 같은 크기로 1초 안에 다시 저장하면 stat이 같아 캐시가 이전 내용을 돌려주므로 캐시에서 제거
+                if self.remoteFileCache: self.remoteFileCache.invalidate(file_path)
                 self.showTooltip("File saved successfully.")
                 logging.info(f"File saved successfully: {file_path}")
             except Exception as e:
@@ -219,24 +233,17 @@ class MainWindow(QMainWindow):
                 self.showTooltip("Saving params file...")
                 logging.info(f"Saving params to: {output_file_name}")
 
-                # 템플릿 파일 로드
-                templateFilePath = './temp/params_file.txt'
-                with open(templateFilePath, 'r', encoding='utf-8') as f:
-                    template_content = f.read()
-
                 # 오직 key:value 쌍만 추출된 dict 생성
                 params_simple = {key: entry.get("value", "") for key, entry in self.params.items()}
 
-                # 모델 카드 생성
-                content = patch_modelcard_content_inplace(template_content, params_simple, section=None, insert_missing=True)
-
-                # 로컬 임시 파일에 작성
-                local_file_path = './temp/params_output.txt'
-                with open(local_file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                # 모델 카드 생성: 로드 시 인덱싱된 문서에서 바뀐 값만 교체
+                if self.modelcardDocument is None:
+                    raise FileNotFoundError("Params template is not loaded.")
+                content = self.modelcardDocument.render(params_simple)
 
-                # 서버로 업로드
-                self.ssh.put_file(local_file_path, output_file_name)
+                # 서버로 업로드 (임시 이름으로 쓴 뒤 rename)
+                self.ssh.put_bytes(content.encode('utf-8'), output_file_name)
+                if self.remoteFileCache: self.remoteFileCache.invalidate(output_file_name)
 
                 self.showTooltip("Params file saved successfully.")
                 logging.info(f"Params file saved successfully: {output_file_name}")
@@ -280,7 +287,7 @@ class MainWindow(QMainWindow):
 
         # 데이터 히스토리에 현재 데이터 추가
         if self.data is not None:
-            self.data_history.append(self.data.copy())
+            self.data_history.append(self.data)
             logging.info(f"Data history updated. Total entries: {len(self.data_history)}")
 
         # 마지막 갱신 시간 기록
@@ -348,6 +355,10 @@ class MainWindow(QMainWindow):
             for comp in self.comboBoxComponents: config_dict[comp] = []
             config_dict["favorite_params"] = []
             config_dict["data_path_history"] = []
+            config_dict["history_memory_budget_mb"] = self.historyMemoryBudgetMB
+            config_dict["lazy_column_loading"] = self.lazyColumnLoading
+            config_dict.update(self.ingestOptions.to_config())
+            config_dict["stream_loading"] = self.streamLoading
 
             with open(self.config_path, "w") as config_file:
                 json.dump(config_dict, config_file, indent=4)
@@ -364,6 +375,11 @@ class MainWindow(QMainWindow):
                 for comp in self.comboBoxComponents: getattr(self, comp).addItems(config_dict.get(comp, []))
                 self.fav_params = set(config_dict.get("favorite_params", []))
                 self.dataPathHistory = list(config_dict.get("data_path_history", []))
+                self.historyMemoryBudgetMB = float(config_dict.get("history_memory_budget_mb", self.historyMemoryBudgetMB))
+                self.data_history.set_memory_budget(self.historyMemoryBudgetMB)
+                self.lazyColumnLoading = bool(config_dict.get("lazy_column_loading", self.lazyColumnLoading))
+                self.ingestOptions = IngestOptions.from_config(config_dict)
+                self.streamLoading = bool(config_dict.get("stream_loading", self.streamLoading))
 
     def saveSettings(self):
 
@@ -379,12 +395,24 @@ class MainWindow(QMainWindow):
             config_dict[comp] = items
         config_dict["favorite_params"] = list(self.fav_params)
         config_dict["data_path_history"] = self.dataPathHistory
+        config_dict["history_memory_budget_mb"] = self.historyMemoryBudgetMB
+        config_dict["lazy_column_loading"] = self.lazyColumnLoading
+        config_dict.update(self.ingestOptions.to_config())
+        config_dict["stream_loading"] = self.streamLoading
 
         with open(self.config_path, "w") as config_file:
             json.dump(config_dict, config_file, indent=4)
         logging.info("설정 저장 완료")
 
     def closeEvent(self, a0):
+        # 실행 중인 fitting/민감도 분석이 SSH 연결과 히스토리를 정리하기 전에 끝나도록 중지하고 기다림
+        for thread in (self.fitThread, self.sensitivityThread):
+            if thread is not None:
+                thread.stop()
+                thread.wait()
+        for plotInterface in self.plotInterfaces: plotInterface.dataHistory.clear()
+        self.datasetRegistry.close()
+        self.data_history.clear()
         self.saveSettings()
         super().closeEvent(a0)
 
@@ -0,0 +1,33 @@
+import threading
+
+import pytest
+
+from utils.CsvIngest import IngestOptions, iter_csv_chunks, read_csv
+from utils.DataLoadWorker import DataLoadWorker
+
+HEADER_ONLY = b"# simulator header\ntime,v(out),v(out)\n"
+COLUMNS = ["time", "v(out)", "v(out).1"]
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+@pytest.mark.parametrize("chunk_rows", [0, 1000])
+def test_header_only_csv_keeps_columns(engine, chunk_rows):
+    if engine == "pyarrow": pytest.importorskip("pyarrow")
+    options = IngestOptions(engine, "float64", chunk_rows)
+
+    chunks = list(iter_csv_chunks(HEADER_ONLY, options))
+    assert [c.columns.tolist() for c in chunks] == [COLUMNS]
+
+    df, _stats = read_csv(HEADER_ONLY, options)
+    assert df.columns.tolist() == COLUMNS and len(df) == 0
+
+    df, _stats = read_csv(HEADER_ONLY, options, usecols=["time"])
+    assert df.columns.tolist() == ["time"] and len(df) == 0
+
+def test_header_only_csv_streams_as_empty_frame():
+    worker = DataLoadWorker(None, "/remote/out.csv", 1, threading.Event(), "test", stream=True)
+    received = []
+    worker.signals.chunk.connect(lambda generation, data, file_type: received.append(data))
+
+    df = worker._stream_csv(HEADER_ONLY, "csv", None, None)
+    assert df.columns.tolist() == COLUMNS and len(df) == 0
+    assert [(part.columns.tolist(), columns) for part, columns in received] == [(COLUMNS, COLUMNS)]
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from utils.HistoryStore import HistoryStore
+
+N = 8192  # float64 컬럼 하나 = 64 KiB
+
+def _run(i: int) -> pd.DataFrame:
+    t = np.arange(N, dtype=np.float64)
+    return pd.DataFrame({"t": t, "y": t * (i + 1)})
+
+def test_budget_holds_when_latest_run_column_is_least_recently_used(tmp_path):
+    store = HistoryStore(memory_budget_mb=4, spill_dir=str(tmp_path))
+    for i in range(6): store.append(_run(i))
+
+    # playback처럼 최근 run 컬럼을 먼저, 과거 run 컬럼을 나중에 읽으면 최근 run 컬럼이 LRU 맨 앞에 남음
+    store.column(-1, "y")
+    for i in range(len(store) - 1): store.column(i, "y")
+    store.set_memory_budget(0.25)
+    assert store.resident_bytes <= store.memory_budget
+
+    for i in range(6, 12):
+        store.append(_run(i))
+        store.column(-1, "y")
+        for j in range(len(store) - 1): store.column(j, "y")
+        assert store.resident_bytes <= store.memory_budget
+
+    # 내보낸 과거 run도 그대로 읽힘
+    assert np.array_equal(store.column(0, "y"), _run(0)["y"].to_numpy())
+    assert np.array_equal(store[-1]["y"].to_numpy(), _run(11)["y"].to_numpy())
+
+def test_bounds_are_cached_per_column_and_survive_spill(tmp_path):
+    store = HistoryStore(memory_budget_mb=0.25, spill_dir=str(tmp_path))
+    for i in range(4): store.append(_run(i))
+
+    assert store.bounds(0, "y") == (0.0, float(N - 1))
+    assert store.bounds(3, "y") == (0.0, 4.0 * (N - 1))
+    assert store.bounds(3, "y", n=10) == (0.0, 36.0)
+    assert store.bounds(0, "missing") is None
+    assert store.bounds(0, "missing", load=False) is None
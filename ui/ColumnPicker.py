@@ -0,0 +1,217 @@
+import re
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QComboBox, QListView, QLabel, QPushButton
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+
+class ColumnListModel(QAbstractListModel):
+
+    """
+        체크 가능한 컬럼 이름 목록 모델.
+        체크 상태는 이름으로 저장하므로, 컬럼 목록이 바뀌어도 남아 있는 컬럼의 체크는 유지된다.
+        필터는 모델 안에서 보이는 행의 index 리스트로 처리한다. (QListView는 보이는 행만 그림)
+    """
+
+    # (체크 여부) - 사용자가 체크를 바꿀 때
+    checkedChanged = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns: list[str] = []
+        self._lower: list[str] = []
+        self._checked: set[str] = set()
+        self._visible: list[int] = []
+        self._filterText = ""
+        self._filterMode = "Prefix"
+
+    # ---- QAbstractListModel ----
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._visible)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid(): return None
+        name = self._columns[self._visible[index.row()]]
+        if role == Qt.ItemDataRole.DisplayRole or role == Qt.ItemDataRole.ToolTipRole:
+            return name
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if name in self._checked else Qt.CheckState.Unchecked
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole: return False
+        name = self._columns[self._visible[index.row()]]
+        checked = Qt.CheckState(value) == Qt.CheckState.Checked
+        if checked == (name in self._checked): return False
+        if checked: self._checked.add(name)
+        else: self._checked.discard(name)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self.checkedChanged.emit(checked)
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid(): return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+
+    # ---- 컬럼 / 체크 ----
+    def columns(self) -> list[str]:
+        return self._columns
+
+    def setColumns(self, columns: list[str]) -> bool:
+
+        """
+            컬럼 목록을 교체. 같은 목록이면 아무것도 하지 않음.
+
+            Returns:
+                bool: 목록이 바뀌었으면 True
+        """
+
+        columns = list(columns)
+        if columns == self._columns: return False
+        self.beginResetModel()
+        self._columns = columns
+        self._lower = [c.lower() for c in columns]
+        self._checked &= set(columns)
+        self._visible = self._match(self._filterText, self._filterMode)
+        self.endResetModel()
+        return True
+
+    def checkedColumns(self) -> list[str]:
+
+        """체크된 컬럼 이름 (컬럼 순서)"""
+
+        if not self._checked: return []
+        return [c for c in self._columns if c in self._checked]
+
+    def setCheckedColumns(self, names):
+
+        """체크 상태를 names로 교체 (signal 없음)"""
+
+        self._checked = set(names) & set(self._columns)
+        if self._visible:
+            self.dataChanged.emit(self.index(0), self.index(len(self._visible) - 1), [Qt.ItemDataRole.CheckStateRole])
+
+    # ---- 필터 ----
+    def _match(self, text: str, mode: str) -> list[int]:
+        if not text: return list(range(len(self._columns)))
+        if mode == "Regex":
+            pattern = re.compile(text, re.IGNORECASE)
+            return [i for i, c in enumerate(self._columns) if pattern.search(c)]
+        prefix = text.lower()
+        return [i for i, c in enumerate(self._lower) if c.startswith(prefix)]
+
+    def setFilter(self, text: str, mode: str = "Prefix"):
+
+        """
+            보이는 행을 필터링. mode는 "Prefix"(대소문자 무시 접두사) 또는 "Regex"(대소문자 무시 re.search).
+
+            Raises:
+                re.error: 잘못된 정규식 (이 경우 기존 필터 유지)
+        """
+
+        visible = self._match(text, mode)
+        self.beginResetModel()
+        self._filterText, self._filterMode = text, mode
+        self._visible = visible
+        self.endResetModel()
+
+    def visibleCount(self) -> int:
+        return len(self._visible)
+
+    def setVisibleChecked(self, checked: bool):
+
+        """현재 필터에 보이는 컬럼을 모두 체크/해제"""
+
+        names = {self._columns[i] for i in self._visible}
+        before = len(self._checked)
+        if checked: self._checked |= names
+        else: self._checked -= names
+        if len(self._checked) == before: return
+        if self._visible:
+            self.dataChanged.emit(self.index(0), self.index(len(self._visible) - 1), [Qt.ItemDataRole.CheckStateRole])
+        self.checkedChanged.emit(checked)
+
+class ColumnPicker(QWidget):
+
+    """
+        검색 가능한 y축 컬럼 선택 위젯 (QListView + ColumnListModel).
+        컬럼 수와 관계없이 위젯 수가 일정하고, 화면에 보이는 행만 그린다.
+
+        Args:
+            parent (QWidget, optional): 부모 위젯
+    """
+
+    # (체크 여부) - 사용자가 체크를 바꿀 때
+    checkedChanged = pyqtSignal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+
+        self.model = ColumnListModel(self)
+        self.model.checkedChanged.connect(self.checkedChanged)
+        self.model.checkedChanged.connect(lambda _checked: self._updateCountLabel())
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # 필터 입력 + 모드
+        filterLayout = QHBoxLayout()
+        self.filterLineEdit = QLineEdit()
+        self.filterLineEdit.setPlaceholderText("Filter columns...")
+        self.filterLineEdit.setClearButtonEnabled(True)
+        self.filterModeComboBox = QComboBox()
+        self.filterModeComboBox.addItems(["Prefix", "Regex"])
+        filterLayout.addWidget(self.filterLineEdit)
+        filterLayout.addWidget(self.filterModeComboBox)
+        layout.addLayout(filterLayout)
+
+        # 목록 (uniformItemSizes: 행 높이를 한 번만 계산)
+        self.listView = QListView()
+        self.listView.setModel(self.model)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setMinimumHeight(160)
+        layout.addWidget(self.listView)
+
+        # 보이는/전체/체크 개수 + 보이는 항목 일괄 체크
+        bottomLayout = QHBoxLayout()
+        self.countLabel = QLabel()
+        checkVisibleButton = QPushButton("Check Shown")
+        uncheckVisibleButton = QPushButton("Uncheck Shown")
+        checkVisibleButton.clicked.connect(lambda: self.model.setVisibleChecked(True))
+        uncheckVisibleButton.clicked.connect(lambda: self.model.setVisibleChecked(False))
+        bottomLayout.addWidget(self.countLabel)
+        bottomLayout.addStretch(1)
+        bottomLayout.addWidget(checkVisibleButton)
+        bottomLayout.addWidget(uncheckVisibleButton)
+        layout.addLayout(bottomLayout)
+
+        self.filterLineEdit.textChanged.connect(self._applyFilter)
+        self.filterModeComboBox.currentTextChanged.connect(self._applyFilter)
+        self._updateCountLabel()
+
+    def _applyFilter(self, *_):
+        try:
+            self.model.setFilter(self.filterLineEdit.text(), self.filterModeComboBox.currentText())
+            self.filterLineEdit.setStyleSheet("")
+            self.filterLineEdit.setToolTip("")
+        except re.error as e:
+            # 입력 중인 정규식이 아직 완성되지 않은 경우: 기존 결과 유지
+            self.filterLineEdit.setStyleSheet("color: red;")
+            self.filterLineEdit.setToolTip(f"Invalid regex: {e}")
+        self._updateCountLabel()
+
+    def _updateCountLabel(self):
+        total = len(self.model.columns())
+        self.countLabel.setText(f"{self.model.visibleCount()} / {total} shown, {len(self.model.checkedColumns())} checked")
+
+    def setColumns(self, columns: list[str]) -> bool:
+
+        """컬럼 목록 교체 (남아 있는 컬럼의 체크는 유지). 바뀌었으면 True."""
+
+        changed = self.model.setColumns(columns)
+        if changed: self._updateCountLabel()
+        return changed
+
+    def checkedColumns(self) -> list[str]:
+        return self.model.checkedColumns()
+
+    def setCheckedColumns(self, names):
+        self.model.setCheckedColumns(names)
+        self._updateCountLabel()
@@ -1,19 +1,33 @@
-import logging, math, os, time
-from PyQt6.QtWidgets import QFrame, QVBoxLayout, QGridLayout, QLabel, QCheckBox, QComboBox, QSlider, QWidget, QLineEdit, QPushButton, QFormLayout, QToolTip, QApplication, QGroupBox
-from PyQt6.QtCore import QEvent, QObject, Qt
+import logging, math, time
+from PyQt6.QtWidgets import QFrame, QVBoxLayout, QHBoxLayout, QLabel, QCheckBox, QComboBox, QSlider, QWidget, QLineEdit, QPushButton, QFormLayout, QToolTip, QApplication, QGroupBox
+from PyQt6.QtCore import QEvent, QObject, Qt, QTimer
 import pyqtgraph as pg
 import pandas as pd, numpy as np
 
+# ui
+from ui.ColumnPicker import ColumnPicker
+
 # utils
-from utils.utils import lisToCSV, clear_layout, qimage_to_rgba_numpy
-from utils.FileWatcherThread import FileWatcherThread
+from utils.utils import clear_layout
+from utils.DatasetRegistry import DatasetRegistry, SharedDataset
+from utils.HistoryStore import HistoryStore
+from utils.ColumnStore import ColumnStore, as_float64_column, union_bounds
+from utils.CurveFamily import CurveFamily, sweep_offsets
+from utils.LazyColumnTable import LazyColumnTable
+from utils.CsvIngest import IngestOptions
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from utils.SSHManager import SSHManager
+    from ui.PlotDock import PlotDock
+
+# streaming 로드 중 플롯을 다시 그리는 최소 간격(초)
+STREAM_REPAINT_INTERVAL = 0.2
+# 히스토리 재생 시 run 하나를 보여 주는 시간(ms)
+PLAYBACK_INTERVAL_MS = 50
 
 class DataInterface:
 
-    def __init__(self, ssh: "SSHManager", plotDocks: list[pg.PlotWidget], dataPathHistory: list[str]):
+    def __init__(self, ssh: "SSHManager", plotDocks: list[pg.PlotWidget], dataPathHistory: list[str], historyMemoryBudgetMB: float = 512, lazyColumns: bool = False, ingestOptions: IngestOptions = None, streamLoading: bool = False, datasetRegistry: DatasetRegistry = None):
         
         """
             DataInterface 초기화 메서드
@@ -22,6 +36,11 @@ class DataInterface:
                 ssh (SSHManager): SSHManager 인스턴스 (서버와 통신용)
                 plotDocks (list[pg.PlotWidget]): 데이터를 표시할 PlotDock 위젯 리스트
                 dataPathHistory (list[str]): 이전에 사용된 데이터 파일 경로 히스토리 리스트
+                historyMemoryBudgetMB (float, optional): 과거 데이터를 RAM에 둘 최대 크기(MB). 넘으면 디스크로 내보냄.
+                lazyColumns (bool, optional): True면 csv/lis의 header만 먼저 읽고, 컬럼 값은 플롯에 쓰일 때 읽음.
+                ingestOptions (IngestOptions, optional): csv 파싱 설정 (엔진, float dtype, chunk 크기)
+                streamLoading (bool, optional): True면 큰 파일을 조각 단위로 파싱하며, 조각이 올 때마다 플롯을 채워 나감
+                datasetRegistry (DatasetRegistry, optional): 같은 파일을 보는 인터페이스끼리 감시/로드를 공유할 저장소. 없으면 공유하지 않음.
         """
 
         self.interface_id = id(self)
@@ -29,8 +48,41 @@ class DataInterface:
         self.plotDocks = plotDocks
         self.lastRefreshTime = None
         self.dataPathHistory = dataPathHistory
-        self.dataHistory = []
+        self.dataHistory = HistoryStore(historyMemoryBudgetMB)
         self.fileType = None
+        # 현재 UI가 만들어진 file type (같으면 refreshDataUI가 위젯을 재사용)
+        self._uiFileType = None
+
+        # 지연 컬럼 로드: self.data에는 읽은 컬럼만 있고, 전체 컬럼 이름은 self.dataColumns
+        self.lazyColumns = lazyColumns
+        self.table: LazyColumnTable = None
+        self.dataColumns: list[str] = []
+        # 플롯용 컬럼별 contiguous float64 배열 (데이터 버전마다 초기화)
+        self.columnStore = ColumnStore()
+        self.ingestOptions = ingestOptions or IngestOptions()
+
+        # 공유 데이터 (파일 감시 + 백그라운드 로드는 SharedDataset이 수행)
+        self.registry = datasetRegistry if datasetRegistry is not None else DatasetRegistry()
+        self.dataset: SharedDataset = None
+
+        # 백그라운드 로드 상태
+        self._loadGeneration = 0
+        self._loading = False
+        self._waitCursor = False
+
+        # streaming 로드 상태 (조각을 받는 중인 generation, 받은 조각들, 마지막 플롯 시각)
+        self.streamLoading = streamLoading
+        self._streamGeneration = 0
+        self._streamChunks: list[pd.DataFrame] = []
+        self._streamLastPaint = 0.0
+
+        # 히스토리 재생: run마다 float64 배열을 한 번만 변환해 보관 ((run, 컬럼) -> 값). 범위는 HistoryStore가 컬럼마다 보관
+        self._runArrays: dict[tuple[int, str], np.ndarray] = {}
+        # 재생 중 고정한 축 범위 (아직 읽지 않은 lazy run을 재생하며 범위가 넓어지면 다시 고정)
+        self._playbackLock: tuple[tuple[float, float], tuple[float, float]] = None
+        self._playbackTimer = QTimer()
+        self._playbackTimer.setInterval(PLAYBACK_INTERVAL_MS)
+        self._playbackTimer.timeout.connect(self._playbackStep)
 
         self.storeLineEditComponents = [
             'showPastDataLineEdit',
@@ -38,6 +90,7 @@ class DataInterface:
             'y0PosLineEdit',
             'x1PosLineEdit',
             'opacityLineEdit',
+            'layerLineEdit',
         ]
 
         self.storeComboBoxComponents = [
@@ -91,13 +144,11 @@ class DataInterface:
 
         """
             "Get File" 버튼 핸들러.
-            이 함수가 실행되면 path를 받아 저장한 후, 파일 감시 스레드를 시작함.
+            이 함수가 실행되면 path를 받아 저장한 후, 해당 파일의 공유 데이터(파일 감시 포함)를 구독함.
         """
 
-        # 기존의 파일 감시 스레드가 있으면 종료
-        if hasattr(self, "serverFileWatcherThread"):
-            self.serverFileWatcherThread.stop()
-            self.serverFileWatcherThread.wait()
+        # 기존에 구독하던 파일이 있으면 해제
+        self._releaseDataset()
 
         self.path = self.filePathComboBox.currentText().strip()
 
@@ -116,69 +167,210 @@ class DataInterface:
         if not self.ssh: logging.info("DataInterface: SSH not connected."); return
         if not self.path: logging.info(f"파일 경로가 비어 있습니다: {self.path}"); return
 
-        # file path 저장
+        # file path 저장 후 공유 데이터 구독 (같은 파일을 보는 다른 인터페이스가 있으면 감시/로드를 공유)
         logging.info(f"DataInterface: File path set to: {self.path}")
-        self.serverFileWatcherThread = FileWatcherThread(self.ssh, self.path)
-        self.serverFileWatcherThread.file_updated.connect(self.updateData)
-        self.serverFileWatcherThread.start()
+        self.dataset = self.registry.acquire(
+            self, self.ssh, self.path, self._plottedColumns,
+            lazy_columns=self.lazyColumns,
+            ingest=self.ingestOptions,
+            stream=self.streamLoading
+        )
+        self.dataset.loadStarted.connect(self.onLoadStarted)
+        self.dataset.loaded.connect(self.onDataLoaded)
+        self.dataset.chunk.connect(self.onDataChunk)
+        self.dataset.failed.connect(self.onDataLoadFailed)
+        self.dataset.loadCancelled.connect(self.onLoadCancelled)
+
+        # 다른 인터페이스가 이미 로드한 파일이면 다운로드 없이 바로 표시
+        if self.dataset.data is not None:
+            self._loadGeneration = self.dataset.dataGeneration
+            self.onDataLoaded(self.dataset.dataGeneration, self.dataset.data, self.dataset.fileType)
+        if self.dataset.isLoading():
+            self.onLoadStarted(self.dataset.generation)
+
+    def _releaseDataset(self):
+        if self.dataset is None: return
+        for signal, slot in (
+            (self.dataset.loadStarted, self.onLoadStarted),
+            (self.dataset.loaded, self.onDataLoaded),
+            (self.dataset.chunk, self.onDataChunk),
+            (self.dataset.failed, self.onDataLoadFailed),
+            (self.dataset.loadCancelled, self.onLoadCancelled),
+        ):
+            try: signal.disconnect(slot)
+            except TypeError: pass
+        self.registry.release(self, self.dataset)
+        self.dataset = None
+        self._loadGeneration += 1
+        self._finishLoading()
+
+    def updateData(self, file_path=None):
+
+        """
+            파일을 다시 로드하도록 요청하는 함수. (파일 변경은 SharedDataset의 감시 스레드가 감지해 자동으로 로드함)
+            다운로드와 파싱은 QThreadPool의 DataLoadWorker에서 수행하고, 끝나면 onDataLoaded가 UI, 플롯을 갱신함.
+            진행 중인 이전 작업은 취소됨.
+        """
+
+        if self.dataset is None: return
+        logging.info(f"DataInterface: reload requested for: {self.dataset.path}")
+        self.dataset.reload()
 
-    def updateData(self, file_path):
+    def onLoadStarted(self, generation: int):
+
+        """공유 데이터의 새 로드가 시작될 때 호출됨 (대기 커서, Stop 버튼)"""
+
+        self._loadGeneration = generation
+        self._streamChunks = []
+
+        if not self._waitCursor:
+            QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+            self._waitCursor = True
+        self._loading = True
+        self._setStopLoadingEnabled(True)
+
+    def cancelLoading(self):
 
         """
-            파일이 업데이트되었을 때 호출되는 함수.
-            호출 시, 파일을 다운로드하고 데이터를 로드한 후 refreshDataUI와 updatePlot을 호출해 UI, 플롯을 갱신함.
+            진행 중인 로드(다운로드/파싱/streaming)를 중단. 이미 받은 조각은 화면에 남는다.
+            로드는 같은 파일을 보는 인터페이스들이 공유하므로 모두 중단된다.
         """
 
-        logging.info(f"DataInterface: File updated signal received for: {file_path}")
+        if self.dataset is not None:
+            self.dataset.cancel()
+        self.onLoadCancelled(self._loadGeneration)
 
-        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+    def onLoadCancelled(self, generation: int):
+        if generation != self._loadGeneration: return
+        self._loadGeneration += 1
+        self._finishLoading()
+
+    def _plottedColumns(self) -> list[str]:
+
+        """현재 x축으로 선택되었거나 y축에 체크된 컬럼 이름들"""
+
+        columns = []
+        if getattr(self, "xAxisComboBox", None) is not None:
+            columns.append(self.xAxisComboBox.currentText())
+        if getattr(self, "yAxisPicker", None) is not None:
+            columns += self.yAxisPicker.checkedColumns()
+        return columns
+
+    def columnData(self, columns: list[str]) -> pd.DataFrame:
+
+        """
+            columns의 데이터를 반환. lazy 모드에서 아직 읽지 않은 컬럼은 이때 읽어 self.data에 추가한다.
+
+            Args:
+                columns (list[str]): 컬럼 이름들 (모두 self.dataColumns에 있어야 함)
+
+            Returns:
+                pd.DataFrame: 요청한 컬럼들
+        """
+
+        if self.table is not None and any(c not in self.data.columns for c in columns):
+            self.data = self.table.load([*self.data.columns, *columns])
+            self.columnStore.extend(self.data)
+        return self.data[[c for c in columns if c in self.data.columns]]
+
+    def _restoreCursor(self):
+        if self._waitCursor:
+            QApplication.restoreOverrideCursor()
+            self._waitCursor = False
+
+    def _finishLoading(self):
+        self._restoreCursor()
+        self._loading = False
+        self._streamChunks = []
+        self._setStopLoadingEnabled(False)
+
+    def _setStopLoadingEnabled(self, enabled: bool):
+        button = getattr(self, "stopLoadingButton", None)
+        if button is not None:
+            try: button.setEnabled(enabled)
+            except RuntimeError: self.stopLoadingButton = None  # clear_layout으로 삭제된 위젯
+
+    def onDataChunk(self, generation: int, payload, file_type: str):
+
+        """
+            streaming 로드 중 조각 하나가 파싱될 때마다 (GUI 스레드에서) 호출됨.
+            첫 조각에서 UI를 만들고 바로 그리며, 이후 조각은 STREAM_REPAINT_INTERVAL 간격으로 모아서 다시 그린다.
+        """
+
+        if generation != self._loadGeneration: return
+        chunk, columns = payload
+
+        first = self._streamGeneration != generation
+        if first:
+            self._streamGeneration = generation
+            self._streamChunks = []
+            self._streamLastPaint = 0.0
+            # 첫 조각이 보이면 대기 커서는 해제 (나머지는 백그라운드에서 채워짐)
+            self._restoreCursor()
+        self._streamChunks.append(chunk)
+
+        now = time.time()
+        if not first and now - self._streamLastPaint < STREAM_REPAINT_INTERVAL: return
+        self._streamLastPaint = now
+
+        # 지금까지 받은 조각을 합치고, 합친 결과 하나만 남겨 다음 합치기 비용을 줄임
+        if len(self._streamChunks) > 1:
+            self._streamChunks = [pd.concat(self._streamChunks, ignore_index=True)]
+        self.fileType = file_type
+        self.data = self._streamChunks[0]
+        self.dataColumns = columns
+        self.table = None
+        self.columnStore.reset(self.data)
+
+        if first:
+            self.refreshDataUI()
+        elif self.lengthSlider.value() == self.lengthSlider.maximum():
+            # 슬라이더가 끝에 있으면 늘어나는 데이터를 따라감
+            self.lengthSlider.blockSignals(True)
+            self.lengthSlider.setMaximum(len(self.data))
+            self.lengthSlider.setValue(len(self.data))
+            self.lengthSlider.blockSignals(False)
+        self.updatePlot(setSliderMax=False)
+
+    def onDataLoaded(self, generation: int, data, file_type: str):
+
+        """
+            DataLoadWorker가 다운로드 + 파싱을 마쳤을 때 (GUI 스레드에서) 호출됨.
+        """
+
+        # 더 새로운 요청이 있으면 버림
+        if generation != self._loadGeneration: return
+        self._finishLoading()
 
-        # 파일 다운로드
-        local_path = './temp/' + os.path.basename(file_path)
-        try:
-            self.ssh.get_file(file_path, local_path)
-            logging.info(f"DataInterface: File downloaded to: {local_path}")
-        except Exception as e:
-            logging.info(f"DataInterface: Failed to download file: {e}")
-            return
         self.lastRefreshTime = time.time()
+        self.fileType = file_type
+        if isinstance(data, LazyColumnTable):
+            # 새 데이터 버전: 컬럼 캐시도 새로 시작
+            self.table = data
+            self.data = data.load(data.loaded_columns)
+            self.dataColumns = data.columns
+        else:
+            self.table = None
+            self.data = data
+            self.dataColumns = data.columns.tolist() if file_type in ("csv", "lis") else []
+        if file_type in ("csv", "lis"):
+            self.columnStore.reset(self.data)
+            # lazy 모드: 나중에 체크한 컬럼은 히스토리가 table(원본)에서 필요할 때 읽음
+            self.dataHistory.append(self.data, self.table)
+            logging.info(f"DataInterface: Data loaded with columns: {self.dataColumns} (parsed: {self.data.columns.tolist()})")
 
-        # 데이터 로드
-        try:
-            if local_path.lower().endswith(".csv"):
-                self.fileType = "csv"
-                self.data = pd.read_csv(local_path, comment='#')
-                self.dataHistory.append(self.data)
-                logging.info(f"DataInterface: Data loaded with columns: {self.data.columns.tolist()}")
-            elif local_path.lower().endswith(".lis"):
-                self.fileType = "lis"
-                lisToCSV(local_path)
-                self.data = pd.read_csv(local_path[:-4] + ".csv", comment='#')
-                self.dataHistory.append(self.data)
-                logging.info(f"DataInterface: Data loaded with columns: {self.data.columns.tolist()}")
-
-            # png 지원
-            elif local_path.lower().endswith(".png"):
-                self.fileType = "png"
-
-                # np로 읽어 저장
-                self.data = qimage_to_rgba_numpy(local_path)
-
-            else: 
-                logging.info(f"DataInterface: Unsupported file type: {local_path}")
-                return
-            
-        except Exception as e: 
-            logging.info(f"DataInterface: Failed to load data file: {e}")
-            return
-        
         # UI 및 플롯 갱신
         self.refreshDataUI()
         self.updatePlot(setSliderMax=False)
 
-        QApplication.restoreOverrideCursor()
         self.showTooltip("Data updated and UI refreshed.")
 
+    def onDataLoadFailed(self, generation: int, message: str):
+        if generation != self._loadGeneration: return
+        self._finishLoading()
+        logging.info(f"DataInterface: Failed to load data file: {message}")
+        self.showTooltip(f"Failed to load data: {message}")
+
     def _captureUIState(self) -> dict:
         
         state = {}
@@ -191,12 +383,19 @@ class DataInterface:
             if hasattr(self, comp) and getattr(self, comp) is not None:
                 state[comp] = getattr(self, comp).currentText()
 
-        if hasattr(self, "yAxisCheckBoxes") and self.yAxisCheckBoxes is not None:
-            state["checked_y"] = {cb.text() for cb in self.yAxisCheckBoxes if cb.isChecked()}
+        if hasattr(self, "yAxisPicker") and self.yAxisPicker is not None:
+            state["checked_y"] = set(self.yAxisPicker.checkedColumns())
 
         if hasattr(self, "showPastDataGroup") and self.showPastDataGroup is not None:
             state["show_past_checked"] = self.showPastDataGroup.isChecked()
 
+        if hasattr(self, "sweepFamilyCheckBox") and self.sweepFamilyCheckBox is not None:
+            state["sweep_family_checked"] = self.sweepFamilyCheckBox.isChecked()
+
+        if hasattr(self, "playbackCheckBox") and self.playbackCheckBox is not None:
+            state["playback_checked"] = self.playbackCheckBox.isChecked()
+            state["playback_run"] = self.runSlider.value()
+
         if hasattr(self, "lengthSlider") and self.lengthSlider is not None:
             state["slider_value"] = self.lengthSlider.value()
 
@@ -232,13 +431,26 @@ class DataInterface:
                 self.showPastDataGroup.setChecked(prev_checked)
                 self.showPastDataGroup.blockSignals(False)
 
-        # Y 체크박스 복원 (이름 매칭)
+        # sweep 묶기 복원
+        if hasattr(self, "sweepFamilyCheckBox") and self.sweepFamilyCheckBox is not None and state.get("sweep_family_checked") is not None:
+            self.sweepFamilyCheckBox.blockSignals(True)
+            self.sweepFamilyCheckBox.setChecked(state["sweep_family_checked"])
+            self.sweepFamilyCheckBox.blockSignals(False)
+
+        # 히스토리 재생 복원
+        if hasattr(self, "playbackCheckBox") and self.playbackCheckBox is not None and state.get("playback_checked") is not None:
+            self.playbackCheckBox.blockSignals(True)
+            self.playbackCheckBox.setChecked(state["playback_checked"])
+            self.playbackCheckBox.blockSignals(False)
+            self.runSlider.blockSignals(True)
+            self.runSlider.setValue(min(state["playback_run"], self.runSlider.maximum()))
+            self.runSlider.blockSignals(False)
+            self._updateRunLabel()
+
+        # Y 체크 복원 (이름 매칭)
         checked_y = state.get("checked_y") or set()
-        if hasattr(self, "yAxisCheckBoxes") and self.yAxisCheckBoxes is not None:
-            for cb in self.yAxisCheckBoxes:
-                cb.blockSignals(True)
-                cb.setChecked(cb.text() in checked_y)
-                cb.blockSignals(False)
+        if hasattr(self, "yAxisPicker") and self.yAxisPicker is not None:
+            self.yAxisPicker.setCheckedColumns(checked_y)
 
         # 슬라이더 값 복원(새 max 범위 내로 clamp)
         if hasattr(self, "lengthSlider") and self.lengthSlider is not None:
@@ -254,11 +466,16 @@ class DataInterface:
     def refreshDataUI(self):
 
         """
-            데이터 갱신 후 UI 요소(콤보박스, 체크박스 등)를 갱신하는 메서드
+            데이터 갱신 후 UI 요소(콤보박스, 체크박스 등)를 갱신하는 메서드.
+            이미 같은 file type의 UI가 있으면 위젯은 그대로 두고 데이터에 따라 바뀌는 부분만 갱신한다.
         """
 
         if not self.path: return
 
+        if self._uiFileType is not None and self._uiFileType == self.fileType:
+            self._updateDataUI()
+            return
+
         # 현재 UI 상태 저장
         prev_state = self._captureUIState()
 
@@ -274,6 +491,12 @@ class DataInterface:
         closeButton.clicked.connect(self.delete)
         self.interfaceLayout.addWidget(closeButton)
 
+        # 로드 중단 버튼 (로드 중에만 활성화)
+        self.stopLoadingButton = QPushButton("Stop Loading")
+        self.stopLoadingButton.clicked.connect(self.cancelLoading)
+        self.stopLoadingButton.setEnabled(self._loading)
+        self.interfaceLayout.addWidget(self.stopLoadingButton)
+
         # 데이터 파일 경로 표시
         dataFilePathLineEdit = QLineEdit()
         dataFilePathLineEdit.setReadOnly(True)
@@ -281,10 +504,9 @@ class DataInterface:
         self.interfaceLayout.addWidget(dataFilePathLineEdit)
 
         # 마지막 갱신 시간 표시
-        if self.lastRefreshTime:
-            last_refresh_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.lastRefreshTime))
-            lastRefreshLabel = QLabel(f"Last Refreshed: {last_refresh_str}")
-            self.interfaceLayout.addWidget(lastRefreshLabel)
+        self.lastRefreshLabel = QLabel()
+        self.interfaceLayout.addWidget(self.lastRefreshLabel)
+        self._updateLastRefreshLabel()
         self.interfaceLayout.addWidget(QLabel(''))
 
         # 표시할 PlotWidget 선택 콤보박스 생성
@@ -315,10 +537,14 @@ class DataInterface:
             self.opacityLineEdit = QLineEdit("1.0")
             formLayout.addRow("Opacity (0.0 - 1.0):", self.opacityLineEdit)
 
+            # 같은 Plot에 이미지가 여러 개일 때 그리는 순서 (클수록 위)
+            self.layerLineEdit = QLineEdit("0")
+            formLayout.addRow("Layer (0 - 89, higher on top):", self.layerLineEdit)
+
             self.interfaceLayout.addLayout(formLayout)
 
             # 입력 종료 시 플롯 갱신
-            for le in (self.x0PosLineEdit, self.y0PosLineEdit, self.x1PosLineEdit, self.y1PosLineEdit, self.opacityLineEdit):
+            for le in (self.x0PosLineEdit, self.y0PosLineEdit, self.x1PosLineEdit, self.y1PosLineEdit, self.opacityLineEdit, self.layerLineEdit):
                 le.editingFinished.connect(lambda _le=le: self.updatePlot(setSliderMax=False))
 
         elif self.fileType == "csv" or self.fileType == "lis":
@@ -343,25 +569,43 @@ class DataInterface:
             self.showPastDataLineEdit.editingFinished.connect(self.updatePlot)
             self.pastDataLayout.addWidget(self.showPastDataLineEdit)
 
-            # y축 데이터 체크박스 생성
-            self.yAxisCheckBoxes = []
-            self.yAxisCheckBoxLayout = QGridLayout()
+            # 히스토리 재생: 모든 run을 슬라이더/타이머로 넘겨 보기 (곡선은 그대로 두고 데이터만 교체)
+            self.playbackCheckBox = QCheckBox("Playback Through All Runs")
+            self.playbackCheckBox.toggled.connect(self.onPlaybackToggled)
+            self.pastDataLayout.addWidget(self.playbackCheckBox)
+            playbackLayout = QHBoxLayout()
+            self.playButton = QPushButton("Play")
+            self.playButton.clicked.connect(self.togglePlayback)
+            self.runSlider = QSlider(Qt.Orientation.Horizontal)
+            self.runSlider.setMinimum(0)
+            self.runSlider.setMaximum(max(len(self.dataHistory) - 1, 0))
+            self.runSlider.valueChanged.connect(self.onRunSliderChanged)
+            self.runLabel = QLabel()
+            playbackLayout.addWidget(self.playButton)
+            playbackLayout.addWidget(self.runSlider, 1)
+            playbackLayout.addWidget(self.runLabel)
+            self.pastDataLayout.addLayout(playbackLayout)
+            self._updateRunLabel()
+
+            # y축 데이터 선택 목록 생성 (컬럼 수와 관계없이 위젯 수 일정)
             self.interfaceLayout.addWidget(QLabel("Y-Axis Data"))
-            self.interfaceLayout.addLayout(self.yAxisCheckBoxLayout)
-
-            for i, column in enumerate(self.data.columns.tolist()):
-                checkbox = QCheckBox(column)
-                checkbox.stateChanged.connect(self.updatePlot)
-                self.yAxisCheckBoxLayout.addWidget(checkbox, i // 3, i % 3)
-                self.yAxisCheckBoxes.append(checkbox)
+            self.yAxisPicker = ColumnPicker()
+            self.yAxisPicker.setColumns(self.dataColumns)
+            self.yAxisPicker.checkedChanged.connect(self.updatePlot)
+            self.interfaceLayout.addWidget(self.yAxisPicker)
 
             # x축 데이터 콤보박스 생성
             self.interfaceLayout.addWidget(QLabel("X-Axis Data"))
             self.xAxisComboBox = QComboBox()
-            self.xAxisComboBox.addItems(self.data.columns.tolist())
+            self._syncXAxisComboBox()
             self.xAxisComboBox.currentIndexChanged.connect(self.updatePlot)
             self.interfaceLayout.addWidget(self.xAxisComboBox)
 
+            # x가 첫 값으로 돌아올 때마다 나뉘는 sweep을 곡선 family로 (y 컬럼마다 곡선 item/범례 하나)
+            self.sweepFamilyCheckBox = QCheckBox("Group Sweeps as One Curve")
+            self.sweepFamilyCheckBox.toggled.connect(lambda _checked: self.updatePlot(setSliderMax=False))
+            self.interfaceLayout.addWidget(self.sweepFamilyCheckBox)
+
             # 데이터 슬라이더 생성
             self.interfaceLayout.addWidget(QLabel("Data Length"))
             self.lengthSlider = QSlider(Qt.Orientation.Horizontal)
@@ -384,8 +628,61 @@ class DataInterface:
             self.frame.installEventFilter(self._wheelFilter)
             for w in self.frame.findChildren(QWidget): w.installEventFilter(self._wheelFilter)
 
+            # 컬럼 목록은 휠로 스크롤해야 하므로 제외
+            self.yAxisPicker.removeEventFilter(self._wheelFilter)
+            for w in self.yAxisPicker.findChildren(QWidget): w.removeEventFilter(self._wheelFilter)
+
         # 이전 UI 상태 복원
         self._restoreUIState(prev_state)
+        self._uiFileType = self.fileType
+
+    def _updateLastRefreshLabel(self):
+        if self.lastRefreshTime:
+            last_refresh_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.lastRefreshTime))
+            self.lastRefreshLabel.setText(f"Last Refreshed: {last_refresh_str}")
+        self.lastRefreshLabel.setVisible(bool(self.lastRefreshTime))
+
+    def _syncXAxisComboBox(self):
+
+        """x축 콤보박스 항목을 self.dataColumns에 맞춤 (선택된 컬럼이 남아 있으면 유지)"""
+
+        if [self.xAxisComboBox.itemText(i) for i in range(self.xAxisComboBox.count())] == self.dataColumns: return
+
+        current = self.xAxisComboBox.currentText()
+        self.xAxisComboBox.blockSignals(True)
+        self.xAxisComboBox.clear()
+        self.xAxisComboBox.addItems(self.dataColumns)
+        idx = self.xAxisComboBox.findText(current)
+        self.xAxisComboBox.setCurrentIndex(idx if idx >= 0 else 0)
+        self.xAxisComboBox.blockSignals(False)
+
+    def _updateDataUI(self):
+
+        """
+            refreshDataUI의 증분 경로: 위젯은 그대로 두고 시간 표시, 컬럼 목록 차이, 슬라이더 범위만 갱신
+        """
+
+        self._updateLastRefreshLabel()
+
+        if self.fileType == "png":
+            # 새 이미지 크기 (우 상단 x는 사용자가 지정한 값을 유지)
+            self.y1PosLineEdit.setText(str(self.data.shape[0]))
+
+        elif self.fileType == "csv" or self.fileType == "lis":
+            if self.yAxisPicker.setColumns(self.dataColumns):
+                logging.info(f"DataInterface: column set changed ({len(self.dataColumns)} columns)")
+            self._syncXAxisComboBox()
+
+            # 재생 슬라이더 범위를 run 수에 맞춤
+            self.runSlider.setMaximum(max(len(self.dataHistory) - 1, 0))
+            self._updateRunLabel()
+
+            # 슬라이더 범위를 새 데이터 길이에 맞춤 (값은 범위 내로 clamp)
+            max_len = max(1, len(self.data))
+            if self.lengthSlider.maximum() != max_len:
+                self.lengthSlider.blockSignals(True)
+                self.lengthSlider.setMaximum(max_len)
+                self.lengthSlider.blockSignals(False)
 
     def refreshPlotSelectComboBox(self):
 
@@ -444,6 +741,7 @@ class DataInterface:
                 opacity = float(self.opacityLineEdit.text())
                 sendingData['image_pos'] = (x0, y0, x1, y1)
                 sendingData['image_opacity'] = opacity
+                sendingData['image_z'] = int(self.layerLineEdit.text())
             except ValueError:
                 logging.info("Error: Invalid image position/size values.")
                 return
@@ -453,12 +751,19 @@ class DataInterface:
 
             # x축 데이터 가져오기
             x_data = self.xAxisComboBox.currentText()
-            if x_data not in self.data.columns.tolist():
+            if x_data not in self.dataColumns:
                 logging.info(f"Error: X-axis data '{x_data}' not found in columns.")
                 return
 
             # y축 데이터 가져오기
-            y_data_columns = [cb.text() for cb in self.yAxisCheckBoxes if cb.isChecked()]
+            y_data_columns = self.yAxisPicker.checkedColumns()
+
+            # lazy 모드: 새로 체크/선택된 컬럼만 읽음
+            self.columnData([x_data, *y_data_columns])
+
+            # lazy + streaming 로드 중에는 미리 읽기로 지정된 컬럼만 있음 (나머지는 로드가 끝나면 읽을 수 있음)
+            if x_data not in self.data.columns: return
+            y_data_columns = [c for c in y_data_columns if c in self.data.columns]
             
             # 슬라이더 최대치 데이터 길이에 맞추기
             max_len = len(self.data)
@@ -477,8 +782,13 @@ class DataInterface:
             # n, % 라벨 갱신
             self.updateLengthLabel(n, max_len)
 
-            x: pd.DataFrame = self.data[x_data].iloc[:n]
-            ys = {y_name: self.data[y_name].iloc[:n] for y_name in y_data_columns}
+            # 컬럼 배열의 slice view (복사 없음)
+            x = self.columnStore.get(x_data)[:n]
+            ys = {y_name: self.columnStore.get(y_name)[:n] for y_name in y_data_columns}
+
+            # 각 series의 앞 n개 (min, max): 컬럼별 prefix min/max라 n이 바뀌어도 상수 시간
+            x_bounds = [self.columnStore.bounds(x_data, n)]
+            y_bounds = [self.columnStore.bounds(y_name, n) for y_name in y_data_columns]
 
             # 과거 데이터 포함 여부
             if self.showPastDataGroup.isChecked():
@@ -494,20 +804,137 @@ class DataInterface:
                             if 0 < idx < len(self.dataHistory):
                                 past_indices.append(idx)
                     for idx in past_indices:
-                        past_data = self.dataHistory[-(idx + 1)]
-                        if x_data in past_data.columns.tolist():
-                            past_x = past_data[x_data].iloc[:n]
+                        past = -(idx + 1)
+                        if self.dataHistory.column(past, x_data) is not None:
                             for y_name in y_data_columns:
-                                if y_name in past_data.columns.tolist():
-                                    past_y = past_data[y_name].iloc[:n]
-                                    ys[f"{y_name} (past {idx})"] = past_y
+                                past_y = self.dataHistory.column(past, y_name)
+                                if past_y is not None:
+                                    ys[f"{y_name} (past {idx})"] = as_float64_column(past_y)[:n]
+                                    y_bounds.append(self._runColumnBounds(len(self.dataHistory) + past, y_name, n))
+
+            # sweep 묶기: x에서 구한 sweep 경계를 모든 y에 사용 (복사 없음)
+            if self.sweepFamilyCheckBox.isChecked():
+                offsets = sweep_offsets(x)
+                if len(offsets) > 1:
+                    ys = {y_name: CurveFamily.from_sweeps(x, y, offsets) for y_name, y in ys.items()}
+
+            # 히스토리 재생: 선택한 run의 y를 그 run의 x와 함께 (series 이름이 같으므로 PlotDock은 곡선 데이터만 교체)
+            if self.showPastDataGroup.isChecked() and self.playbackCheckBox.isChecked():
+                run = self.runSlider.value()
+                for y_name in y_data_columns:
+                    run_x, run_y = self._runColumn(run, x_data), self._runColumn(run, y_name)
+                    if run_x is None or run_y is None: continue
+                    m = min(len(run_x), len(run_y))
+                    ys[f"{y_name} (playback)"] = CurveFamily(run_x[:m], run_y[:m], [0], [f"run {run + 1}"])
+                    x_bounds.append(self._runColumnBounds(run, x_data, m))
+                    y_bounds.append(self._runColumnBounds(run, y_name, m))
+                self._extendPlaybackLock(selected_dock, x_bounds, y_bounds)
 
             sendingData['x'] = x
             sendingData['ys'] = ys
+            x_range, y_range = union_bounds(x_bounds), union_bounds(y_bounds)
+            sendingData['bounds'] = (*x_range, *y_range) if x_range is not None and y_range is not None else None
 
         # PlotDock에 내 데이터 저장 후, PlotDock이 통합 렌더링
         selected_dock.data[interface_id] = sendingData
-        selected_dock.refreshPlot()
+        selected_dock.scheduleRefresh()
+
+    # ---- 히스토리 재생 ----
+    def _runColumn(self, run: int, name: str) -> np.ndarray:
+
+        """run번째(0이 가장 오래된) 히스토리의 name 컬럼 float64 배열 (재생 중 처음 한 번만 변환). 없으면 None."""
+
+        key = (run, name)
+        if key not in self._runArrays:
+            values = self.dataHistory.column(run, name) if 0 <= run < len(self.dataHistory) else None
+            self._runArrays[key] = None if values is None else as_float64_column(values)
+        return self._runArrays[key]
+
+    def _runColumnBounds(self, run: int, name: str, n: int = None, load: bool = True) -> tuple[float, float]:
+
+        """run번째 히스토리 name 컬럼 앞 n개의 (min, max) (HistoryStore가 컬럼마다 한 번 계산해 보관)"""
+
+        if not 0 <= run < len(self.dataHistory): return None
+        return self.dataHistory.bounds(run, name, n, load=load)
+
+    def _playbackRange(self) -> tuple[tuple[float, float], tuple[float, float]]:
+
+        """
+            모든 run + 현재 데이터의 x, 선택한 y 범위 (run별 값은 캐시).
+            재생 중에는 이 범위로 축을 고정해, 프레임마다 autorange(전체 점 bounds 계산)를 하지 않는다.
+            lazy run에서 아직 읽지 않은 컬럼은 여기서 파싱하지 않고(GUI 멈춤 방지), 재생하며 읽을 때 범위에 더한다.
+        """
+
+        x_name = self.xAxisComboBox.currentText()
+        y_names = self.yAxisPicker.checkedColumns()
+        runs = range(len(self.dataHistory))
+        x_range = union_bounds(self._runColumnBounds(run, x_name, load=False) for run in runs)
+        y_range = union_bounds(self._runColumnBounds(run, y_name, load=False) for run in runs for y_name in y_names)
+        if x_range is None or y_range is None: return None
+        return x_range, y_range
+
+    def _extendPlaybackLock(self, dock: "PlotDock", x_bounds: list, y_bounds: list):
+
+        """재생 중 지금 그린 run이 고정한 범위 밖에 있으면 범위를 넓혀 다시 고정"""
+
+        if not self._playbackTimer.isActive() or self._playbackLock is None: return
+        x_range = union_bounds([self._playbackLock[0], *x_bounds])
+        y_range = union_bounds([self._playbackLock[1], *y_bounds])
+        if (x_range, y_range) == self._playbackLock: return
+        self._playbackLock = (x_range, y_range)
+        dock.lockViewRange(x_range, y_range)
+
+    def _updateRunLabel(self):
+        if not hasattr(self, "runLabel"): return
+        total = len(self.dataHistory)
+        self.runLabel.setText(f"run {self.runSlider.value() + 1} / {total}" if total else "no runs")
+
+    def onRunSliderChanged(self, value: int):
+        self._updateRunLabel()
+        if self.playbackCheckBox.isChecked():
+            self.updatePlot(setSliderMax=False)
+
+    def onPlaybackToggled(self, checked: bool):
+        if not checked: self.stopPlayback()
+        self.updatePlot(setSliderMax=False)
+
+    def togglePlayback(self):
+        if self._playbackTimer.isActive(): self.stopPlayback()
+        else: self.startPlayback()
+
+    def startPlayback(self):
+
+        """재생 시작: 축을 모든 run의 범위로 고정하고, 타이머로 run을 하나씩 넘김"""
+
+        if len(self.dataHistory) < 2: return
+        if not self.showPastDataGroup.isChecked(): self.showPastDataGroup.setChecked(True)
+        if not self.playbackCheckBox.isChecked(): self.playbackCheckBox.setChecked(True)
+        if self.runSlider.value() >= self.runSlider.maximum():
+            self.runSlider.setValue(0)
+
+        dock = self.plotSelectComboBox.currentData()
+        self._playbackLock = self._playbackRange()
+        if dock is not None and self._playbackLock is not None:
+            dock.lockViewRange(*self._playbackLock)
+
+        self.playButton.setText("Pause")
+        self._playbackTimer.start()
+
+    def stopPlayback(self):
+        if not self._playbackTimer.isActive(): return
+        self._playbackTimer.stop()
+        # 재생용으로 잡아 둔 run 배열 해제 (범위는 HistoryStore에 남음)
+        self._runArrays.clear()
+        self._playbackLock = None
+        if hasattr(self, "playButton"): self.playButton.setText("Play")
+        dock = self.plotSelectComboBox.currentData()
+        if dock is not None: dock.unlockViewRange()
+
+    def _playbackStep(self):
+        if self.runSlider.value() >= self.runSlider.maximum():
+            self.stopPlayback()
+            return
+        self.runSlider.setValue(self.runSlider.value() + 1)
 
     def delete(self):
 
@@ -515,12 +942,20 @@ class DataInterface:
             PlotWidget과 인터페이스를 삭제하는 메서드
         """
 
+        self._playbackTimer.stop()
+
+        # 공유 데이터 구독 해제 (마지막 구독자면 파일 감시 / 진행 중인 로드 중단)
+        self._releaseDataset()
+
         # PlotDock에서 데이터 제거 및 갱신
         for dock in self.plotDocks:
             interface_id = id(self)
             if interface_id in dock.data:
                 dock.data.pop(interface_id, None)
-                dock.refreshPlot()
+                dock.scheduleRefresh()
+
+        # 과거 데이터(디스크로 내보낸 파일 포함) 삭제
+        self.dataHistory.clear()
 
         self._container.deleteLater()  # 그룹박스 삭제
         self.frame.deleteLater()       # QFrame 삭제
@@ -1,6 +1,8 @@
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QPushButton, QLabel, QLineEdit, QMenu
 from PyQt6.QtCore import Qt
 
+from utils.utils import apply_percent
+
 class ParamRowWidget(QWidget):
 
     """
@@ -96,10 +98,7 @@ class ParamRowWidget(QWidget):
     def _commit_value(self, text: str): self.params_ref[self.key]["value"] = text
 
     def _apply_percent(self, percent: float):
-        raw = self.valueEdit.text().strip()
-        try: x = float(raw)
-        except ValueError: return
-        new_x = x * (1.0 + percent)
-        out = str(int(round(new_x))) if abs(new_x - round(new_x)) < 1e-12 else f"{new_x:.6g}"
+        out = apply_percent(self.valueEdit.text(), percent)
+        if out is None: return
         self.valueEdit.setText(out)
         self.params_ref[self.key]["value"] = out
\ No newline at end of file
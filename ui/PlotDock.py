@@ -1,12 +1,92 @@
-import logging
+import logging, time
 from PyQt6.QtWidgets import QDockWidget, QFileDialog
 from PyQt6.QtGui import QAction, QTransform
-from PyQt6.QtCore import pyqtSignal, QRectF
+from PyQt6.QtCore import pyqtSignal, QRectF, QTimer
 from PyQt6.QtGui import QImage
 import pyqtgraph as pg
 import numpy as np
 
 from utils.utils import fmt_hybrid
+from utils.MinMaxPyramid import MinMaxPyramid
+from utils.CurveFamily import CurveFamily
+from utils.ImageCache import ImagePyramid, pyramid_for
+
+# 이 점 수 이상인 곡선은 min/max pyramid로 화면 폭에 맞게 줄여서 그림
+LOD_MIN_POINTS = 100_000
+# hover snap: 마우스에서 이 거리(픽셀) 안의 sample에만 붙음
+HOVER_SNAP_PIXELS = 20
+# hover snap: 곡선 하나에서 거리 계산할 최대 sample 수 (한 픽셀에 sample이 아주 많은 경우)
+HOVER_MAX_WINDOW = 4096
+# 이미지 레이어 z 범위: OVERLAY_BASE_Z + (0 ~ OVERLAY_LAYERS-1), 곡선(z=0)보다 항상 아래
+OVERLAY_BASE_Z = -100
+OVERLAY_LAYERS = 90
+
+class _Curve:
+
+    """PlotDock에 그려진 곡선 하나와, 마지막으로 넘긴 데이터/색"""
+
+    def __init__(self, item: pg.PlotDataItem, x: np.ndarray, y: np.ndarray, color):
+        self.item = item
+        # 같은 배열이 다시 오면 setData를 건너뛰기 위해 참조 유지
+        self.x = x
+        self.y = y
+        self.color = color
+        # 큰 곡선의 min/max pyramid (데이터 버전마다 한 번 생성)와 마지막으로 그린 (x 범위, 픽셀 폭, 길이)
+        self.pyramid: MinMaxPyramid = None
+        self.lodKey: tuple = None
+        # hover 검색용 정렬된 x (데이터 버전마다 처음 hover할 때 생성)
+        self.hoverIndex: tuple = None
+        # 여러 곡선을 이어 붙인 series면 그 family (x, y는 family.x, family.y)
+        self.family: CurveFamily = None
+
+    def sortedX(self) -> tuple[np.ndarray, np.ndarray | None]:
+
+        """
+            hover 검색용 (오름차순 x, 원래 index 순서). x가 이미 정렬되어 있으면 순서는 None.
+            데이터 버전마다 한 번 만들고, 이후 검색은 searchsorted (O(log n)).
+        """
+
+        if self.hoverIndex is None:
+            x = np.asarray(self.x, dtype=np.float64)
+            if self.pyramid is not None: isSorted = self.pyramid.sorted
+            else: isSorted = len(x) < 2 or not bool((np.diff(x) < 0).any())
+            if isSorted:
+                self.hoverIndex = (x, None)
+            else:
+                order = np.argsort(x, kind="stable")
+                self.hoverIndex = (x[order], order)
+        return self.hoverIndex
+
+class _Overlay:
+
+    """PlotDock의 이미지 레이어 하나 (interface마다 하나)와 마지막으로 올린 이미지/level/위치"""
+
+    def __init__(self, item: pg.ImageItem):
+        self.item = item
+        self.source = None
+        self.pyramid: ImagePyramid = None
+        self.level: int = None
+        self.rect: tuple = None
+
+def _same_array(a, b) -> bool:
+
+    """a, b가 같은 메모리의 같은 모양 배열인지 (값 비교 없이 O(1))"""
+
+    if a is b: return True
+    if not isinstance(a, np.ndarray) or not isinstance(b, np.ndarray): return False
+    return (
+        a.shape == b.shape and a.dtype == b.dtype and a.strides == b.strides
+        and a.__array_interface__["data"][0] == b.__array_interface__["data"][0]
+    )
+
+def _to_view(values, log: bool):
+
+    """raw 값 -> view 좌표. log 축이면 pyqtgraph처럼 log10 (0 이하는 nan)"""
+
+    if not log: return values
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(values > 0, np.log10(values), np.nan)
 
 class PlotDock(QDockWidget):
     closed = pyqtSignal(object)
@@ -36,6 +116,9 @@ class PlotDock(QDockWidget):
         # }
         self.data: dict[object, dict] = {}
 
+        # 그려진 곡선: (interface_id, series 이름) -> _Curve (refreshPlot에서 재사용)
+        self._curves: dict[tuple, _Curve] = {}
+
         # 마우스를 따라다니는 라벨: TextItem
         self.tip = pg.TextItem(
             text="",
@@ -55,25 +138,54 @@ class PlotDock(QDockWidget):
         )
 
         self.hoverEnabled = True
+        # True면 hover가 가장 가까운 실제 sample에 붙고, 그 x에서 모든 곡선의 값을 보여 줌
+        self.hoverSnap = True
+        self._snapMarker = pg.ScatterPlotItem(size=10, pen=pg.mkPen((0, 0, 0), width=1.5), brush=pg.mkBrush(255, 255, 255, 0))
+        self._snapMarker.setZValue(9)
+        self._snapMarker.hide()
+        self.plotWidget.addItem(self._snapMarker, ignoreBounds=True)
+
+        # 렌더 스케줄러: 갱신 요청은 표시만 해 두고, 화면 한 프레임에 최대 한 번 그림
+        self._renderTimer = QTimer(self)
+        self._renderTimer.setSingleShot(True)
+        self._renderTimer.timeout.connect(self._renderFrame)
+        self._plotDirty = False
+        self._lodDirty = False
+        self._lastRenderTime = 0.0
+        self.renderCount = 0
+        self.coalescedRenders = 0
+        # 화면 범위/크기가 바뀌면 큰 곡선과 이미지를 그 해상도로 다시 줄임
+        vb = self.plotWidget.getPlotItem().getViewBox()
+        vb.sigXRangeChanged.connect(self._scheduleLevelOfDetail)
+        vb.sigYRangeChanged.connect(self._scheduleLevelOfDetail)
+        vb.sigResized.connect(self._scheduleLevelOfDetail)
+
+        # True면 refreshPlot마다 data의 bounds로 view 범위를 맞춤 (사용자가 직접 확대/이동하면 False, autorange 버튼으로 다시 True)
+        self._fitView = True
+        vb.sigRangeChangedManually.connect(self._onRangeChangedManually)
 
         # 우클 메뉴 항목 추가
         self.setExtraMenuItems()
 
-        # 이미지 overlay
-        self._img_item: pg.ImageItem = None
+        # 이미지 overlay 레이어: layer_id(interface_id) -> _Overlay (같은 이미지면 item/텍스처 재사용)
+        self._overlays: dict[object, _Overlay] = {}
         self._overlayPath: str = None
 
     def showImageOverlayArray(
         self,
-        img: np.ndarray,
+        img: np.ndarray | ImagePyramid,
         x0: float = 0.0,
         y0: float = 0.0,
         x1: float = None,
         y1: float = None,
-        opacity: float = 1.0
+        opacity: float = 1.0,
+        layer_id: object = None,
+        z: int = 0
     ):
         """
         ✅ 좌측 하단 (x0,y0) + 우측 상단 (x1,y1) 기준으로 이미지 오버레이
+        layer_id(보통 interface_id)마다 ImageItem 하나를 유지하며, 이미지가 이전과 같은 객체면 텍스처는 그대로 두고
+        위치/투명도/순서만 갱신한다. z가 클수록 위에 그려진다 (항상 곡선 아래).
         """
         if img is None:
             return
@@ -82,47 +194,47 @@ class PlotDock(QDockWidget):
 
         opacity = max(0.0, min(1.0, float(opacity)))
 
-        arr = np.asarray(img)
-        if arr.ndim == 2:
-            arr = np.stack([arr, arr, arr, np.full_like(arr, 255)], axis=-1)
-        if arr.ndim != 3 or arr.shape[2] not in (3, 4):
-            raise ValueError(f"Unsupported image shape: {arr.shape}")
-        if arr.dtype != np.uint8:
-            arr = arr.astype(np.uint8, copy=False)
-        if arr.shape[2] == 3:
-            alpha = np.full((arr.shape[0], arr.shape[1], 1), 255, dtype=np.uint8)
-            arr = np.concatenate([arr, alpha], axis=2)
-
-        arr = arr.copy()
-        H, W = arr.shape[0], arr.shape[1]
-
-        # clear()로 씬에서 빠질 수 있으니 항상 재-add 보장
-        if self._img_item is None:
-            self._img_item = pg.ImageItem(axisOrder="row-major")
-            self._img_item.setZValue(-10)
-        if self._img_item.scene() is None:
-            self.plotWidget.addItem(self._img_item, ignoreBounds=True)
-
-        self._img_item.setOpacity(opacity)
-
-        self._img_item.setImage(arr, autoLevels=False, axisOrder="row-major")
-
-        # (x0,y0)~(x1,y1) -> w,h
-        x0 = float(x0)
-        y0 = float(y0)
-        x1 = float(x1)
-        y1 = float(y1)
+        overlay = self._overlays.get(layer_id)
+        if overlay is None:
+            overlay = _Overlay(pg.ImageItem(axisOrder="row-major"))
+            self._overlays[layer_id] = overlay
+        if overlay.item.scene() is None:
+            self.plotWidget.addItem(overlay.item, ignoreBounds=True)
+
+        # 새 이미지일 때만 pyramid 준비 (같은 배열/파일을 보이는 다른 dock과 공유)
+        if img is not overlay.source:
+            overlay.pyramid = pyramid_for(img)
+            overlay.source = img
+            overlay.level = None
+
+        overlay.item.setOpacity(opacity)
+        overlay.item.setZValue(OVERLAY_BASE_Z + max(0, min(int(z), OVERLAY_LAYERS - 1)))
+
+        # (x0,y0)~(x1,y1), 음수도 정규화
+        x0, x1 = sorted((float(x0), float(x1)))
+        y0, y1 = sorted((float(y0), float(y1)))
+        overlay.rect = (x0, y0, x1, y1)
+        self._updateOverlayLevel(overlay)
+
+    def _updateOverlayLevel(self, overlay: _Overlay):
+
+        """화면에 보이는 이미지 크기에 맞는 pyramid level을 올리고(바뀐 경우만), 위치 transform 적용"""
+
+        if overlay.pyramid is None: return
+        x0, y0, x1, y1 = overlay.rect
         w = x1 - x0
         h = y1 - y0
 
-        # 음수도 정규화
-        if w < 0:
-            x0, x1 = x1, x0
-            w = -w
-        if h < 0:
-            y0, y1 = y1, y0
-            h = -h
-
+        vb = self.plotWidget.getPlotItem().getViewBox()
+        (vx0, vx1), (vy0, vy1) = vb.viewRange()
+        pixels_w = w * vb.width() / (vx1 - vx0) if vx1 > vx0 else 0
+        pixels_h = h * vb.height() / (vy1 - vy0) if vy1 > vy0 else 0
+        level = overlay.pyramid.level_for(pixels_w, pixels_h)
+        if level != overlay.level:
+            overlay.level = level
+            overlay.item.setImage(overlay.pyramid.level(level), autoLevels=False, axisOrder="row-major")
+
+        H, W = overlay.pyramid.level(level).shape[:2]
         sx = w / float(W)
         sy = -h / float(H)   # 이미지 row-major를 plot y-up으로 맞추기 위해 y 뒤집기
         dx = x0
@@ -134,15 +246,40 @@ class PlotDock(QDockWidget):
             0.0, sy, 0.0,
             dx, dy, 1.0
         )
-        self._img_item.setTransform(tr)
+        overlay.item.setTransform(tr)
+
+    def clearImageOverlay(self, layer_id: object = ...):
+
+        """layer_id의 이미지 레이어 제거 (인자가 없으면 모든 레이어)"""
+
+        for key in (list(self._overlays) if layer_id is ... else [layer_id]):
+            overlay = self._overlays.pop(key, None)
+            if overlay is None: continue
+            try:
+                self.plotWidget.removeItem(overlay.item)
+            except Exception:
+                pass
+
+    def setHoverEnabled(self, enabled: bool):
+
+        """hover 라벨/marker 표시 여부 (끄면 scene에서 라벨을 빼므로 그림을 내보낼 때도 나타나지 않음)"""
+
+        # 메뉴의 체크 상태도 맞춤 (toggled가 같은 값으로 이 함수를 다시 부름)
+        act = getattr(self, "_toggleHoverAction", None)
+        if act is not None and act.isChecked() != enabled:
+            act.setChecked(enabled)
+            return
 
-    def clearImageOverlay(self):
-        if self._img_item is not None:
+        self.hoverEnabled = enabled
+        self._snapMarker.hide()
+        if not enabled:
             try:
-                self.plotWidget.removeItem(self._img_item)
+                self.plotWidget.removeItem(self.tip)
             except Exception:
                 pass
-            self._img_item = None
+        else:
+            if self.tip.scene() is None:
+                self.plotWidget.addItem(self.tip, ignoreBounds=True)
 
     def setExtraMenuItems(self):
         vb = self.plotWidget.getPlotItem().getViewBox()
@@ -157,22 +294,26 @@ class PlotDock(QDockWidget):
         act.setCheckable(True)
         act.setChecked(True)
 
-        def _toggle(checked: bool):
-            self.hoverEnabled = checked
-            if not checked:
-                try:
-                    self.plotWidget.removeItem(self.tip)
-                except Exception:
-                    pass
-            else:
-                if self.tip.scene() is None:
-                    self.plotWidget.addItem(self.tip, ignoreBounds=True)
-
-        act.toggled.connect(_toggle)
+        act.toggled.connect(self.setHoverEnabled)
         menu.addSeparator()
         menu.addAction(act)
         self._toggleHoverAction = act  # GC 방지/상태 유지용
 
+        # -----------------------------
+        # Hover snap 토글
+        # -----------------------------
+        snapAct = QAction("Snap Hover to Data", self)
+        snapAct.setCheckable(True)
+        snapAct.setChecked(self.hoverSnap)
+
+        def _toggleSnap(checked: bool):
+            self.hoverSnap = checked
+            self._snapMarker.hide()
+
+        snapAct.toggled.connect(_toggleSnap)
+        menu.addAction(snapAct)
+        self._toggleSnapAction = snapAct
+
     def on_mouse_moved(self, evt):
         if not self.hoverEnabled: return
 
@@ -182,12 +323,25 @@ class PlotDock(QDockWidget):
 
         if not vb.sceneBoundingRect().contains(pos):
             self.tip.setText("")
+            self._snapMarker.hide()
             return
 
+        # x, y는 view 좌표 (log 축이면 log10 값). 표시하는 값은 raw 값
         p = vb.mapSceneToView(pos)
-        x, y = p.x(), p.y()
         x, y = float(p.x()), float(p.y())
-        self.tip.setText(f"x: {fmt_hybrid(x)}\ny: {fmt_hybrid(y)}")
+        logX, logY = self._logMode()
+
+        snapped = self._snapHover(x, y, vb) if self.hoverSnap else None
+        if snapped is None:
+            self._snapMarker.hide()
+            rawX, rawY = (10.0 ** x if logX else x), (10.0 ** y if logY else y)
+            self.tip.setText(f"x: {fmt_hybrid(rawX)}\ny: {fmt_hybrid(rawY)}")
+        else:
+            sampleX, sampleY, text = snapped
+            x, y = float(_to_view(sampleX, logX)), float(_to_view(sampleY, logY))
+            self._snapMarker.setData([x], [y])
+            self._snapMarker.show()
+            self.tip.setText(text)
 
         # 위치는 View 좌표계 그대로 (항상 안전)
         xr, yr = vb.viewRange()
@@ -195,6 +349,92 @@ class PlotDock(QDockWidget):
         dy = (yr[1] - yr[0]) * 0.02
         self.tip.setPos(x + dx, y + dy)
 
+    def _nearestSample(self, curve: _Curve, x: float, y: float, sx: float, sy: float, logX: bool = False, logY: bool = False) -> tuple[float, int]:
+
+        """
+            view 좌표 (x, y)에서 화면 거리로 가장 가까운 curve의 sample.
+            sx, sy는 view 단위당 픽셀 수. HOVER_SNAP_PIXELS 밖이면 None.
+            log 축이면 view 좌표가 log10 값이므로, 검색 범위는 raw x로 바꾸고 거리는 log10 값으로 잰다.
+
+            Returns:
+                tuple[float, int]: (픽셀 거리, 원래 index)
+        """
+
+        xs, order = curve.sortedX()
+        r = HOVER_SNAP_PIXELS / sx
+        a, b, center = x - r, x + r, x
+        if logX: a, b, center = 10.0 ** a, 10.0 ** b, 10.0 ** center
+        lo = int(np.searchsorted(xs, a, side="left"))
+        hi = int(np.searchsorted(xs, b, side="right"))
+        if hi - lo > HOVER_MAX_WINDOW:
+            center = int(np.searchsorted(xs, center))
+            lo = max(lo, center - HOVER_MAX_WINDOW // 2)
+            hi = min(hi, lo + HOVER_MAX_WINDOW)
+        if hi <= lo: return None
+
+        index = np.arange(lo, hi) if order is None else order[lo:hi]
+        ys = np.asarray(curve.y, dtype=np.float64)[index]
+        dist = np.hypot((_to_view(xs[lo:hi], logX) - x) * sx, (_to_view(ys, logY) - y) * sy)
+        dist[np.isnan(dist)] = np.inf
+        k = int(np.argmin(dist))
+        if dist[k] > HOVER_SNAP_PIXELS: return None
+        return float(dist[k]), int(index[k])
+
+    def _valueAt(self, curve: _Curve, x: float, sx: float, logX: bool = False) -> float:
+
+        """raw x에 가장 가까운 sample의 y. 곡선이 x 근처(화면에서 HOVER_SNAP_PIXELS)에 sample이 없으면 None."""
+
+        xs, order = curve.sortedX()
+        if len(xs) == 0: return None
+        i = int(np.searchsorted(xs, x))
+        candidates = [j for j in (i - 1, i) if 0 <= j < len(xs)]
+        # 화면 거리 (log-X면 log10 값 차이)
+        gap = lambda j: abs(float(_to_view(xs[j], logX)) - float(_to_view(x, logX)))
+        j = min(candidates, key=gap)
+        if not gap(j) * sx <= HOVER_SNAP_PIXELS: return None
+        return float(np.asarray(curve.y)[j if order is None else order[j]])
+
+    def _snapHover(self, x: float, y: float, vb) -> tuple[float, float, str]:
+
+        """
+            마우스 위치 (x, y; view 좌표)를 보이는 곡선 중 화면 거리로 가장 가까운 sample에 붙임.
+
+            Returns:
+                tuple[float, float, str]: (sample x, sample y (raw 값), tooltip 문자열). 가까운 sample이 없으면 None.
+        """
+
+        curves = [curve for curve in self._curves.values() if curve.item.isVisible() and curve.x is not None and len(curve.y)]
+        if not curves: return None
+
+        (x0, x1), (y0, y1) = vb.viewRange()
+        if x1 <= x0 or y1 <= y0: return None
+        sx = vb.width() / (x1 - x0)
+        sy = vb.height() / (y1 - y0)
+        logX, logY = self._logMode()
+
+        best = None
+        for curve in curves:
+            found = self._nearestSample(curve, x, y, sx, sy, logX, logY)
+            if found is not None and (best is None or found[0] < best[0]):
+                best = (found[0], found[1], curve)
+        if best is None: return None
+
+        _dist, i, snapCurve = best
+        sampleX, sampleY = float(snapCurve.x[i]), float(snapCurve.y[i])
+
+        # 같은 x에서 모든 곡선의 값 (붙은 곡선은 ▶ 표시, curve family는 붙은 member만)
+        lines = [f"x: {fmt_hybrid(sampleX)}"]
+        for curve in curves:
+            if curve is snapCurve:
+                member = f" {curve.family.label(curve.family.member(i))}" if curve.family is not None else ""
+                lines.append(f"▶ {curve.item.name()}{member}: {fmt_hybrid(sampleY)}")
+                continue
+            if curve.family is not None: continue
+            value = self._valueAt(curve, sampleX, sx, logX)
+            if value is not None:
+                lines.append(f"{curve.item.name()}: {fmt_hybrid(value)}")
+        return sampleX, sampleY, "\n".join(lines)
+
     def setPlotStyle(self):
         self.legend.setLabelTextSize('25pt')
         self._x0_line = pg.InfiniteLine(pos=0, angle=0, pen=pg.mkPen((200, 200, 200), width=2))
@@ -202,14 +442,65 @@ class PlotDock(QDockWidget):
         self.plotWidget.addItem(self._x0_line, ignoreBounds=True)
         self.plotWidget.addItem(self._y0_line, ignoreBounds=True)
 
+    def scheduleRefresh(self):
+
+        """
+            다음 프레임에 refreshPlot을 하도록 표시.
+            한 프레임 안에 여러 번 요청해도(여러 체크박스, 휠 스크롤, 여러 인터페이스 갱신 등) 한 번만 그린다.
+        """
+
+        if self._plotDirty: self.coalescedRenders += 1
+        self._plotDirty = True
+        self._startRenderTimer()
+
+    def _scheduleLevelOfDetail(self, *_):
+        self._lodDirty = True
+        self._startRenderTimer()
+
+    def _frameInterval(self) -> float:
+        screen = self.screen()
+        rate = screen.refreshRate() if screen is not None else 0
+        return 1.0 / (rate if rate > 0 else 60.0)
+
+    def _startRenderTimer(self):
+        if self._renderTimer.isActive(): return
+
+        # 마지막 렌더 후 한 프레임이 지났으면 다음 이벤트 루프에서 바로, 아니면 남은 시간 뒤에
+        wait = self._frameInterval() - (time.perf_counter() - self._lastRenderTime)
+        self._renderTimer.start(max(int(wait * 1000), 0))
+
+    def _renderFrame(self):
+        plotDirty, lodDirty = self._plotDirty, self._lodDirty
+        self._plotDirty = self._lodDirty = False
+        self._lastRenderTime = time.perf_counter()
+        if plotDirty:
+            self.renderCount += 1
+            self.refreshPlot()
+        if lodDirty:
+            self._updateLevelOfDetail()
+
+    def renderNow(self):
+
+        """
+            예약된 렌더를 기다리지 않고 바로 수행 (이벤트 루프 없이 그림을 내보낼 때 등).
+            refreshPlot이 view 범위를 바꾸면 그 범위의 level of detail까지 마저 그린다.
+        """
+
+        self._renderTimer.stop()
+        for _ in range(3):
+            if not (self._plotDirty or self._lodDirty): break
+            self._renderFrame()
+
     def refreshPlot(self):
-        self.clearImageOverlay()
-        self.plotWidget.clear()
-        self.legend = self.plotWidget.addLegend()
-        self.plotColorsIndex = 0
 
-        self.setPlotStyle()
-        if self.hoverEnabled: self.plotWidget.addItem(self.tip, ignoreBounds=True)
+        """
+            self.data를 화면에 반영.
+            곡선은 (interface_id, series) 별로 유지하며, 이미 있는 곡선은 setData로 갱신하고 새로 생기거나 없어진 series만 추가/제거한다.
+        """
+
+        wanted = set()
+        wantedLayers = set()
+        colorIndex = 0
 
         for interface_id, plot_data in self.data.items():
 
@@ -218,17 +509,21 @@ class PlotDock(QDockWidget):
                 img = plot_data.get('image')
                 pos = plot_data.get('image_pos', (0.0, 0.0, 10.0, 10.0))
                 opacity = plot_data.get('image_opacity', 1.0)
+                z = plot_data.get('image_z', 0)
                 if img is not None:
+                    wantedLayers.add(interface_id)
                     self.showImageOverlayArray(
                         img,
                         x0=pos[0],
                         y0=pos[1],
                         x1=pos[2],
                         y1=pos[3],
-                        opacity=opacity
+                        opacity=opacity,
+                        layer_id=interface_id,
+                        z=z
                     )
 
-                logging.info(f"Plotted PNG overlay for interface {interface_id}, position={pos}, opacity={opacity}")
+                logging.info(f"Plotted PNG overlay for interface {interface_id}, position={pos}, opacity={opacity}, z={z}")
 
             elif plot_data.get('file_type') in ['csv', 'lis']:
                 x = plot_data.get("x")
@@ -239,14 +534,167 @@ class PlotDock(QDockWidget):
                     continue
 
                 for series_name, y in ys.items():
-                    color = self.plotColors[self.plotColorsIndex % len(self.plotColors)]
-                    pen = pg.mkPen(color, width=2)
+                    key = (interface_id, series_name)
+                    wanted.add(key)
+                    color = self.plotColors[colorIndex % len(self.plotColors)]
 
-                    # 범례에 표시될 이름
+                    # 범례에 표시될 이름 (curve family는 항목 하나)
                     legend_name = f"{title}: {series_name}"
+                    if isinstance(y, CurveFamily) and len(y) > 1: legend_name += f" ({len(y)} curves)"
+                    self._setCurve(key, x, y, color, legend_name)
+                    colorIndex += 1
+
+        # 없어진 series만 제거
+        for key in [key for key in self._curves if key not in wanted]:
+            self._removeCurve(key)
+
+        for layer_id in [layer_id for layer_id in self._overlays if layer_id not in wantedLayers]:
+            self.clearImageOverlay(layer_id)
+
+        self._fitViewToData()
+        self.plotColorsIndex = colorIndex
+
+    def _setCurve(self, key: tuple, x: np.ndarray, y, color, legend_name: str):
+
+        """
+            key의 곡선을 만들거나, 이미 있으면 바뀐 부분(pen, 데이터, 범례 이름)만 갱신.
+            y가 CurveFamily면 모든 member를 item 하나로 그림 (x는 family.x 사용).
+        """
+
+        family = y if isinstance(y, CurveFamily) else None
+        if family is not None: x, y = family.x, family.y
+
+        curve = self._curves.get(key)
+        if curve is None:
+            item = self.plotWidget.plot(pen=pg.mkPen(color, width=2), name=legend_name)
+            curve = _Curve(item, x, y, color)
+            curve.family = family
+            self._curves[key] = curve
+            self._drawCurve(curve)
+            return
+
+        if curve.item.name() != legend_name:
+            curve.item.opts['name'] = legend_name
+            label = self.legend.getLabel(curve.item)
+            if label is not None: label.setText(legend_name)
+
+        if curve.color != color:
+            # 앞쪽 series가 빠져 색 순서가 바뀐 경우
+            curve.color = color
+            curve.item.setPen(pg.mkPen(color, width=2))
+            for sample, _label in self.legend.items:
+                if sample.item is curve.item: sample.update()
+
+        sameFamily = family.same_as(curve.family) if family is not None else curve.family is None
+        if not (sameFamily and _same_array(curve.x, x) and _same_array(curve.y, y)):
+            curve.x, curve.y, curve.family = x, y, family
+            curve.hoverIndex = None
+            self._drawCurve(curve)
+
+    def _drawCurve(self, curve: _Curve):
+
+        """곡선 데이터를 item에 넘김. 큰 곡선은 현재 화면 범위와 픽셀 폭에 맞춘 level만."""
+
+        x, y = curve.x, curve.y
+        if curve.family is not None:
+            # member 경계에서 선을 끊음
+            curve.pyramid = curve.lodKey = None
+            curve.item.setData(x, y, connect=curve.family.connect)
+            return
+
+        if len(y) < LOD_MIN_POINTS or not isinstance(x, np.ndarray) or not isinstance(y, np.ndarray):
+            curve.pyramid = curve.lodKey = None
+            curve.item.setData(x, y, connect="auto")
+            return
+
+        # 같은 배열의 앞부분(길이 슬라이더)이면 pyramid 재사용
+        if curve.pyramid is None or not curve.pyramid.covers(x, y):
+            curve.pyramid = MinMaxPyramid(x, y)
+            curve.lodKey = None
+        if not curve.pyramid.sorted:
+            # x가 정렬되지 않은 곡선(sweep 왕복 등)은 그대로
+            curve.item.setData(x, y, connect="auto")
+            return
+
+        vb = self.plotWidget.getPlotItem().getViewBox()
+        (x0, x1), _yRange = vb.viewRange()
+        # log-X면 view 범위는 log10 단위이므로 raw x로 바꿔서 자름
+        if self._logMode()[0]: x0, x1 = 10.0 ** x0, 10.0 ** x1
+        pixels = int(vb.width()) or 1000
+        lodKey = (x0, x1, pixels, len(y))
+        if lodKey == curve.lodKey: return
+        curve.lodKey = lodKey
+        curve.item.setData(*curve.pyramid.decimate(x0, x1, pixels, len(y)), connect="auto")
+
+    def _updateLevelOfDetail(self, *_):
+        for curve in self._curves.values():
+            if curve.pyramid is not None: self._drawCurve(curve)
+        for overlay in self._overlays.values(): self._updateOverlayLevel(overlay)
+
+    def _removeCurve(self, key: tuple):
+        curve = self._curves.pop(key)
+        self.legend.removeItem(curve.item)
+        self.plotWidget.removeItem(curve.item)
+
+    def _logMode(self) -> tuple[bool, bool]:
+
+        """(x축 log, y축 log) 여부 (우클릭 메뉴의 Plot Options > Transforms)"""
+
+        ctrl = self.plotWidget.getPlotItem().ctrl
+        return ctrl.logXCheck.isChecked(), ctrl.logYCheck.isChecked()
 
-                    self.plotWidget.plot(x, y, pen=pen, name=legend_name)
-                    self.plotColorsIndex += 1
+    def _onRangeChangedManually(self, *_):
+        self._fitView = False
+
+    def _fitViewToData(self):
+
+        """
+            DataInterface가 보낸 bounds(컬럼 prefix min/max로 상수 시간에 구한 값)로 view 범위를 직접 설정.
+            pyqtgraph autorange는 데이터가 바뀔 때마다 모든 곡선의 모든 점으로 bounds를 다시 계산하므로 대신 사용한다.
+            사용자가 직접 확대/이동하면 멈추고, autorange 버튼(A)을 누르면 다시 맞춘다.
+        """
+
+        vb = self.plotWidget.getPlotItem().getViewBox()
+        if any(vb.state['autoRange']): self._fitView = True
+        if not self._fitView: return
+
+        boxes = []
+        for plot_data in self.data.values():
+            if plot_data.get('file_type') not in ('csv', 'lis') or not plot_data.get('ys'): continue
+            bounds = plot_data.get('bounds')
+            if bounds is None:
+                # bounds를 모르는 데이터가 있으면 pyqtgraph autorange 사용
+                vb.enableAutoRange()
+                return
+            boxes.append(bounds)
+        if not boxes: return
+
+        x0, x1 = min(b[0] for b in boxes), max(b[1] for b in boxes)
+        y0, y1 = min(b[2] for b in boxes), max(b[3] for b in boxes)
+
+        # log 축은 view 좌표가 log10(값). 0 이하 값이 있으면 pyqtgraph처럼 그 점을 빼고 범위를 구해야 하므로 autorange 사용
+        logX, logY = self._logMode()
+        if (logX and x0 <= 0) or (logY and y0 <= 0):
+            vb.enableAutoRange()
+            return
+        if logX: x0, x1 = np.log10(x0), np.log10(x1)
+        if logY: y0, y1 = np.log10(y0), np.log10(y1)
+
+        vb.disableAutoRange()
+        vb.setRange(xRange=(x0, x1), yRange=(y0, y1))
+
+    def lockViewRange(self, x_range: tuple[float, float], y_range: tuple[float, float]):
+
+        """autorange를 끄고 view 범위를 고정 (히스토리 재생 등 프레임마다 bounds를 다시 계산할 필요가 없을 때)"""
+
+        vb = self.plotWidget.getPlotItem().getViewBox()
+        self._fitView = False
+        vb.disableAutoRange()
+        vb.setRange(xRange=x_range, yRange=y_range, padding=0.02)
+
+    def unlockViewRange(self):
+        self._fitView = True
+        self.plotWidget.getPlotItem().getViewBox().enableAutoRange()
 
     def clearInterface(self, interface_id: object):
 
@@ -254,9 +702,10 @@ class PlotDock(QDockWidget):
 
         if interface_id in self.data:
             self.data.pop(interface_id, None)
-            self.refreshPlot()
+            self.scheduleRefresh()
 
     def closeEvent(self, event):
-        logging.info(f"Closing dock widget: {self.windowTitle()}")
+        logging.info(f"Closing dock widget: {self.windowTitle()} ({self.renderCount} renders, {self.coalescedRenders} coalesced)")
+        self._renderTimer.stop()
         self.closed.emit(self)
         super().closeEvent(event)
\ No newline at end of file
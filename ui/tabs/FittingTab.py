@@ -0,0 +1,331 @@
+from PyQt6.QtWidgets import QWidget, QFormLayout, QLabel, QLineEdit, QPushButton, QComboBox, QTextEdit, QSpinBox, QHBoxLayout
+import pyqtgraph as pg
+
+import os, logging
+
+# utils에서 import
+from utils.SimulationRunner import SimulationRunner
+from utils.ParamFitter import ParamFitThread
+from utils.SensitivityAnalysis import SensitivityThread, METRICS
+
+# ui에서 import
+from ui.tabs.QuickParamsTab import updateParamsDisplay
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from main import MainWindow
+
+def createFittingTab(self: "MainWindow"):
+
+    """
+        favorite params를 측정 데이터(다른 DataInterface에 로드된 CSV)에 자동으로 맞추고,
+        각 파라미터의 민감도를 분석하는 탭.
+        - 시뮬레이션 명령어는 {params}(후보 params 파일), {output}(결과 파일) 자리표시자를 사용
+        - 비교 대상: reference 인터페이스에서 선택된 x축 / 체크된 y축 컬럼 (시뮬레이션 결과에도 같은 이름이 있어야 함)
+    """
+
+    tab5Widget = QWidget()
+    self.tabWidget.addTab(tab5Widget, "Fitting")
+
+    formLayout5 = QFormLayout(tab5Widget)
+    formLayout5.addRow("", QLabel("favorite params를 reference 데이터에 맞춰 자동 조정합니다."))
+    formLayout5.addRow("", QLabel("명령어에서 {params}, {output}는 후보별 파일 경로로 치환됩니다."))
+
+    # reference 데이터 인터페이스 선택
+    self.fitReferenceComboBox = QComboBox()
+    formLayout5.addRow("Reference:", self.fitReferenceComboBox)
+    formLayout5.addRow("", refreshButton := QPushButton("Refresh Interfaces"))
+    refreshButton.clicked.connect(lambda: refreshFitReferenceComboBox(self))
+
+    # 시뮬레이션 명령어 / 작업 디렉토리
+    self.fitCommandTextEdit = QTextEdit()
+    self.fitCommandTextEdit.setFixedHeight(80)
+    self.fitCommandTextEdit.setPlaceholderText('bash run.sh "{params}" "{output}"')
+    formLayout5.addRow("Command:", self.fitCommandTextEdit)
+    self.fitWorkDirLineEdit = QLineEdit()
+    self.fitWorkDirLineEdit.setPlaceholderText("(비우면 Output File 경로 옆 biwa_fit 디렉토리)")
+    formLayout5.addRow("Work Dir:", self.fitWorkDirLineEdit)
+
+    # 옵션
+    self.fitOutputExtComboBox = QComboBox()
+    self.fitOutputExtComboBox.addItems(["csv", "lis"])
+    formLayout5.addRow("Output Type:", self.fitOutputExtComboBox)
+    self.fitErrorScaleComboBox = QComboBox()
+    self.fitErrorScaleComboBox.addItems(["linear", "log"])
+    formLayout5.addRow("Error Scale:", self.fitErrorScaleComboBox)
+    self.fitMaxIterSpinBox = QSpinBox()
+    self.fitMaxIterSpinBox.setRange(1, 1000)
+    self.fitMaxIterSpinBox.setValue(50)
+    formLayout5.addRow("Max Iterations:", self.fitMaxIterSpinBox)
+    self.fitWorkersSpinBox = QSpinBox()
+    self.fitWorkersSpinBox.setRange(1, 64)
+    self.fitWorkersSpinBox.setValue(4)
+    formLayout5.addRow("Parallel Runs:", self.fitWorkersSpinBox)
+
+    # 시작/중지/적용 버튼
+    btnRow = QHBoxLayout()
+    btnRow.addWidget(startButton := QPushButton("Start Fitting"))
+    btnRow.addWidget(stopButton := QPushButton("Stop"))
+    btnRow.addWidget(applyButton := QPushButton("Apply Best"))
+    startButton.clicked.connect(lambda: startFittingHandler(self))
+    stopButton.clicked.connect(lambda: self.fitThread.stop() if self.fitThread is not None else None)
+    applyButton.clicked.connect(lambda: applyBestFitHandler(self))
+    formLayout5.addRow("", btnRow)
+
+    # 수렴 그래프: 모든 평가(점) + iteration별 최적 오차(선)
+    self.fitConvergencePlot = pg.PlotWidget()
+    self.fitConvergencePlot.setBackground((255, 255, 255))
+    self.fitConvergencePlot.setLabel("bottom", "Iteration / Evaluation")
+    self.fitConvergencePlot.setLabel("left", "RMS Error")
+    self.fitConvergencePlot.setMinimumHeight(200)
+    self.fitEvalScatter = self.fitConvergencePlot.plot([], [], pen=None, symbol="o", symbolSize=5, symbolBrush=(150, 150, 150))
+    self.fitBestCurve = self.fitConvergencePlot.plot([], [], pen=pg.mkPen("r", width=2))
+    formLayout5.addRow(self.fitConvergencePlot)
+
+    # 민감도 분석: favorite params를 ±% 섭동해 어떤 파라미터가 곡선을 움직이는지 순위로 표시
+    formLayout5.addRow("", QLabel("Sensitivity (Reference 인터페이스의 x/y 컬럼 기준)"))
+    self.sensPercentComboBox = QComboBox()
+    self.sensPercentComboBox.addItems(["5%", "10%"])
+    formLayout5.addRow("Perturbation:", self.sensPercentComboBox)
+    self.sensMetricComboBox = QComboBox()
+    self.sensMetricComboBox.addItems(list(METRICS.keys()))
+    formLayout5.addRow("Metric:", self.sensMetricComboBox)
+    formLayout5.addRow("", sensButton := QPushButton("Run Sensitivity"))
+    sensButton.clicked.connect(lambda: startSensitivityHandler(self))
+
+    self.sensBarPlot = pg.PlotWidget()
+    self.sensBarPlot.setBackground((255, 255, 255))
+    self.sensBarPlot.setLabel("left", "Normalized Sensitivity")
+    self.sensBarPlot.setMinimumHeight(200)
+    formLayout5.addRow(self.sensBarPlot)
+
+    self.fitStatusLabel = QLabel("")
+    self.fitStatusLabel.setWordWrap(True)
+    formLayout5.addRow("", self.fitStatusLabel)
+
+    self.fitThread: ParamFitThread = None
+    self.sensitivityThread: SensitivityThread = None
+    self.fitBestParams: dict[str, str] = None
+
+def refreshFitReferenceComboBox(self: "MainWindow"):
+
+    """
+        데이터가 로드된 csv/lis DataInterface 목록으로 reference 콤보박스를 갱신
+    """
+
+    self.fitReferenceComboBox.clear()
+    for data_interface in self.plotInterfaces:
+        if data_interface.fileType in ("csv", "lis"):
+            self.fitReferenceComboBox.addItem(f"IF {data_interface.interface_id}: {data_interface.path}", data_interface)
+
+def _selectedReference(self: "MainWindow"):
+
+    """
+        Reference 콤보박스에서 선택된 인터페이스와, 그 인터페이스의 x축 / 체크된 y축 컬럼을 반환.
+        선택이 올바르지 않으면 툴팁을 띄우고 None 반환.
+    """
+
+    reference = self.fitReferenceComboBox.currentData()
+    if reference is None or getattr(reference, "data", None) is None:
+        self.showTooltip("Reference data interface is not selected.")
+        return None
+
+    x_column = reference.xAxisComboBox.currentText()
+    y_columns = reference.yAxisPicker.checkedColumns()
+    if not y_columns:
+        self.showTooltip("Reference interface has no Y-axis column checked.")
+        return None
+
+    return reference, x_column, y_columns
+
+def _numericFavorites(self: "MainWindow") -> dict[str, float]:
+
+    """숫자 값을 가진 favorite params의 {key: value}"""
+
+    values = {}
+    for key, entry in self.params.items():
+        if not entry.get("favorite", False): continue
+        try: values[key] = float(entry.get("value", ""))
+        except ValueError: continue
+    return values
+
+def _buildSimulationRunner(self: "MainWindow") -> SimulationRunner:
+
+    """
+        탭의 명령어/작업 디렉토리/옵션과 현재 params로 SimulationRunner를 생성.
+        실패 시 툴팁을 띄우고 None 반환.
+    """
+
+    if not self.ssh:
+        logging.info("SSH connection is not established.")
+        self.showTooltip("SSH 연결이 되어 있지 않습니다.")
+        return None
+
+    command = self.fitCommandTextEdit.toPlainText().strip()
+    if "{params}" not in command or "{output}" not in command:
+        self.showTooltip("Command must contain {params} and {output}.")
+        return None
+
+    work_dir = self.fitWorkDirLineEdit.text().strip()
+    if not work_dir:
+        output_file_name = self.outputParamsFileNameLineEdit.text().strip()
+        work_dir = os.path.dirname(output_file_name).rstrip("/") + "/biwa_fit"
+
+    if self.modelcardDocument is None:
+        logging.info("Fitting: params template not loaded.")
+        self.showTooltip("Load a params file first (Quick Params).")
+        return None
+
+    return SimulationRunner(
+        self.ssh,
+        self.modelcardDocument.template_content,
+        {key: entry.get("value", "") for key, entry in self.params.items()},
+        command,
+        work_dir,
+        output_ext=self.fitOutputExtComboBox.currentText(),
+        max_workers=self.fitWorkersSpinBox.value()
+    )
+
+def _isBusy(self: "MainWindow") -> bool:
+    for thread in (self.fitThread, self.sensitivityThread):
+        if thread is not None and thread.isRunning():
+            self.showTooltip("Fitting or sensitivity analysis is already running.")
+            return True
+    return False
+
+def startFittingHandler(self: "MainWindow"):
+
+    """
+        Start Fitting 버튼 핸들러
+    """
+
+    if _isBusy(self): return
+
+    selected = _selectedReference(self)
+    if selected is None: return
+    reference, x_column, y_columns = selected
+
+    # fitting 대상: 숫자 값을 가진 favorite params
+    init_values = _numericFavorites(self)
+    fit_keys = list(init_values.keys())
+    if not fit_keys:
+        self.showTooltip("No numeric favorite params to fit.")
+        return
+
+    runner = _buildSimulationRunner(self)
+    if runner is None: return
+
+    self.fitThread = ParamFitThread(
+        runner,
+        fit_keys,
+        init_values,
+        reference.columnData([x_column, *y_columns]),
+        x_column,
+        y_columns,
+        log_scale=self.fitErrorScaleComboBox.currentText() == "log",
+        max_iter=self.fitMaxIterSpinBox.value()
+    )
+
+    # 수렴 그래프 초기화
+    self._fitEvalErrors = []
+    self._fitBestXs, self._fitBestErrors = [], []
+    self.fitEvalScatter.setData([], [])
+    self.fitBestCurve.setData([], [])
+    self.fitBestParams = None
+
+    def _onEvaluated(count: int, err: float, values: dict):
+        self._fitEvalErrors.append(err)
+        finite = [(i, e) for i, e in enumerate(self._fitEvalErrors, start=1) if e != float("inf")]
+        if finite: self.fitEvalScatter.setData(*zip(*finite))
+        self.fitStatusLabel.setText(f"Evaluation {count}: error = {err:.6g}")
+
+    def _onIterationDone(it: int, err: float, values: dict):
+        if err != float("inf"):
+            self.fitBestParams = values
+
+            # 평가 점들과 같은 x축을 쓰도록 iteration 시점의 누적 평가 수를 x로 사용
+            self._fitBestXs.append(len(self._fitEvalErrors))
+            self._fitBestErrors.append(err)
+            self.fitBestCurve.setData(self._fitBestXs, self._fitBestErrors)
+        self.fitStatusLabel.setText(f"Iteration {it}: best error = {err:.6g}\n" + ", ".join(f"{k}={v}" for k, v in values.items()))
+
+    def _onFinished(values: dict, err: float):
+        self.fitBestParams = values
+        self.fitStatusLabel.setText(f"Finished: best error = {err:.6g}\n" + ", ".join(f"{k}={v}" for k, v in values.items()))
+        self.showTooltip("Fitting finished.")
+
+    self.fitThread.evaluated.connect(_onEvaluated)
+    self.fitThread.iterationDone.connect(_onIterationDone)
+    self.fitThread.fitFinished.connect(_onFinished)
+    self.fitThread.fitFailed.connect(lambda msg: self.fitStatusLabel.setText(f"Fitting failed: {msg}"))
+    self.fitThread.start()
+
+    logging.info(f"Fitting started: keys={fit_keys}, reference={reference.path}, x={x_column}, y={y_columns}")
+    self.showTooltip("Fitting started.")
+
+def applyBestFitHandler(self: "MainWindow"):
+
+    """
+        fitting 결과(현재까지의 최적 값)를 Quick Params에 반영
+    """
+
+    if not self.fitBestParams:
+        self.showTooltip("No fitting result yet.")
+        return
+
+    for key, value in self.fitBestParams.items():
+        if key in self.params:
+            self.params[key]["value"] = value
+
+    updateParamsDisplay(self, self.params)
+    logging.info(f"Applied best fit params: {self.fitBestParams}")
+    self.showTooltip("Best fit params applied. Save with Ctrl+S.")
+
+def startSensitivityHandler(self: "MainWindow"):
+
+    """
+        Run Sensitivity 버튼 핸들러.
+        favorite params를 ±% 섭동한 2N개 시뮬레이션을 동시에 실행하고, 민감도 순위를 막대 그래프로 표시.
+    """
+
+    if _isBusy(self): return
+
+    selected = _selectedReference(self)
+    if selected is None: return
+    reference, x_column, y_columns = selected
+
+    values = _numericFavorites(self)
+    if not values:
+        self.showTooltip("No numeric favorite params to analyze.")
+        return
+
+    runner = _buildSimulationRunner(self)
+    if runner is None: return
+
+    percent = float(self.sensPercentComboBox.currentText().rstrip("%")) / 100.0
+    self.sensitivityThread = SensitivityThread(
+        runner,
+        list(values.keys()),
+        {key: self.params[key].get("value", "") for key in values},
+        x_column,
+        y_columns,
+        percent=percent,
+        metric=self.sensMetricComboBox.currentText(),
+        log_scale=self.fitErrorScaleComboBox.currentText() == "log"
+    )
+
+    def _onFinished(keys: list, sensitivities: list):
+        self.sensBarPlot.clear()
+        heights = [s if s == s else 0.0 for s in sensitivities]  # nan -> 0
+        self.sensBarPlot.addItem(pg.BarGraphItem(x=list(range(len(keys))), height=heights, width=0.7, brush=(80, 120, 200)))
+        self.sensBarPlot.getAxis("bottom").setTicks([list(enumerate(keys))])
+        self.fitStatusLabel.setText("Sensitivity (ranked): " + ", ".join(f"{k}={s:.3g}" for k, s in zip(keys, sensitivities)))
+        self.showTooltip("Sensitivity analysis finished.")
+
+    self.sensitivityThread.sensitivityFinished.connect(_onFinished)
+    self.sensitivityThread.sensitivityFailed.connect(lambda msg: self.fitStatusLabel.setText(f"Sensitivity failed: {msg}"))
+    self.sensitivityThread.start()
+
+    logging.info(f"Sensitivity started: keys={list(values.keys())}, x={x_column}, y={y_columns}, percent={percent}")
+    self.fitStatusLabel.setText(f"Running {2 * len(values)} perturbed simulations...")
+
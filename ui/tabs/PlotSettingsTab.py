@@ -60,7 +60,7 @@ def createDataInterface(self: "MainWindow"):
         새로운 DataInterface를 생성하는 메서드
     """
 
-    data_interface = DataInterface(self.ssh, self.plotDocks, self.dataPathHistory)
+    data_interface = DataInterface(self.ssh, self.plotDocks, self.dataPathHistory, self.historyMemoryBudgetMB, self.lazyColumnLoading, self.ingestOptions, self.streamLoading, self.datasetRegistry)
 
     # 접이식 컨테이너
     group = QGroupBox(f'{data_interface.interface_id}')
@@ -51,14 +51,10 @@ def editorGetButtonHandler(self: "MainWindow"):
     try:
         self.showTooltip("Getting file...")
 
-        # 파일 다운로드
-        local_file_path = './temp/editor_file.txt'
-        self.ssh.get_file(file_path, local_file_path)
-
-        # 파일 내용을 읽어서 에디터에 표시
-        with open(local_file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            self.editorTextEdit.setPlainText(content)
+        # 파일 내용을 메모리로 받아 에디터에 표시 (바뀌지 않았으면 캐시 사용)
+        data = self.remoteFileCache.get(file_path) if self.remoteFileCache else self.ssh.get_bytes(file_path)
+        content = data.decode('utf-8')
+        self.editorTextEdit.setPlainText(content)
         logging.info(f"File loaded successfully: {file_path}")
         self.showTooltip("File loaded successfully.")
     except Exception as e:
@@ -1,9 +1,10 @@
 from PyQt6.QtWidgets import QWidget, QFormLayout, QLabel, QLineEdit, QPushButton, QScrollArea, QCheckBox, QComboBox
 
-import os, logging
+import logging
 
 # utils에서 import
 from utils.utils import parseParamsFile
+from utils.ModelcardDocument import ModelcardDocument
 
 # ui에서 import
 from ui.ParamRowWidget import ParamRowWidget
@@ -20,6 +21,7 @@ def initializeQuickParamsTab(self: "MainWindow"):
 
     self.params = {'sample1': {'value': 10, 'favorite': False}, 'sample2': {'value': 20, 'favorite': True}}
     self.fav_params = {}
+    self.modelcardDocument: ModelcardDocument = None
 
     self.paramsFileComboBox_history = []
 
@@ -81,7 +83,7 @@ def loadParamsFileHandler(self: "MainWindow"):
 
     """
         Params 파일 로드 핸들러 (원격 전용).
-        - SSH로 원격 파일을 내려받아 ./temp/params_file.txt 로 저장한 뒤 파싱합니다.
+        - SSH로 원격 파일 내용을 메모리로 내려받아 파싱합니다. (크기/수정 시간이 같으면 캐시 사용)
         - SSH 연결이 없으면 로드하지 않습니다.
     """
 
@@ -100,19 +102,17 @@ def loadParamsFileHandler(self: "MainWindow"):
 
     # 파일 다운로드 및 파싱
     try:
-        os.makedirs("./temp", exist_ok=True)
-        local_tmp = "./temp/params_file.txt"
 
-        # 원격 파일 다운로드
-        self.ssh.get_file(file_path, local_tmp)
-
-        # 로컬 임시 파일 읽기
-        with open(local_tmp, "r", encoding="utf-8") as f:
-            content = f.read()
+        # 원격 파일 내용을 메모리로 다운로드 (바뀌지 않았으면 캐시 사용)
+        data = self.remoteFileCache.get(file_path) if self.remoteFileCache else self.ssh.get_bytes(file_path)
+        content = data.decode("utf-8")
 
         params = parseParamsFile(content)
         self.params = params
 
+        # 저장 시 바뀐 값만 갈아 끼울 수 있도록 key/value 위치를 한 번 인덱싱
+        self.modelcardDocument = ModelcardDocument(content, params.keys())
+
         # favorite params 복원
         for key in self.fav_params:
             if key in self.params:
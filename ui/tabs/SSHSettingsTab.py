@@ -1,5 +1,6 @@
 from PyQt6.QtWidgets import QWidget, QFormLayout, QLineEdit, QLabel, QPushButton
 from utils.SSHManager import SSHManager
+from utils.RemoteFileCache import RemoteFileCache
 import logging
 
 from typing import TYPE_CHECKING
@@ -50,6 +51,10 @@ def connectButtonHandler(self: "MainWindow"):
     try:
         self.ssh = SSHManager(host, port, userId, key_path)
         logging.info("SSH 연결 성공")
+
+        # 원격 텍스트 파일 캐시 생성 후, params 파일 히스토리를 백그라운드로 미리 받아 둠
+        self.remoteFileCache = RemoteFileCache(self.ssh)
+        self.remoteFileCache.prefetch([self.paramsFileComboBox.itemText(i) for i in range(self.paramsFileComboBox.count())])
     except Exception as e: logging.info(f"SSH 연결 실패: {e}")
 
     # connect 버튼 비활성화
@@ -0,0 +1,166 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+
+def as_float64_column(values) -> np.ndarray:
+
+    """
+        컬럼 값을 C-contiguous float64 ndarray(읽기 전용)로 변환. 이미 그런 배열이면 복사하지 않는다.
+        숫자가 아닌 값은 NaN.
+
+        Args:
+            values (pd.Series | np.ndarray): 컬럼 값
+
+        Returns:
+            np.ndarray: shape (n,), dtype float64
+    """
+
+    array = values.to_numpy() if isinstance(values, pd.Series) else np.asarray(values)
+    if array.dtype == object or not np.issubdtype(array.dtype, np.number):
+        array = pd.to_numeric(pd.Series(array), errors="coerce").to_numpy(dtype=np.float64)
+    if array.dtype != np.float64 or not array.flags.c_contiguous:
+        array = np.ascontiguousarray(array, dtype=np.float64)
+    array = array.view()
+    array.flags.writeable = False
+    return array
+
+# PrefixBounds의 block 크기 (bounds 조회 한 번에 최대 이만큼만 직접 계산)
+PREFIX_BLOCK = 1024
+
+class PrefixBounds:
+
+    """
+        컬럼 앞부분 values[:n]의 (min, max)를 상수 시간에 구하기 위한 block 단위 누적 min/max.
+        데이터 버전마다 한 번 계산하고, 메모리는 컬럼 길이 / PREFIX_BLOCK * 2개 값. NaN은 무시한다.
+        컬럼 배열은 보관하지 않으므로(디스크로 내보낸 히스토리 컬럼을 RAM에 붙잡지 않도록) 조회할 때 같은 배열을 넘긴다.
+
+            prefix = PrefixBounds(values)
+            lo, hi = prefix.bounds(values, n)
+
+        Args:
+            values (np.ndarray): float64 컬럼 배열
+    """
+
+    def __init__(self, values: np.ndarray):
+        self.length = len(values)
+        m = len(values) // PREFIX_BLOCK
+        if m:
+            blocks = values[:m * PREFIX_BLOCK].reshape(m, PREFIX_BLOCK)
+            self.prefix_min = np.fmin.accumulate(np.fmin.reduce(blocks, axis=1))
+            self.prefix_max = np.fmax.accumulate(np.fmax.reduce(blocks, axis=1))
+        else:
+            self.prefix_min = self.prefix_max = np.zeros(0)
+
+    def bounds(self, values: np.ndarray, n: int = None) -> tuple[float, float] | None:
+
+        """values[:n]의 (min, max). 유한한 값이 없으면 None. (values는 이 객체를 만든 배열)"""
+
+        n = self.length if n is None else min(n, self.length)
+        k = n // PREFIX_BLOCK
+        lo, hi = (self.prefix_min[k - 1], self.prefix_max[k - 1]) if k else (np.nan, np.nan)
+        tail = values[k * PREFIX_BLOCK:n]
+        if len(tail):
+            lo = np.fmin(lo, np.fmin.reduce(tail))
+            hi = np.fmax(hi, np.fmax.reduce(tail))
+        if not (np.isfinite(lo) and np.isfinite(hi)): return None
+        return float(lo), float(hi)
+
+def union_bounds(bounds) -> tuple[float, float] | None:
+
+    """(min, max) 리스트(None 포함)의 합집합"""
+
+    bounds = [b for b in bounds if b is not None]
+    if not bounds: return None
+    return min(b[0] for b in bounds), max(b[1] for b in bounds)
+
+class ColumnStore:
+
+    """
+        데이터 버전 하나에 대한 컬럼별 contiguous float64 배열 캐시.
+        컬럼마다 변환은 처음 한 번만 하고, 플롯에는 array[:n] 같은 slice view(복사 없음)를 넘긴다.
+
+            store.reset(df)          # 새 데이터 버전
+            x = store.get("TIME")[:n]
+
+        Args:
+            frame (pd.DataFrame, optional): 컬럼을 꺼낼 DataFrame
+    """
+
+    def __init__(self, frame: pd.DataFrame = None):
+        self._frame = frame
+        self._arrays: dict[str, np.ndarray] = {}
+        self._bounds: dict[str, PrefixBounds] = {}
+
+    def reset(self, frame: pd.DataFrame):
+
+        """새 데이터 버전: 캐시를 비움"""
+
+        self._frame = frame
+        self._arrays.clear()
+        self._bounds.clear()
+
+    def extend(self, frame: pd.DataFrame):
+
+        """같은 데이터 버전에 컬럼만 추가된 경우 (lazy 로드): 캐시 유지"""
+
+        self._frame = frame
+
+    def __contains__(self, name: str) -> bool:
+        return self._frame is not None and name in self._frame.columns
+
+    def __len__(self) -> int:
+        return 0 if self._frame is None else len(self._frame)
+
+    def get(self, name: str) -> np.ndarray:
+
+        """name 컬럼의 float64 배열 (캐시)"""
+
+        array = self._arrays.get(name)
+        if array is None:
+            array = as_float64_column(self._frame[name])
+            self._arrays[name] = array
+        return array
+
+    def bounds(self, name: str, n: int = None) -> tuple[float, float] | None:
+
+        """name 컬럼 앞 n개의 (min, max) (PrefixBounds 캐시, 상수 시간)"""
+
+        values = self.get(name)
+        prefix = self._bounds.get(name)
+        if prefix is None:
+            prefix = PrefixBounds(values)
+            self._bounds[name] = prefix
+        return prefix.bounds(values, n)
+
+if __name__ == "__main__":
+
+    # 벤치마크: python -m utils.ColumnStore
+    # updatePlot 한 번에 플롯으로 넘기는 데이터를 만드는 데 드는 메모리 할당 비교 (pandas iloc slice vs ColumnStore view)
+    import tracemalloc, time
+
+    rows, cols, redraws = 1_000_000, 20, 50
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.standard_normal((rows, cols)), columns=[f"v{i}" for i in range(cols)])
+    names = frame.columns[1:].tolist()
+    n = rows // 2
+
+    def pandas_path():
+        # 기존: Series.iloc[:n] -> 플롯 쪽에서 np.asarray
+        x = np.asarray(frame["v0"].iloc[:n], dtype=np.float64)
+        return [np.asarray(frame[c].iloc[:n], dtype=np.float64) for c in names], x
+
+    store = ColumnStore(frame)
+    def store_path():
+        return [store.get(c)[:n] for c in names], store.get("v0")[:n]
+
+    store_path()  # 첫 변환(데이터 버전당 한 번)은 측정에서 제외
+    for label, fn in (("pandas iloc", pandas_path), ("ColumnStore", store_path)):
+        fn()
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        for _ in range(redraws): fn()
+        elapsed = time.perf_counter() - t0
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot_total = sum(stat.size for stat in tracemalloc.take_snapshot().statistics("filename"))
+        tracemalloc.stop()
+        print(f"{label:12s} {elapsed / redraws * 1e3:8.3f} ms/redraw  peak {peak / 1e6:8.2f} MB  retained {snapshot_total / 1e3:8.1f} KB")
@@ -0,0 +1,290 @@
+from __future__ import annotations
+import io, re, time, logging
+from typing import Iterator
+import numpy as np
+import pandas as pd
+
+# pyarrow는 선택 의존성: 없으면 pandas C 엔진으로 읽음
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None
+    pa_csv = None
+
+_ARROW_ERRORS = (pa.ArrowException,) if pa is not None else ()
+
+# 줄 전체가 주석인 줄 (pandas의 comment='#'와 같은 의미가 되도록 pyarrow 입력에서 제거)
+_COMMENT_LINE = re.compile(rb'(?m)^#[^\n]*(?:\n|$)')
+
+class IngestOptions:
+
+    """
+        DataInterface가 csv를 읽는 방식 설정.
+
+        Args:
+            engine (str, optional): "auto"(pyarrow가 있으면 pyarrow), "pyarrow", "pandas". 기본값은 "auto".
+            float_dtype (str, optional): 실수 컬럼의 dtype. "float64" 또는 "float32"(메모리 절반). 기본값은 "float64".
+            chunk_rows (int, optional): 0보다 크면 이 행 수 단위로 나눠 파싱 (한 번에 필요한 메모리 감소). 기본값은 0.
+    """
+
+    ENGINES = ("auto", "pyarrow", "pandas")
+    FLOAT_DTYPES = ("float64", "float32")
+
+    def __init__(self, engine: str = "auto", float_dtype: str = "float64", chunk_rows: int = 0):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown csv engine: {engine} (expected one of {self.ENGINES})")
+        if float_dtype not in self.FLOAT_DTYPES:
+            raise ValueError(f"Unknown float dtype: {float_dtype} (expected one of {self.FLOAT_DTYPES})")
+        self.engine = engine
+        self.float_dtype = float_dtype
+        self.chunk_rows = max(0, int(chunk_rows))
+
+    @classmethod
+    def from_config(cls, config_dict: dict) -> "IngestOptions":
+
+        """config.json 값으로 생성. 잘못된 값은 기본값으로 대체."""
+
+        try:
+            return cls(
+                config_dict.get("csv_engine", "auto"),
+                config_dict.get("csv_float_dtype", "float64"),
+                config_dict.get("csv_chunk_rows", 0)
+            )
+        except (ValueError, TypeError) as e:
+            logging.info(f"IngestOptions: invalid config, using defaults: {e}")
+            return cls()
+
+    def to_config(self) -> dict:
+        return {"csv_engine": self.engine, "csv_float_dtype": self.float_dtype, "csv_chunk_rows": self.chunk_rows}
+
+    def resolved_engine(self) -> str:
+
+        """실제로 사용할 엔진 ("pyarrow" 또는 "pandas")"""
+
+        if self.engine == "pandas": return "pandas"
+        if pa is None:
+            if self.engine == "pyarrow":
+                logging.info("IngestOptions: pyarrow is not installed, falling back to pandas.")
+            return "pandas"
+        return "pyarrow"
+
+class IngestStats:
+
+    """csv 파싱 처리량 기록"""
+
+    def __init__(self, engine: str, nbytes: int):
+        self.engine = engine
+        self.nbytes = nbytes
+        self.rows = 0
+        self.chunks = 0
+        self.seconds = 0.0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.nbytes / 1e6 / self.seconds if self.seconds > 0 else float("inf")
+
+    def __str__(self) -> str:
+        return (f"{self.engine}: {self.nbytes / 1e6:.1f} MB, {self.rows} rows, {self.chunks} chunks "
+                f"in {self.seconds:.3f} s ({self.mb_per_s:.1f} MB/s)")
+
+def _cast_floats_pandas(df: pd.DataFrame, float_dtype: str) -> pd.DataFrame:
+    if float_dtype == "float64": return df
+    cols = [c for c in df.columns if pd.api.types.is_float_dtype(df[c].dtype) and df[c].dtype != float_dtype]
+    if cols: df[cols] = df[cols].astype(float_dtype)
+    return df
+
+def _arrow_to_pandas(table, float_dtype: str) -> pd.DataFrame:
+
+    # pandas로 넘기기 전에 arrow 쪽에서 float32로 바꿔, float64 중간 사본을 만들지 않음
+    if float_dtype == "float32":
+        schema = table.schema
+        for i, field in enumerate(schema):
+            if pa.types.is_floating(field.type) and field.type != pa.float32():
+                schema = schema.set(i, pa.field(field.name, pa.float32()))
+        if schema != table.schema:
+            table = table.cast(schema)
+    return table.to_pandas()
+
+def _prepare_for_arrow(raw: bytes) -> bytes | None:
+
+    """줄 전체 주석을 제거. 줄 중간 주석이 남아 있으면 pyarrow로는 같은 결과를 낼 수 없으므로 None."""
+
+    if raw.startswith(b'#') or b'\n#' in raw:
+        raw = _COMMENT_LINE.sub(b'', raw)
+    if b'#' in raw:
+        return None
+    return raw
+
+def _block_size(raw: bytes, chunk_rows: int) -> int:
+
+    # 앞부분의 평균 행 길이로 chunk_rows에 해당하는 byte 크기를 추정
+    head = raw[:1 << 16]
+    row_bytes = max(1, len(head) // max(1, head.count(b'\n')))
+    return max(1 << 16, row_bytes * chunk_rows)
+
+def _column_names(raw: bytes) -> list[str]:
+
+    """pandas 엔진과 같은 컬럼 이름 (중복 header는 "a", "a.1"처럼 구분)"""
+
+    return pd.read_csv(io.BytesIO(raw), nrows=0).columns.tolist()
+
+def _iter_pyarrow(raw: bytes, options: IngestOptions, usecols) -> Iterator[pd.DataFrame]:
+
+    # pyarrow는 중복 header 이름을 그대로 두므로, pandas가 만드는 이름을 직접 지정하고 header 줄은 건너뜀
+    names = _column_names(raw)
+    include = list(usecols) if usecols is not None else None
+
+    if options.chunk_rows:
+        read_options = pa_csv.ReadOptions(
+            use_threads=True, block_size=_block_size(raw, options.chunk_rows), column_names=names, skip_rows=1
+        )
+        reader = pa_csv.open_csv(io.BytesIO(raw), read_options=read_options, convert_options=pa_csv.ConvertOptions(include_columns=include))
+
+        # 조각 단위로 읽을 때 타입은 첫 block에서 추론되므로, 정수로 보인 컬럼에 뒤에서 실수가 나오면 실패함 -> 정수 컬럼은 float64로 읽음
+        ints = [field.name for field in reader.schema if pa.types.is_integer(field.type)]
+        if ints:
+            convert_options = pa_csv.ConvertOptions(include_columns=include, column_types={name: pa.float64() for name in ints})
+            reader = pa_csv.open_csv(io.BytesIO(raw), read_options=read_options, convert_options=convert_options)
+        for batch in reader:
+            yield _arrow_to_pandas(batch, options.float_dtype)
+    else:
+        read_options = pa_csv.ReadOptions(use_threads=True, column_names=names, skip_rows=1)
+        table = pa_csv.read_csv(io.BytesIO(raw), read_options=read_options, convert_options=pa_csv.ConvertOptions(include_columns=include))
+        yield _arrow_to_pandas(table, options.float_dtype)
+
+def _iter_pandas(raw: bytes, options: IngestOptions, usecols, skip: int = 0) -> Iterator[pd.DataFrame]:
+
+    # skip: 이미 내보낸 행 수 (pyarrow가 조각을 내보낸 뒤 실패해 pandas로 이어 읽을 때. 조각 단위일 때만 생김)
+    kwargs = dict(comment='#', usecols=list(usecols) if usecols is not None else None)
+    if options.chunk_rows:
+        for chunk in pd.read_csv(io.BytesIO(raw), chunksize=options.chunk_rows, **kwargs):
+            if skip >= len(chunk):
+                skip -= len(chunk)
+                continue
+            if skip: chunk, skip = chunk.iloc[skip:], 0
+            yield _cast_floats_pandas(chunk, options.float_dtype)
+    else:
+        yield _cast_floats_pandas(pd.read_csv(io.BytesIO(raw), **kwargs), options.float_dtype)
+
+def _empty_frame(raw: bytes, options: IngestOptions, usecols) -> pd.DataFrame:
+
+    """header 컬럼만 있는 0행 DataFrame (조각 없이 끝난 경우)"""
+
+    df = pd.read_csv(io.BytesIO(raw), comment='#', nrows=0, usecols=list(usecols) if usecols is not None else None)
+    return _cast_floats_pandas(df, options.float_dtype)
+
+def iter_csv_chunks(raw: bytes, options: IngestOptions = None, usecols=None, stats: IngestStats = None) -> Iterator[pd.DataFrame]:
+
+    """
+        csv 내용을 DataFrame 조각으로 나눠 파싱하는 iterator. (chunk_rows가 0이면 조각 하나)
+        pyarrow가 실패하면 pandas로 다시 읽는다 (이미 조각을 내보냈다면 그 다음 행부터 이어서).
+
+        Args:
+            raw (bytes): csv 파일 내용
+            options (IngestOptions, optional): 파싱 설정. 기본값은 IngestOptions().
+            usecols (list[str], optional): 읽을 컬럼. None이면 전체.
+            stats (IngestStats, optional): 전달하면 처리량을 기록함 (조각을 만드는 시간만 측정)
+
+        Yields:
+            pd.DataFrame: 파싱된 조각
+    """
+
+    options = options or IngestOptions()
+    engine = options.resolved_engine()
+    source = raw
+    if engine == "pyarrow":
+        source = _prepare_for_arrow(raw)
+        if source is None:
+            logging.info("CsvIngest: inline comments found, using pandas engine.")
+            engine = "pandas"
+            source = raw
+    if stats is not None: stats.engine = engine
+
+    chunks = _iter_pyarrow(source, options, usecols) if engine == "pyarrow" else _iter_pandas(source, options, usecols)
+    rows = 0
+    yielded = False
+    while True:
+        t0 = time.perf_counter()
+        try:
+            chunk = next(chunks)
+        except StopIteration:
+            # header만 있는 파일은 조각 단위 reader가 아무 조각도 내지 않음 -> header 컬럼을 가진 빈 조각 하나
+            if not yielded: yield _empty_frame(raw, options, usecols)
+            return
+        except _ARROW_ERRORS as e:
+            if engine != "pyarrow": raise
+            engine = "pandas"
+            logging.info(f"CsvIngest: pyarrow failed ({e}), using pandas engine from row {rows}.")
+            if stats is not None: stats.engine = "pandas"
+            chunks = _iter_pandas(raw, options, usecols, skip=rows)
+            continue
+        finally:
+            if stats is not None: stats.seconds += time.perf_counter() - t0
+        if stats is not None:
+            stats.rows += len(chunk)
+            stats.chunks += 1
+        rows += len(chunk)
+        yielded = True
+        yield chunk
+
+def read_csv(raw: bytes, options: IngestOptions = None, usecols=None) -> tuple[pd.DataFrame, IngestStats]:
+
+    """
+        csv 내용을 DataFrame 하나로 파싱하고 처리량을 함께 반환.
+
+        Args:
+            raw (bytes): csv 파일 내용
+            options (IngestOptions, optional): 파싱 설정
+            usecols (list[str], optional): 읽을 컬럼. None이면 전체.
+
+        Returns:
+            tuple[pd.DataFrame, IngestStats]: 결과와 처리량
+    """
+
+    options = options or IngestOptions()
+    stats = IngestStats(options.resolved_engine(), len(raw))
+    chunks = list(iter_csv_chunks(raw, options, usecols, stats))
+    if len(chunks) == 1:
+        df = chunks[0]
+    else:
+        t0 = time.perf_counter()
+        df = pd.concat(chunks, ignore_index=True)
+        # 조각마다 추론된 dtype이 다르면(int/float) concat 결과가 float64가 될 수 있음
+        df = _cast_floats_pandas(df, options.float_dtype)
+        stats.seconds += time.perf_counter() - t0
+    logging.info(f"CsvIngest: {stats}")
+    return df, stats
+
+if __name__ == "__main__":
+
+    # 벤치마크: python -m utils.CsvIngest --rows 200000 --cols 50
+    import argparse, tracemalloc
+
+    parser = argparse.ArgumentParser(description="csv ingestion benchmark")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--chunk-rows", type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame(rng.standard_normal((args.rows, args.cols)), columns=[f"v({i})" for i in range(args.cols)])
+    raw = ("# benchmark\n" + frame.to_csv(index=False)).encode()
+    print(f"{len(raw) / 1e6:.1f} MB, {args.rows} rows x {args.cols} cols, pyarrow={'yes' if pa is not None else 'no'}")
+
+    engines = ["pandas"] + (["pyarrow"] if pa is not None else [])
+    for engine in engines:
+        for float_dtype in IngestOptions.FLOAT_DTYPES:
+            for chunk_rows in (0, args.chunk_rows):
+                options = IngestOptions(engine, float_dtype, chunk_rows)
+                best = None
+                for _ in range(args.repeat):
+                    tracemalloc.start()
+                    df, stats = read_csv(raw, options)
+                    peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                    if best is None or stats.seconds < best[0].seconds: best = (stats, peak, df.memory_usage(deep=False).sum())
+                stats, peak, result_bytes = best
+                print(f"{engine:8s} {float_dtype:8s} chunk={chunk_rows:<7d} {stats.mb_per_s:8.1f} MB/s  "
+                      f"peak {peak / 1e6:8.1f} MB  result {result_bytes / 1e6:7.1f} MB")
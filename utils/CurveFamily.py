@@ -0,0 +1,97 @@
+from __future__ import annotations
+import numpy as np
+
+class CurveFamily:
+
+    """
+        여러 곡선(sweep block, Monte Carlo run 등)을 배열 하나로 이어 붙인 series.
+        PlotDock은 이를 곡선 item 하나, 범례 항목 하나로 그리고 (member 경계는 connect mask로 끊음),
+        hover에서는 sample index로 어느 member인지 찾는다.
+
+            family = CurveFamily.from_sweeps(x, y)          # x가 첫 값으로 돌아오는 곳마다 member 구분
+            family = CurveFamily.from_blocks(blocks)        # [(x0, y0), (x1, y1), ...]
+            dock.data[id]["ys"]["vout"] = family
+
+        Args:
+            x (np.ndarray): 모든 member의 x를 이어 붙인 배열
+            y (np.ndarray): 모든 member의 y를 이어 붙인 배열 (x와 같은 길이)
+            offsets (np.ndarray): member마다 시작 index (오름차순, 첫 값은 0)
+            labels (list[str], optional): member 이름. 없으면 "#0", "#1", ...
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, offsets: np.ndarray, labels: list[str] = None):
+        self.x = x
+        self.y = y
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.labels = labels
+        self._connect: np.ndarray = None
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    @classmethod
+    def from_blocks(cls, blocks: list[tuple[np.ndarray, np.ndarray]], labels: list[str] = None) -> "CurveFamily":
+
+        """(x, y) block 리스트를 이어 붙여 생성 (복사 한 번)"""
+
+        lengths = [len(y) for _x, y in blocks]
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if blocks else np.zeros(0, dtype=np.int64)
+        x = np.concatenate([np.asarray(x, dtype=np.float64) for x, _y in blocks]) if blocks else np.zeros(0)
+        y = np.concatenate([np.asarray(y, dtype=np.float64) for _x, y in blocks]) if blocks else np.zeros(0)
+        return cls(x, y, offsets, labels)
+
+    @classmethod
+    def from_sweeps(cls, x: np.ndarray, y: np.ndarray, offsets: np.ndarray = None) -> "CurveFamily":
+
+        """
+            sweep을 이어 붙인 컬럼(x가 첫 값으로 돌아오는 곳에서 다음 sweep 시작)을 복사 없이 family로.
+            여러 y 컬럼이 같은 x를 쓰면 sweep_offsets(x)를 한 번 계산해 넘기면 된다.
+        """
+
+        return cls(x, y, sweep_offsets(x) if offsets is None else offsets)
+
+    @property
+    def connect(self) -> np.ndarray:
+
+        """pyqtgraph connect 배열: i번째 점을 i+1번째 점과 이을지 (member 마지막 점에서 False)"""
+
+        if self._connect is None:
+            connect = np.ones(len(self.y), dtype=bool)
+            if len(connect):
+                connect[self.offsets[1:] - 1] = False
+                connect[-1] = False
+            self._connect = connect
+        return self._connect
+
+    def member(self, i: int) -> int:
+
+        """sample index i가 속한 member 번호"""
+
+        return int(np.searchsorted(self.offsets, i, side="right")) - 1
+
+    def label(self, k: int) -> str:
+        return self.labels[k] if self.labels else f"#{k}"
+
+    def same_as(self, other) -> bool:
+
+        """other가 같은 배열/경계를 가진 family인지 (다시 그릴 필요 없음)"""
+
+        if self is other: return True
+        if not isinstance(other, CurveFamily): return False
+        same = lambda a, b: a is b or (
+            isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and a.shape == b.shape and a.strides == b.strides
+            and a.__array_interface__["data"][0] == b.__array_interface__["data"][0]
+        )
+        return same(self.x, other.x) and same(self.y, other.y) and np.array_equal(self.offsets, other.offsets) and self.labels == other.labels
+
+def sweep_offsets(x: np.ndarray) -> np.ndarray:
+
+    """
+        x가 첫 값으로 돌아오는 곳(새 sweep 시작)의 index. 첫 값은 항상 0.
+        (같은 값이 연속으로 나오면 처음 것만 시작으로 봄. 올라가는/내려가는 sweep 모두 가능)
+    """
+
+    x = np.asarray(x)
+    if len(x) < 2: return np.zeros(1 if len(x) else 0, dtype=np.int64)
+    starts = np.flatnonzero((x[1:] == x[0]) & (x[1:] != x[:-1])) + 1
+    return np.concatenate(([0], starts)).astype(np.int64)
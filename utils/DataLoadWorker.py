@@ -0,0 +1,187 @@
+from __future__ import annotations
+import os, threading, logging
+import pandas as pd
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from utils.utils import lisToCSV, qimage_to_rgba_numpy
+from utils.LazyColumnTable import LazyColumnTable
+from utils.CsvIngest import IngestOptions, IngestStats, iter_csv_chunks, read_csv
+from utils.ImageCache import IMAGE_CACHE, ImagePyramid
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from utils.SSHManager import SSHManager
+
+# streaming 모드: 이 크기 이상의 csv만 조각 단위로 내보냄 (작은 파일은 한 번에 읽는 편이 빠름)
+STREAM_MIN_BYTES = 8 * 1024 * 1024
+# ingest 설정에 chunk_rows가 없을 때 streaming 조각 크기
+STREAM_CHUNK_ROWS = 50_000
+
+class DataLoadCancelled(Exception):
+    pass
+
+class DataLoadSignals(QObject):
+
+    # (generation, data, file type)
+    loaded = pyqtSignal(int, object, str)
+    # (generation, (조각 DataFrame, 전체 컬럼 이름 리스트), file type) - streaming 모드에서 조각마다
+    chunk = pyqtSignal(int, object, str)
+    # (generation, error message)
+    failed = pyqtSignal(int, str)
+
+class DataLoadWorker(QRunnable):
+
+    """
+        DataInterface의 다운로드 + 파싱을 GUI 스레드 밖(QThreadPool)에서 수행하는 작업.
+        단계 사이마다 cancel_event를 확인해, 같은 인터페이스에 더 새로운 갱신이 오면 남은 작업을 버린다.
+
+        Args:
+            ssh (SSHManager): SSHManager 인스턴스
+            remote_path (str): 서버 데이터 파일 경로
+            generation (int): 요청 번호 (결과를 받을 때 최신 요청인지 확인용)
+            cancel_event (threading.Event): set 되면 남은 단계를 중단
+            temp_tag (str): 로컬 임시 파일 이름 충돌 방지용 태그
+            lazy_columns (bool, optional): True면 csv/lis를 DataFrame 대신 LazyColumnTable로 반환
+            preload_columns (list[str], optional): lazy 모드에서 미리(워커 스레드에서) 읽어 둘 컬럼. 없으면 첫 번째 컬럼.
+            ingest (IngestOptions, optional): csv 파싱 설정 (엔진, dtype, chunk)
+            stream (bool, optional): True면 큰 csv/lis를 조각 단위로 파싱하며 조각마다 signals.chunk를 보냄
+    """
+
+    def __init__(
+            self,
+            ssh: "SSHManager",
+            remote_path: str,
+            generation: int,
+            cancel_event: threading.Event,
+            temp_tag: str,
+            lazy_columns: bool = False,
+            preload_columns: list[str] = None,
+            ingest: IngestOptions = None,
+            stream: bool = False
+        ):
+        super().__init__()
+        self.ssh = ssh
+        self.remote_path = remote_path
+        self.generation = generation
+        self.cancel_event = cancel_event
+        self.temp_tag = temp_tag
+        self.lazy_columns = lazy_columns
+        self.preload_columns = list(preload_columns or [])
+        self.ingest = ingest or IngestOptions()
+        self.stream = stream
+        self.signals = DataLoadSignals()
+
+    def _check(self):
+        if self.cancel_event.is_set():
+            raise DataLoadCancelled()
+
+    def _temp_path(self, ext: str) -> str:
+
+        # 작업마다 다른 이름을 써서, 겹쳐 실행되는 작업끼리 같은 파일을 덮어쓰지 않도록 함
+        os.makedirs("./temp", exist_ok=True)
+        stem = os.path.splitext(os.path.basename(self.remote_path))[0]
+        return f"./temp/{stem}_{self.temp_tag}_{self.generation}{ext}"
+
+    def _stream_csv(self, raw: bytes, file_type: str, usecols: list[str], columns: list[str]) -> pd.DataFrame:
+
+        """조각 단위로 파싱하면서 조각마다 signals.chunk를 보내고, 끝나면 전체 DataFrame 반환"""
+
+        options = IngestOptions(self.ingest.engine, self.ingest.float_dtype, self.ingest.chunk_rows or STREAM_CHUNK_ROWS)
+        stats = IngestStats(options.resolved_engine(), len(raw))
+        parts = []
+        for part in iter_csv_chunks(raw, options, usecols, stats):
+            self._check()
+            if columns is None: columns = part.columns.tolist()
+            self.signals.chunk.emit(self.generation, (part, columns), file_type)
+            parts.append(part)
+        logging.info(f"DataLoadWorker: streamed {self.remote_path} ({stats})")
+        return pd.concat(parts, ignore_index=True) if len(parts) > 1 else parts[0]
+
+    def _parse_csv(self, raw: bytes, file_type: str):
+        stream = self.stream and len(raw) >= STREAM_MIN_BYTES
+
+        if not self.lazy_columns:
+            if stream: return self._stream_csv(raw, file_type, None, None)
+            df, stats = read_csv(raw, self.ingest)
+            logging.info(f"DataLoadWorker: parsed {self.remote_path} ({stats})")
+            return df
+
+        # header만 읽고, 현재 플롯 중인 컬럼(없으면 첫 컬럼)만 미리 파싱
+        table = LazyColumnTable(raw, self.ingest)
+        preload = [c for c in self.preload_columns if c in table.columns] or table.columns[:1]
+        if stream:
+            table.store(self._stream_csv(raw, file_type, preload, table.columns))
+        else:
+            table.load(preload)
+        return table
+
+    def _load_image(self, ssh: "SSHManager") -> ImagePyramid:
+
+        """png를 디코딩해 ImagePyramid로. 경로/수정 시간/크기가 같으면 다운로드/디코딩 없이 IMAGE_CACHE 사용."""
+
+        st = ssh.stat(self.remote_path)
+        key = (self.remote_path, st.st_mtime, st.st_size)
+        pyramid = IMAGE_CACHE.get(key)
+        if pyramid is not None:
+            logging.info(f"DataLoadWorker: {self.remote_path} unchanged, using cached image")
+            return pyramid
+
+        raw = ssh.get_bytes(self.remote_path)
+        logging.info(f"DataLoadWorker: downloaded {self.remote_path} ({len(raw)} bytes)")
+        self._check()
+        pyramid = ImagePyramid(qimage_to_rgba_numpy(raw))
+        IMAGE_CACHE.put(key, pyramid)
+        return pyramid
+
+    def load(self, ssh: "SSHManager" = None):
+
+        """
+            다운로드 + 파싱 후 (data, file type) 반환.
+            ssh를 주면 그 SFTP 채널을 사용 (run은 작업마다 open_session으로 연 채널을 넘김). 없으면 self.ssh.
+        """
+
+        ssh = ssh or self.ssh
+        self._check()
+        lower = self.remote_path.lower()
+        if lower.endswith(".png"):
+            return self._load_image(ssh), "png"
+
+        raw = ssh.get_bytes(self.remote_path)
+        logging.info(f"DataLoadWorker: downloaded {self.remote_path} ({len(raw)} bytes)")
+        self._check()
+
+        if lower.endswith(".csv"):
+            return self._parse_csv(raw, "csv"), "csv"
+
+        if lower.endswith(".lis"):
+            # eishin은 파일 경로를 받으므로 lis만 로컬에 기록
+            local_path = self._temp_path(".lis")
+            csv_path = local_path[:-4] + ".csv"
+            try:
+                with open(local_path, "wb") as f:
+                    f.write(raw)
+                lisToCSV(local_path)
+                self._check()
+                with open(csv_path, "rb") as f:
+                    return self._parse_csv(f.read(), "lis"), "lis"
+            finally:
+                for path in (local_path, csv_path):
+                    try: os.remove(path)
+                    except OSError: pass
+
+        raise ValueError(f"Unsupported file type: {self.remote_path}")
+
+    def run(self):
+        session = None
+        try:
+            # 공유 SFTP 채널은 GUI 스레드, 다른(이전) 로드 작업과 동시에 쓸 수 없으므로 작업마다 채널을 따로 엶
+            session = self.ssh.open_session()
+            data, file_type = self.load(session)
+            self._check()
+            self.signals.loaded.emit(self.generation, data, file_type)
+        except DataLoadCancelled:
+            logging.info(f"DataLoadWorker: cancelled stale load #{self.generation} of {self.remote_path}")
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        finally:
+            if session is not None: session.close()
@@ -0,0 +1,240 @@
+from __future__ import annotations
+import threading, logging
+import numpy as np
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal
+
+from utils.FileWatcherThread import FileWatcherThread
+from utils.DataLoadWorker import DataLoadWorker
+from utils.LazyColumnTable import LazyColumnTable
+from utils.CsvIngest import IngestOptions
+from utils.ImageCache import ImagePyramid
+from utils.utils import read_only_frame
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from utils.SSHManager import SSHManager
+
+class SharedDataset(QObject):
+
+    """
+        서버 파일 하나에 대한 공유 데이터.
+        구독한 DataInterface가 몇 개든 파일 감시 스레드 하나, 갱신마다 다운로드/파싱 한 번만 수행하고,
+        결과는 읽기 전용(배열 writeable=False)으로 모든 구독자에게 같은 객체를 보낸다.
+        DatasetRegistry.acquire / release로 참조 수를 관리하며, 마지막 구독자가 release하면 감시/로드를 멈춘다.
+
+        Args:
+            ssh (SSHManager): SSHManager 인스턴스
+            path (str): 서버 데이터 파일 경로
+            lazy_columns (bool, optional): csv/lis를 LazyColumnTable로 로드할지 여부
+            ingest (IngestOptions, optional): csv 파싱 설정
+            stream (bool, optional): 큰 파일을 조각 단위로 로드할지 여부
+    """
+
+    # (generation) - 새 로드 시작
+    loadStarted = pyqtSignal(int)
+    # (generation, data, file type) - DataLoadSignals와 같은 형식
+    loaded = pyqtSignal(int, object, str)
+    chunk = pyqtSignal(int, object, str)
+    failed = pyqtSignal(int, str)
+    # (generation) - 로드가 취소됨
+    loadCancelled = pyqtSignal(int)
+
+    # 멈추는 중인 감시 스레드 (스레드가 끝나기 전에 QThread 객체가 GC되지 않도록 보관)
+    _stoppingWatchers: set[FileWatcherThread] = set()
+
+    def __init__(self, ssh: "SSHManager", path: str, lazy_columns: bool = False, ingest: IngestOptions = None, stream: bool = False):
+        super().__init__()
+        self.ssh = ssh
+        self.path = path
+        self.lazy_columns = lazy_columns
+        self.ingest = ingest or IngestOptions()
+        self.stream = stream
+
+        # 구독자: 현재 플롯 중인 컬럼을 알려 주는 함수 (lazy 모드의 미리 읽기용)
+        self._subscribers: dict[object, callable] = {}
+
+        # 마지막으로 로드된 결과 (새 구독자에게 바로 전달)
+        self.generation = 0
+        self.data = None
+        self.fileType: str = None
+        self.dataGeneration = 0
+
+        self._cancelEvent: threading.Event = None
+        self._worker: DataLoadWorker = None
+
+        self.watcher = self._startWatcher()
+
+    def _startWatcher(self) -> FileWatcherThread:
+        watcher = FileWatcherThread(self.ssh, self.path)
+        watcher.file_updated.connect(self.reload)
+        watcher.start()
+        return watcher
+
+    def _stopWatcher(self):
+
+        # 감시 스레드는 최대 1초 뒤에 끝나므로, 기다리지 않고 끝날 때까지 참조만 유지
+        watcher = self.watcher
+        watcher.stop()
+        if watcher.isRunning():
+            SharedDataset._stoppingWatchers.add(watcher)
+            watcher.finished.connect(lambda: SharedDataset._stoppingWatchers.discard(watcher))
+
+    @property
+    def refcount(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, key, plotted_columns: callable = None):
+        self._subscribers[key] = plotted_columns or (lambda: [])
+
+    def unsubscribe(self, key):
+        self._subscribers.pop(key, None)
+
+    def isLoading(self) -> bool:
+        return self._cancelEvent is not None and not self._cancelEvent.is_set() and self._worker is not None
+
+    def reload(self, *_):
+
+        """파일을 다시 다운로드 + 파싱 (진행 중인 이전 로드는 취소)"""
+
+        if self._cancelEvent is not None:
+            self._cancelEvent.set()
+        self.generation += 1
+        self._cancelEvent = threading.Event()
+
+        # 모든 구독자가 플롯 중인 컬럼의 합집합을 미리 읽음
+        preload = []
+        for plotted_columns in self._subscribers.values():
+            preload += [c for c in plotted_columns() if c not in preload]
+
+        worker = DataLoadWorker(
+            self.ssh, self.path, self.generation, self._cancelEvent, f"shared{id(self)}",
+            lazy_columns=self.lazy_columns,
+            preload_columns=preload,
+            ingest=self.ingest,
+            stream=self.stream
+        )
+        worker.signals.loaded.connect(self._onLoaded)
+        worker.signals.chunk.connect(self.chunk)
+        worker.signals.failed.connect(self._onFailed)
+        self._worker = worker  # signals GC 방지
+        self.loadStarted.emit(self.generation)
+        QThreadPool.globalInstance().start(worker)
+
+    def cancel(self):
+
+        """진행 중인 로드 취소 (모든 구독자에게 적용)"""
+
+        if not self.isLoading(): return
+        self._cancelEvent.set()
+        self._worker = None
+        self.loadCancelled.emit(self.generation)
+
+    def _onLoaded(self, generation: int, data, file_type: str):
+        if generation != self.generation: return
+        self._worker = None
+
+        # 구독자끼리 같은 객체를 공유하므로 읽기 전용으로 (ImagePyramid는 이미 읽기 전용)
+        if isinstance(data, np.ndarray):
+            data.flags.writeable = False
+        elif not isinstance(data, (LazyColumnTable, ImagePyramid)):
+            data = read_only_frame(data)
+
+        self.data = data
+        self.fileType = file_type
+        self.dataGeneration = generation
+        self.loaded.emit(generation, data, file_type)
+
+    def _onFailed(self, generation: int, message: str):
+        if generation != self.generation: return
+        self._worker = None
+        self.failed.emit(generation, message)
+
+    def setSsh(self, ssh: "SSHManager"):
+
+        """
+            다시 연결된 경우: 이전 연결의 로드/감시를 멈추고 새 연결로 감시를 다시 시작 (새 감시 스레드가 첫 확인에서 다시 로드함).
+            객체는 그대로라 기존 구독자와 signal 연결이 유지된다.
+        """
+
+        self.cancel()
+        self._stopWatcher()
+        self.ssh = ssh
+        self.watcher = self._startWatcher()
+
+    def close(self):
+        self.cancel()
+        self.data = None
+        self._stopWatcher()
+
+class DatasetRegistry:
+
+    """
+        서버 경로별 SharedDataset 저장소. 같은 파일을 보는 DataInterface들은 SharedDataset 하나를 공유한다.
+
+            dataset = registry.acquire(interface, ssh, path, ...)
+            ...
+            registry.release(interface, dataset)  # 마지막 구독자면 감시/로드 중단
+    """
+
+    def __init__(self):
+        self._datasets: dict[str, SharedDataset] = {}
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def acquire(
+            self,
+            key,
+            ssh: "SSHManager",
+            path: str,
+            plotted_columns: callable = None,
+            lazy_columns: bool = False,
+            ingest: IngestOptions = None,
+            stream: bool = False
+        ) -> SharedDataset:
+
+        """
+            path의 SharedDataset을 구독. 처음 구독이면 새로 만들고(감시 시작), 이미 있으면 공유한다.
+            이미 로드된 데이터(dataset.data)가 있으면 구독자가 바로 가져다 쓰면 된다.
+            (로드 설정은 처음 구독한 인터페이스의 설정을 따름)
+
+            Args:
+                key: 구독자 식별자 (보통 DataInterface)
+                ssh (SSHManager): SSHManager 인스턴스
+                path (str): 서버 데이터 파일 경로
+                plotted_columns (callable, optional): 구독자가 현재 플롯 중인 컬럼 리스트를 반환하는 함수
+                lazy_columns, ingest, stream: SharedDataset 로드 설정
+
+            Returns:
+                SharedDataset: 공유 데이터
+        """
+
+        dataset = self._datasets.get(path)
+        if dataset is not None and dataset.ssh is not ssh:
+            # 다시 연결된 경우: 다른 구독자도 계속 갱신을 받도록 같은 dataset을 새 연결로 옮김
+            logging.info(f"DatasetRegistry: ssh changed for {path}, restarting watcher")
+            dataset.setSsh(ssh)
+
+        if dataset is None:
+            dataset = SharedDataset(ssh, path, lazy_columns, ingest, stream)
+            self._datasets[path] = dataset
+            logging.info(f"DatasetRegistry: watching {path}")
+
+        dataset.subscribe(key, plotted_columns)
+        logging.info(f"DatasetRegistry: {path} has {dataset.refcount} subscriber(s)")
+        return dataset
+
+    def release(self, key, dataset: SharedDataset):
+
+        """구독 해제. 마지막 구독자였으면 감시/로드를 멈추고 registry에서 제거."""
+
+        dataset.unsubscribe(key)
+        if dataset.refcount > 0: return
+        dataset.close()
+        if self._datasets.get(dataset.path) is dataset:
+            del self._datasets[dataset.path]
+        logging.info(f"DatasetRegistry: released {dataset.path}")
+
+    def close(self):
+        for dataset in self._datasets.values(): dataset.close()
+        self._datasets.clear()
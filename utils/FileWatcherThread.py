@@ -11,6 +11,8 @@ class FileWatcherThread(QThread):
         self.remote_file_path = remote_file_path
         self.running = True
 
+    def stop(self): self.running = False
+
     def run(self):
         last_modified_time = None
         while self.running:
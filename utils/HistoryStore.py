@@ -0,0 +1,317 @@
+from __future__ import annotations
+import os, shutil, logging, itertools, hashlib
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+
+from utils.CsvIngest import IngestOptions, read_csv
+from utils.ColumnStore import PrefixBounds, as_float64_column
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from utils.LazyColumnTable import LazyColumnTable
+
+class _ColumnBlob:
+
+    """여러 run이 공유하는 컬럼 배열 하나 (내용 hash로 식별)"""
+
+    def __init__(self, key: bytes, array: np.ndarray, spillable: bool):
+        self.key = key
+        self.array: np.ndarray | None = array
+        self.nbytes = array.nbytes
+        self.length = len(array)
+        # object 컬럼은 np.save/mmap이 안 되므로 항상 RAM에 둠
+        self.spillable = spillable
+        self.spill_path: str | None = None
+        # 이 컬럼을 쓰는 run 수
+        self.refs = 0
+        # 전체 (min, max)와 앞부분 min/max (처음 필요할 때 한 번 계산, 같은 컬럼을 쓰는 run끼리 공유)
+        self.full_bounds: tuple[float, float] | None = None
+        self.bounds_known = False
+        self.prefix: PrefixBounds | None = None
+
+class _Snapshot:
+
+    """HistoryStore에 저장되는 실행(run) 하나: 컬럼 이름과 각 컬럼 blob의 key만 가진다"""
+
+    def __init__(self, index: pd.Index, columns: list[str], keys: list[bytes], source: "LazyColumnTable" = None):
+        self.index = index
+        self.columns = columns
+        self.keys = keys
+        # 컬럼 이름 -> blob key (이름이 중복되면 첫 컬럼). column()에서 리스트 탐색 없이 바로 찾음
+        self.key_of: dict[str, bytes] = {}
+        for c, key in zip(columns, keys): self.key_of.setdefault(c, key)
+        # lazy 모드에서 아직 읽지 않은 컬럼을 나중에 읽을 원본 csv 내용 (LazyColumnTable의 컬럼 캐시는 잡아 두지 않음)
+        # 메모리 예산을 넘으면 디스크로 내보내고 source_path만 남김
+        self.source: bytes | None = source.raw if source is not None else None
+        self.source_columns: set[str] = set(source.columns) if source is not None else set()
+        self.source_path: str | None = None
+        self.ingest: IngestOptions = source.ingest if source is not None else None
+
+def column_key(array: np.ndarray) -> bytes:
+
+    """
+        컬럼 배열의 내용 주소(hash). dtype/shape가 같고 값이 같으면 같은 key가 나온다.
+
+        Args:
+            array (np.ndarray): 1차원 컬럼 배열
+
+        Returns:
+            bytes: blake2b digest (16 bytes)
+    """
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{array.dtype.str}{array.shape}".encode())
+    if array.dtype == object:
+        # object 컬럼(문자열 등)은 값 기반 hash 사용
+        h.update(pd.util.hash_array(array, categorize=False).tobytes())
+    else:
+        h.update(memoryview(np.ascontiguousarray(array)).cast("B"))
+    return h.digest()
+
+def _bounds_of(values: np.ndarray) -> tuple[float, float] | None:
+
+    """float64 배열의 (min, max) (NaN 무시). 유한한 값이 없으면 None."""
+
+    if not len(values): return None
+    lo, hi = np.fmin.reduce(values), np.fmax.reduce(values)
+    if not (np.isfinite(lo) and np.isfinite(hi)): return None
+    return float(lo), float(hi)
+
+class HistoryStore:
+
+    """
+        DataInterface의 과거 데이터(run) 히스토리 저장소.
+        각 컬럼을 내용 hash로 주소화해, run 사이에 값이 같은 컬럼(x축 sweep, 변하지 않는 node 등)은 한 번만 저장하고 공유한다.
+        따라서 메모리는 실제로 바뀐 컬럼 양에 비례해 늘어난다.
+        메모리 예산을 넘으면 가장 오래 쓰이지 않은 컬럼부터 디스크(.npy)로 내보내고, 접근 시 memory-map으로 다시 읽는다.
+        호출하는 쪽에서는 list처럼 쓰면 된다.
+
+            history.append(df)
+            history[-1]   # 가장 최근 run (DataFrame)
+            len(history)
+
+        Args:
+            memory_budget_mb (float, optional): RAM에 둘 컬럼들의 최대 크기(MB). 기본값은 512.
+            spill_dir (str, optional): 디스크로 내보낼 디렉토리. 기본값은 ./temp/history/<store 번호>
+    """
+
+    _ids = itertools.count()
+
+    def __init__(self, memory_budget_mb: float = 512, spill_dir: str = None):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.spill_dir = spill_dir or os.path.join("./temp/history", f"{os.getpid()}_{next(self._ids)}")
+
+        self._snapshots: list[_Snapshot] = []
+        # key -> blob
+        self._blobs: dict[bytes, _ColumnBlob] = {}
+        # RAM에 있는 spill 가능한 blob key (LRU 순서: 앞쪽이 가장 오래 쓰이지 않은 것)
+        self._resident: OrderedDict[bytes, None] = OrderedDict()
+        self.resident_bytes = 0
+        # 모든 run의 컬럼 크기 합 (공유하지 않았다면 필요했을 크기)
+        self.logical_bytes = 0
+        # lazy run들의 원본 csv 중 RAM에 있는 크기
+        self.source_bytes = 0
+
+    def set_memory_budget(self, memory_budget_mb: float):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._enforce_budget()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def stored_bytes(self) -> int:
+
+        """공유를 반영한 실제 컬럼 저장 크기 (RAM + 디스크)"""
+
+        return sum(blob.nbytes for blob in self._blobs.values())
+
+    def append(self, df: pd.DataFrame, source: "LazyColumnTable" = None):
+
+        """
+            run 하나(DataFrame)를 히스토리에 추가. 이전 run과 같은 컬럼은 복사하지 않고 공유한다.
+
+            Args:
+                df (pd.DataFrame): run 데이터 (lazy 모드면 지금까지 읽은 컬럼만)
+                source (LazyColumnTable, optional): df에 없는 컬럼을 나중에 읽을 원본. column()에서 요청될 때 읽는다.
+        """
+
+        keys = []
+        new_bytes = 0
+        for c in df.columns:
+            key, added = self._add_column(df[c].to_numpy())
+            new_bytes += added
+            keys.append(key)
+
+        if source is not None and all(c in df.columns for c in source.columns): source = None
+        self._snapshots.append(_Snapshot(df.index, list(df.columns), keys, source))
+        if source is not None: self.source_bytes += len(source.raw)
+        logging.info(
+            f"HistoryStore: run {len(self._snapshots) - 1} added ({new_bytes / 1e6:.2f} MB new, "
+            f"stored {self.stored_bytes / 1e6:.2f} MB for {self.logical_bytes / 1e6:.2f} MB of runs)"
+        )
+        self._enforce_budget()
+
+    def _add_column(self, array: np.ndarray) -> tuple[bytes, int]:
+
+        """컬럼 하나를 저장 (같은 내용이 이미 있으면 공유). (key, 새로 저장한 크기) 반환"""
+
+        key = column_key(array)
+        blob = self._blobs.get(key)
+        added = 0
+        if blob is None:
+            # 새 컬럼만 복사 (원본 DataFrame이 나중에 바뀌어도 히스토리는 유지)
+            blob = _ColumnBlob(key, array.copy(), spillable=array.dtype != object)
+            self._blobs[key] = blob
+            # 숫자 컬럼은 RAM에 있을 때 범위를 미리 계산 (재생 시작 때 모든 run을 다시 읽지 않도록)
+            if np.issubdtype(array.dtype, np.number):
+                blob.full_bounds, blob.bounds_known = _bounds_of(as_float64_column(blob.array)), True
+            if blob.spillable:
+                self._resident[key] = None
+                self.resident_bytes += blob.nbytes
+            added = blob.nbytes
+        else:
+            self._touch(blob)
+        blob.refs += 1
+        self.logical_bytes += blob.nbytes
+        return key, added
+
+    def __getitem__(self, i: int) -> pd.DataFrame:
+
+        """i번째 run을 DataFrame으로 반환 (음수 index 지원). 디스크에 있는 컬럼은 memory-map으로 읽음."""
+
+        if i < 0: i += len(self._snapshots)
+        if not 0 <= i < len(self._snapshots):
+            raise IndexError("history index out of range")
+
+        snap = self._snapshots[i]
+        columns = {}
+        for c, key in zip(snap.columns, snap.keys):
+            blob = self._blobs[key]
+            if blob.array is not None:
+                self._touch(blob)
+                columns[c] = blob.array
+            else:
+                columns[c] = np.load(blob.spill_path, mmap_mode="r")
+        return pd.DataFrame(columns, index=snap.index, copy=False)
+
+    def column(self, i: int, name: str) -> np.ndarray | None:
+
+        """
+            i번째 run의 name 컬럼 배열을 DataFrame을 만들지 않고 바로 반환 (없으면 None).
+            공유 배열이므로 읽기 전용으로 취급해야 한다.
+        """
+
+        blob = self._blob(i, name, load=True)
+        return None if blob is None else self._array(blob)
+
+    def bounds(self, i: int, name: str, n: int = None, load: bool = True) -> tuple[float, float] | None:
+
+        """
+            i번째 run의 name 컬럼 앞 n개(None이면 전체)의 (min, max). 유한한 값이 없거나 컬럼이 없으면 None.
+            전체 범위는 컬럼마다 한 번만 계산해 보관하므로, 재생 범위처럼 모든 run을 훑어도 배열을 다시 읽지 않는다.
+
+            Args:
+                load (bool, optional): False면 lazy run에서 아직 읽지 않은 컬럼은 원본을 파싱하지 않고 None
+        """
+
+        blob = self._blob(i, name, load)
+        if blob is None: return None
+        if n is None or n >= blob.length:
+            if not blob.bounds_known:
+                blob.full_bounds, blob.bounds_known = _bounds_of(as_float64_column(self._array(blob))), True
+            return blob.full_bounds
+
+        values = as_float64_column(self._array(blob))
+        if blob.prefix is None: blob.prefix = PrefixBounds(values)
+        return blob.prefix.bounds(values, n)
+
+    def _blob(self, i: int, name: str, load: bool) -> _ColumnBlob | None:
+        if i < 0: i += len(self._snapshots)
+        if not 0 <= i < len(self._snapshots):
+            raise IndexError("history index out of range")
+
+        snap = self._snapshots[i]
+        key = snap.key_of.get(name)
+        if key is None:
+            if not load: return None
+            key = self._load_missing(snap, name)
+            if key is None: return None
+        return self._blobs[key]
+
+    def _array(self, blob: _ColumnBlob) -> np.ndarray:
+        if blob.array is not None:
+            self._touch(blob)
+            return blob.array
+        return np.load(blob.spill_path, mmap_mode="r")
+
+    def _load_missing(self, snap: _Snapshot, name: str) -> bytes | None:
+
+        """lazy run에서 아직 읽지 않은 컬럼을 원본에서 읽어 저장. 원본에 없는 컬럼이면 None."""
+
+        if name not in snap.source_columns: return None
+        raw = snap.source
+        if raw is None:
+            with open(snap.source_path, "rb") as f:
+                raw = f.read()
+
+        df, _stats = read_csv(raw, snap.ingest, usecols=[name])
+        key, _added = self._add_column(df[name].to_numpy())
+        snap.columns.append(name)
+        snap.keys.append(key)
+        snap.key_of[name] = key
+        logging.info(f"HistoryStore: loaded column {name} of a past run from its source")
+        self._enforce_budget()
+        return key
+
+    def _touch(self, blob: _ColumnBlob):
+        if blob.key in self._resident:
+            self._resident.move_to_end(blob.key)
+
+    def _enforce_budget(self):
+
+        # 가장 최근 run의 컬럼은 예산과 관계없이 RAM에 유지
+        protected = set(self._snapshots[-1].keys) if self._snapshots else set()
+
+        # lazy run의 원본 csv부터 오래된 순으로 디스크로 (가장 최근 run은 현재 데이터와 같은 원본이라 유지)
+        for i, snap in enumerate(self._snapshots[:-1]):
+            if self.resident_bytes + self.source_bytes <= self.memory_budget: break
+            if snap.source is not None: self._spill_source(i, snap)
+
+        # 최근 run의 컬럼이 LRU 앞쪽에 있어도 멈추지 않고 그 뒤의 오래된 컬럼을 계속 내보냄
+        for key in list(self._resident):
+            if self.resident_bytes <= self.memory_budget: break
+            if key in protected: continue
+            del self._resident[key]
+            self._spill(self._blobs[key])
+
+    def _spill(self, blob: _ColumnBlob):
+        if blob.spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            blob.spill_path = os.path.join(self.spill_dir, f"col_{blob.key.hex()}.npy")
+            np.save(blob.spill_path, blob.array)
+        blob.array = None
+        self.resident_bytes -= blob.nbytes
+        logging.info(f"HistoryStore: spilled column {blob.key.hex()} ({blob.nbytes / 1e6:.1f} MB, {blob.refs} runs) to {blob.spill_path}")
+
+    def _spill_source(self, i: int, snap: _Snapshot):
+        os.makedirs(self.spill_dir, exist_ok=True)
+        snap.source_path = os.path.join(self.spill_dir, f"source_{i}.csv")
+        with open(snap.source_path, "wb") as f:
+            f.write(snap.source)
+        self.source_bytes -= len(snap.source)
+        snap.source = None
+        logging.info(f"HistoryStore: spilled source of run {i} to {snap.source_path}")
+
+    def clear(self):
+
+        """모든 run과 디스크 파일 삭제"""
+
+        self._snapshots.clear()
+        self._blobs.clear()
+        self._resident.clear()
+        self.resident_bytes = 0
+        self.logical_bytes = 0
+        self.source_bytes = 0
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
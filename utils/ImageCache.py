@@ -0,0 +1,150 @@
+from __future__ import annotations
+import threading, logging, weakref
+from collections import OrderedDict
+import numpy as np
+
+# 이 크기(긴 변, 픽셀) 이하가 되면 더 줄이지 않음
+MIN_LEVEL_SIZE = 64
+
+def downsample_rgba(rgba: np.ndarray) -> np.ndarray:
+
+    """RGBA uint8 이미지를 2x2 평균으로 1/2 축소 (홀수 마지막 행/열은 버림)"""
+
+    h, w = rgba.shape[0] // 2, rgba.shape[1] // 2
+    blocks = rgba[:h * 2, :w * 2].reshape(h, 2, w, 2, rgba.shape[2]).astype(np.uint16)
+    return ((blocks.sum(axis=(1, 3)) + 2) >> 2).astype(np.uint8)
+
+class ImagePyramid:
+
+    """
+        디코딩된 RGBA 이미지와 1/2, 1/4, ... 축소본.
+        축소본은 처음 필요할 때 한 번 만들어 보관하고, 모든 배열은 읽기 전용이라 여러 PlotDock이 그대로 공유한다.
+        화면에서 이미지가 작게 보일 때는 그 크기에 맞는 축소본만 텍스처로 올린다.
+
+        Args:
+            rgba (np.ndarray): (H, W, 4) uint8 이미지
+    """
+
+    def __init__(self, rgba: np.ndarray):
+        # 호출한 쪽의 배열 flag는 건드리지 않도록 view를 읽기 전용으로
+        rgba = rgba.view()
+        rgba.flags.writeable = False
+        self.levels: list[np.ndarray] = [rgba]
+        self._lock = threading.Lock()
+
+    @property
+    def shape(self) -> tuple:
+
+        """원본 이미지 shape (H, W, 4)"""
+
+        return self.levels[0].shape
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def level_for(self, pixels_w: float, pixels_h: float) -> int:
+
+        """화면 크기 (pixels_w, pixels_h)를 확대 없이 채우는 가장 작은 level 번호 (0은 원본)"""
+
+        h, w = self.shape[:2]
+        k = 0
+        while max(h, w) // 2 >= MIN_LEVEL_SIZE and w // 2 >= pixels_w and h // 2 >= pixels_h:
+            h, w = h // 2, w // 2
+            k += 1
+        return k
+
+    def level(self, k: int) -> np.ndarray:
+
+        """k번째 축소본 (없으면 만들어 보관)"""
+
+        with self._lock:
+            while len(self.levels) <= k:
+                smaller = downsample_rgba(self.levels[-1])
+                smaller.flags.writeable = False
+                self.levels.append(smaller)
+            return self.levels[k]
+
+class ImageCache:
+
+    """
+        디코딩된 이미지(ImagePyramid) 캐시. key는 (서버 경로, 수정 시간, 크기)로, 파일이 바뀌지 않았으면 다운로드/디코딩을 건너뛴다.
+        메모리 예산을 넘으면 가장 오래 쓰이지 않은 이미지부터 버린다. (DataLoadWorker 스레드에서도 사용하므로 lock 사용)
+
+        Args:
+            memory_budget_mb (float, optional): 보관할 이미지들의 최대 크기(MB). 기본값은 256.
+    """
+
+    def __init__(self, memory_budget_mb: float = 256):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self._items: OrderedDict[tuple, ImagePyramid] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> ImagePyramid | None:
+        with self._lock:
+            pyramid = self._items.get(key)
+            if pyramid is not None: self._items.move_to_end(key)
+            return pyramid
+
+    def put(self, key: tuple, pyramid: ImagePyramid):
+        with self._lock:
+            # 같은 경로의 이전 버전은 더 쓰지 않음
+            for old in [k for k in self._items if k[0] == key[0] and k != key]:
+                del self._items[old]
+            self._items[key] = pyramid
+            while len(self._items) > 1 and sum(p.nbytes for p in self._items.values()) > self.memory_budget:
+                evicted, _ = self._items.popitem(last=False)
+                logging.info(f"ImageCache: evicted {evicted[0]}")
+
+# 프로세스 전체에서 공유하는 이미지 캐시
+IMAGE_CACHE = ImageCache()
+
+def as_rgba(img: np.ndarray) -> np.ndarray:
+
+    """이미지 배열을 (H, W, 4) uint8로 (이미 그런 배열이면 복사 없음)"""
+
+    arr = np.asarray(img)
+    if arr.ndim == 2:
+        arr = np.stack([arr, arr, arr, np.full_like(arr, 255)], axis=-1)
+    if arr.ndim != 3 or arr.shape[2] not in (3, 4):
+        raise ValueError(f"Unsupported image shape: {arr.shape}")
+    if arr.dtype != np.uint8:
+        arr = arr.astype(np.uint8, copy=False)
+    if arr.shape[2] == 3:
+        alpha = np.full((arr.shape[0], arr.shape[1], 1), 255, dtype=np.uint8)
+        arr = np.concatenate([arr, alpha], axis=2)
+    return arr
+
+# 배열 id -> (배열 weakref, ImagePyramid weakref). 둘 다 약한 참조라 이 dict가 배열을 붙잡지 않음
+# (ImagePyramid의 level 0이 원본 배열의 view라서 pyramid를 강하게 보관하면 배열도 영영 해제되지 않음)
+_array_pyramids: dict[int, tuple[weakref.ref, weakref.ref]] = {}
+
+def _drop_pyramid(ref: weakref.ref, key: int):
+    # 같은 id를 새 배열이 재사용했을 수 있으므로, 이 ref가 속한 항목일 때만 제거
+    entry = _array_pyramids.get(key)
+    if entry is not None and ref in entry: _array_pyramids.pop(key, None)
+
+def pyramid_for(img) -> ImagePyramid:
+
+    """
+        ImagePyramid는 그대로, 배열은 배열 객체마다 ImagePyramid 하나로.
+        여러 PlotDock이 같은 배열을 보이면 RGBA 변환과 축소본을 한 번만 만들어 공유한다.
+        pyramid는 그것을 쓰는 PlotDock들이 들고 있는 동안만 살아 있고, 아무도 쓰지 않으면 배열과 함께 해제된다.
+    """
+
+    if isinstance(img, ImagePyramid): return img
+    key = id(img)
+    entry = _array_pyramids.get(key)
+    if entry is not None and entry[0]() is img:
+        pyramid = entry[1]()
+        if pyramid is not None: return pyramid
+
+    pyramid = ImagePyramid(as_rgba(img))
+    drop = lambda ref, key=key: _drop_pyramid(ref, key)
+    try:
+        ref = weakref.ref(img, drop)
+    except TypeError:
+        # weakref를 지원하지 않는 객체(list 등)는 공유하지 않음
+        return pyramid
+    _array_pyramids[key] = (ref, weakref.ref(pyramid, drop))
+    return pyramid
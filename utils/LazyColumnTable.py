@@ -0,0 +1,59 @@
+from __future__ import annotations
+import io, logging, threading
+import pandas as pd
+
+from utils.CsvIngest import IngestOptions, read_csv
+
+class LazyColumnTable:
+
+    """
+        넓은 csv 결과 파일을 위한 지연 컬럼 로더.
+        header(컬럼 이름)만 먼저 읽고, 각 컬럼의 값은 필요할 때(플롯에 체크되거나 x축으로 선택될 때) usecols로 읽는다.
+        한 번 읽은 컬럼은 이 객체(= 데이터 버전 하나)에 캐시되므로, 파일이 갱신되면 새 객체를 만들면 된다.
+
+        Args:
+            raw (bytes): csv 파일 내용
+            ingest (IngestOptions, optional): 컬럼을 읽을 때 사용할 파싱 설정
+    """
+
+    def __init__(self, raw: bytes, ingest: IngestOptions = None):
+        self.raw = raw
+        self.ingest = ingest or IngestOptions()
+        self.columns: list[str] = pd.read_csv(io.BytesIO(raw), comment='#', nrows=0).columns.tolist()
+        self._cache: dict[str, pd.Series] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def loaded_columns(self) -> list[str]:
+        return [c for c in self.columns if c in self._cache]
+
+    def store(self, df: pd.DataFrame):
+
+        """이미 파싱된 컬럼들(예: streaming으로 읽은 결과)을 캐시에 추가"""
+
+        with self._lock:
+            for c in df.columns:
+                if c in self.columns: self._cache[c] = df[c]
+
+    def load(self, columns) -> pd.DataFrame:
+
+        """
+            columns의 값을 반환. 아직 읽지 않은 컬럼만 한 번의 read_csv(usecols=...)로 읽어 캐시에 추가한다.
+
+            Args:
+                columns (iterable[str]): 컬럼 이름들 (header에 없는 이름은 무시)
+
+            Returns:
+                pd.DataFrame: 요청한 컬럼들 (header 순서)
+        """
+
+        wanted = set(columns)
+        wanted = [c for c in self.columns if c in wanted]
+
+        with self._lock:
+            missing = [c for c in wanted if c not in self._cache]
+            if missing:
+                df, _ = read_csv(self.raw, self.ingest, usecols=missing)
+                for c in missing: self._cache[c] = df[c]
+                logging.info(f"LazyColumnTable: loaded {len(missing)} of {len(self.columns)} columns: {missing}")
+            return pd.DataFrame({c: self._cache[c] for c in wanted})
@@ -0,0 +1,147 @@
+from __future__ import annotations
+import numpy as np
+
+# 첫 level의 bucket 크기와 level 사이 배율 (전체 추가 메모리: 원본의 약 1/3)
+BASE_BUCKET = 8
+LEVEL_FACTOR = 4
+
+class MinMaxPyramid:
+
+    """
+        y 배열의 다중 해상도 min/max 요약 (level마다 bucket 크기가 BASE_BUCKET * LEVEL_FACTOR**k).
+        데이터 버전마다 한 번 만들어 두고, 화면 범위/픽셀 폭이 바뀔 때마다 그에 맞는 level에서
+        bucket마다 (min, max) 두 점만 꺼내 그린다. bucket의 최솟값/최댓값을 그대로 쓰므로 peak는 사라지지 않는다.
+
+            pyramid = MinMaxPyramid(x, y)
+            xs, ys = pyramid.decimate(x0, x1, pixels)
+
+        x는 오름차순이어야 한다 (sorted가 False면 decimate는 원본을 그대로 반환).
+
+        Args:
+            x (np.ndarray): x 값 (1차원)
+            y (np.ndarray): y 값 (x와 같은 길이)
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray):
+        self.x = x
+        self.y = y
+        self.n = len(y)
+        self.sorted = self.n < 2 or not bool((np.diff(x) < 0).any())
+
+        # level별 (bucket 크기, bucket min, bucket max). 마지막의 덜 찬 bucket은 포함하지 않음 (decimate에서 원본으로 처리)
+        self.levels: list[tuple[int, np.ndarray, np.ndarray]] = []
+        if not self.sorted: return
+
+        size = BASE_BUCKET
+        m = self.n // size
+        if m < 2: return
+        block = np.asarray(y[:m * size], dtype=np.float64).reshape(m, size)
+        mn, mx = np.fmin.reduce(block, axis=1), np.fmax.reduce(block, axis=1)
+        while True:
+            self.levels.append((size, mn, mx))
+            m = len(mn) // LEVEL_FACTOR
+            if m < 2: break
+            size *= LEVEL_FACTOR
+            mn = np.fmin.reduce(mn[:m * LEVEL_FACTOR].reshape(m, LEVEL_FACTOR), axis=1)
+            mx = np.fmax.reduce(mx[:m * LEVEL_FACTOR].reshape(m, LEVEL_FACTOR), axis=1)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(mn.nbytes + mx.nbytes for _size, mn, mx in self.levels)
+
+    def covers(self, x: np.ndarray, y: np.ndarray) -> bool:
+
+        """x, y가 이 pyramid를 만든 배열과 같은 메모리의 앞부분(prefix)인지. 그렇다면 다시 만들 필요 없음."""
+
+        for a, b in ((x, self.x), (y, self.y)):
+            if not isinstance(a, np.ndarray) or a.dtype != b.dtype or a.strides != b.strides: return False
+            if a.__array_interface__["data"][0] != b.__array_interface__["data"][0]: return False
+        return len(y) <= self.n and len(x) == len(y)
+
+    def _segment(self, a: int, b: int, buckets: int) -> tuple[np.ndarray, np.ndarray]:
+
+        """[a, b) 구간을 bucket 약 buckets개로 요약. 점이 충분히 적으면 원본 그대로."""
+
+        if b - a <= 2 * buckets or not self.levels:
+            return self.x[a:b], self.y[a:b]
+
+        # bucket 수가 buckets 이상 남는 가장 거친 level
+        level = None
+        for size, mn, mx in self.levels:
+            if (b - a) // size < buckets: break
+            level = (size, mn, mx)
+        if level is None:
+            return self.x[a:b], self.y[a:b]
+
+        size, mn, mx = level
+        k0 = -(-a // size)
+        k1 = min(b // size, len(mn))
+        if k1 <= k0:
+            return self.x[a:b], self.y[a:b]
+
+        # 앞/뒤의 bucket에 다 들어가지 않는 부분(각각 size개 미만)은 더 고운 level로
+        head = self._segment(a, k0 * size, buckets)
+        tail = self._segment(k1 * size, b, buckets)
+        bx = np.repeat(self.x[k0 * size:k1 * size:size], 2)
+        by = np.column_stack((mn[k0:k1], mx[k0:k1])).ravel()
+        return np.concatenate((head[0], bx, tail[0])), np.concatenate((head[1], by, tail[1]))
+
+    def decimate(self, x0: float, x1: float, pixels: int, n: int = None) -> tuple[np.ndarray, np.ndarray]:
+
+        """
+            화면 x 범위 [x0, x1]와 픽셀 폭에 맞춘 점들.
+            보이는 구간은 픽셀당 bucket 하나 정도로, 바깥 구간은 전체 데이터 기준의 거친 level로 요약해
+            전체 범위(autorange용 bounds)는 그대로 유지한다.
+
+            Args:
+                x0, x1 (float): 화면 x 범위
+                pixels (int): 화면 폭 (픽셀)
+                n (int, optional): 앞에서부터 사용할 점 수 (기본값은 전체)
+
+            Returns:
+                tuple[np.ndarray, np.ndarray]: 그릴 x, y
+        """
+
+        n = self.n if n is None else min(n, self.n)
+        if not self.sorted:
+            return self.x[:n], self.y[:n]
+
+        pixels = max(int(pixels), 1)
+        x = self.x[:n]
+        a = max(int(np.searchsorted(x, x0, side="left")) - 1, 0)
+        b = min(int(np.searchsorted(x, x1, side="right")) + 1, n)
+        if b <= a:
+            a, b = 0, n
+
+        # 화면 밖은 전체 구간을 화면 폭에 그렸을 때와 같은 해상도
+        parts = [
+            self._segment(0, a, max(pixels * a // n, 1)),
+            self._segment(a, b, pixels),
+            self._segment(b, n, max(pixels * (n - b) // n, 1))
+        ]
+        return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+if __name__ == "__main__":
+
+    # 벤치마크: python -m utils.MinMaxPyramid
+    import time
+
+    rows, pixels = 5_000_000, 1600
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 1e-3, rows)
+    y = np.sin(x * 2e4) + rng.standard_normal(rows) * 0.01
+    y[rows // 3] = 5.0  # 한 점짜리 peak
+
+    t0 = time.perf_counter()
+    pyramid = MinMaxPyramid(x, y)
+    build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for i in range(100):
+        xs, ys = pyramid.decimate(x[0] + i * 1e-6, x[-1] - i * 1e-6, pixels)
+    query = (time.perf_counter() - t0) / 100
+
+    zoom_x, zoom_y = pyramid.decimate(x[rows // 3 - 1000], x[rows // 3 + 1000], pixels)
+    print(f"build {build * 1e3:.1f} ms ({pyramid.nbytes / 1e6:.1f} MB for {y.nbytes / 1e6:.1f} MB), "
+          f"full view {query * 1e3:.2f} ms -> {len(xs)} points (peak kept: {ys.max() == y.max()}, bounds kept: {ys.min() == y.min() and xs[0] == x[0] and xs[-1] == x[-1]}), "
+          f"zoomed -> {len(zoom_x)} points")
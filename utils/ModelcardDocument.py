@@ -0,0 +1,106 @@
+from __future__ import annotations
+import re
+
+from utils.utils import patch_modelcard_content_inplace
+
+class ModelcardDocument:
+
+    """
+        params 파일(modelcard) 템플릿을 한 번 파싱해, 모든 key/value의 정확한 위치(span)를 기록해 두는 클래스.
+        저장 시에는 값이 바뀐 key의 value 조각만 갈아 끼워 결과를 만든다.
+
+        결과는 patch_modelcard_content_inplace(template, params, section=None, insert_missing=True)와
+        바이트 단위로 동일하다. (인덱싱에 같은 정규식/같은 줄 단위 처리를 사용하기 때문)
+        render에 인덱싱 때와 다른 key 집합이 들어오면 매칭 결과가 달라질 수 있으므로 기존 함수로 처리한다.
+
+        Args:
+            template_content (str): 템플릿 params 파일 내용
+            keys (iterable[str]): 인덱싱할 파라미터 key들 (보통 parseParamsFile 결과의 key)
+    """
+
+    def __init__(self, template_content: str, keys):
+
+        self.template_content = template_content
+        self.keys = frozenset(keys)
+
+        # key -> [(key_start, key_end, val_start, val_end), ...]  (template 기준 offset)
+        self.spans: dict[str, list[tuple[int, int, int, int]]] = {}
+
+        # template을 "고정 텍스트 / value 조각"으로 나눈 리스트와, key별 value 조각의 index
+        self._parts: list[str] = []
+        self._slots: dict[str, list[int]] = {}
+        self._values: dict[str, str | None] = {}
+        self._rendered: str | None = template_content
+
+        self._build()
+
+    def _build(self):
+
+        if not self.keys:
+            self._parts = [self.template_content]
+            return
+
+        # patch_modelcard_content_inplace와 동일한 패턴 (긴 key 우선, 대소문자 구분)
+        key_alt = "|".join(re.escape(k) for k in sorted(self.keys, key=len, reverse=True))
+        pattern = re.compile(
+            rf'(?P<plus>\+)?'
+            rf'(?P<key>(?<![A-Za-z0-9_])(?:{key_alt})(?![A-Za-z0-9_]))'
+            rf'(?P<ws1>\s*)=(?P<ws2>\s*)(?P<val>[^\s]+)'
+        )
+
+        offset = 0
+        last = 0
+        for line in self.template_content.splitlines(True):
+            if not line.lstrip().startswith("*"):
+                for m in pattern.finditer(line):
+                    key = m.group("key")
+                    val_start, val_end = offset + m.start("val"), offset + m.end("val")
+                    self.spans.setdefault(key, []).append(
+                        (offset + m.start("key"), offset + m.end("key"), val_start, val_end)
+                    )
+
+                    self._parts.append(self.template_content[last:val_start])
+                    self._slots.setdefault(key, []).append(len(self._parts))
+                    self._parts.append(self.template_content[val_start:val_end])
+
+                    # 같은 key가 여러 번 나오고 값이 서로 다르면 None (다음 render에서 반드시 교체)
+                    prev = self._values.get(key, m.group("val"))
+                    self._values[key] = prev if prev == m.group("val") else None
+                    last = val_end
+            offset += len(line)
+        self._parts.append(self.template_content[last:])
+
+    def render(self, params: dict[str, str]) -> str:
+
+        """
+            params 값을 반영한 modelcard 내용을 반환.
+            이전 render 이후 값이 바뀐 key의 value 조각만 교체하고, 파일에 없던 key는 끝에 +key = value로 추가한다.
+
+            Args:
+                params (dict[str, str]): key:value 딕셔너리
+
+            Returns:
+                str: patch_modelcard_content_inplace(..., section=None, insert_missing=True)와 동일한 결과
+        """
+
+        if params.keys() != self.keys:
+            return patch_modelcard_content_inplace(self.template_content, params, section=None, insert_missing=True)
+        if not params:
+            return self.template_content
+
+        # 바뀐 값만 교체
+        for key, slots in self._slots.items():
+            value = str(params[key])
+            if self._values[key] != value:
+                self._values[key] = value
+                for i in slots: self._parts[i] = value
+                self._rendered = None
+
+        if self._rendered is None:
+            self._rendered = "".join(self._parts)
+
+        # 파일에 없던 key 삽입 (순서: 긴 key 우선, 같은 길이는 params 순서)
+        missing = [k for k in sorted(params.keys(), key=len, reverse=True) if k not in self._slots]
+        if not missing:
+            return self._rendered
+        return self._rendered + "".join(f"+{k} = {params[k]}\n" for k in missing)
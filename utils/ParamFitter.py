@@ -0,0 +1,266 @@
+from __future__ import annotations
+import logging
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from utils.utils import format_param_value
+from utils.SimulationRunner import SimulationRunner
+
+def interp_columns(x_src: np.ndarray, Y_src: np.ndarray, x_dst: np.ndarray) -> np.ndarray:
+
+    """
+        여러 y 컬럼을 x_dst 위치로 한 번에 선형 보간 (컬럼별 np.interp 반복 대신 searchsorted 한 번).
+        x_src는 정렬되어 있지 않아도 되며, x_src 범위 밖의 점은 nan.
+
+        Args:
+            x_src (np.ndarray): 원본 x, shape (m,)
+            Y_src (np.ndarray): 원본 y, shape (m, k)
+            x_dst (np.ndarray): 보간할 x, shape (n,)
+
+        Returns:
+            np.ndarray: shape (n, k)
+    """
+
+    x_src = np.asarray(x_src, dtype=np.float64)
+    Y_src = np.asarray(Y_src, dtype=np.float64).reshape(len(x_src), -1)
+    x_dst = np.asarray(x_dst, dtype=np.float64)
+    if len(x_src) < 2:
+        return np.full((len(x_dst), Y_src.shape[1]), np.nan)
+
+    # sweep 방향이 반대여도 동작하도록 정렬
+    order = np.argsort(x_src, kind="stable")
+    xs, Ys = x_src[order], Y_src[order]
+
+    idx = np.clip(np.searchsorted(xs, x_dst, side="right"), 1, len(xs) - 1)
+    x0, x1 = xs[idx - 1], xs[idx]
+    dx = x1 - x0
+    w = np.divide(x_dst - x0, dx, out=np.zeros_like(x_dst), where=dx != 0)[:, None]
+    out = Ys[idx - 1] * (1.0 - w) + Ys[idx] * w
+    out[(x_dst < xs[0]) | (x_dst > xs[-1])] = np.nan
+    return out
+
+def interpolated_error(
+        x_ref: np.ndarray,
+        Y_ref: np.ndarray,
+        x_sim: np.ndarray,
+        Y_sim: np.ndarray,
+        log_scale: bool = False
+    ) -> float:
+
+    """
+        측정(reference) 곡선과 시뮬레이션 곡선 사이의 RMS 오차를 계산.
+        시뮬레이션 곡선을 reference의 x 위치로 선형 보간하며, 모든 y 컬럼을 한 번에(벡터화) 처리한다.
+        시뮬레이션 x 범위 밖의 reference 점은 비교하지 않는다.
+
+        Args:
+            x_ref (np.ndarray): reference x, shape (n,)
+            Y_ref (np.ndarray): reference y, shape (n, k)
+            x_sim (np.ndarray): 시뮬레이션 x, shape (m,)
+            Y_sim (np.ndarray): 시뮬레이션 y, shape (m, k)
+            log_scale (bool, optional): True면 |y|의 log10 차이로 비교 (전류 곡선용). 기본값은 False.
+
+        Returns:
+            float: RMS 오차. 비교 가능한 점이 없으면 inf.
+    """
+
+    x_ref = np.asarray(x_ref, dtype=np.float64)
+    Y_ref = np.asarray(Y_ref, dtype=np.float64).reshape(len(x_ref), -1)
+    if len(x_ref) == 0:
+        return float("inf")
+
+    Yi = interp_columns(x_sim, Y_sim, x_ref)
+    Yr = Y_ref
+
+    if log_scale:
+        floor = 1e-30
+        Yi = np.log10(np.maximum(np.abs(Yi), floor))
+        Yr = np.log10(np.maximum(np.abs(Yr), floor))
+
+    diff = Yi - Yr
+    diff = diff[np.isfinite(diff)]
+    if diff.size == 0:
+        return float("inf")
+    return float(np.sqrt(np.mean(diff * diff)))
+
+def nelder_mead(
+        f_batch,
+        n_dim: int,
+        step: float = 0.05,
+        max_iter: int = 100,
+        tol: float = 1e-4,
+        callback=None,
+        should_stop=None
+    ) -> tuple[np.ndarray, float]:
+
+    """
+        병렬 평가용 Nelder–Mead.
+        한 iteration에서 필요한 후보(reflection, expansion, 두 contraction)를 한 번에 f_batch로 넘겨
+        서버에서 동시에 시뮬레이션되도록 한다. 탐색은 원점(u = 0, 즉 현재 값)에서 시작한다.
+
+        Args:
+            f_batch (callable): list[np.ndarray] -> list[float]
+            n_dim (int): 파라미터 수
+            step (float, optional): 초기 simplex 크기 (상대값). 기본값은 0.05 (= ±5% 버튼).
+            max_iter (int, optional): 최대 iteration 수
+            tol (float, optional): simplex 내 오차 범위가 최적 오차의 이 비율보다 작으면 수렴으로 판단 (상대값이라 전류처럼 오차 자체가 아주 작아도 그대로 사용)
+            callback (callable, optional): (iteration, best_u, best_err)를 받는 콜백
+            should_stop (callable, optional): True를 반환하면 중단
+
+        Returns:
+            tuple[np.ndarray, float]: (최적 u, 최적 오차)
+    """
+
+    alpha, gamma, rho, sigma = 1.0, 2.0, 0.5, 0.5
+
+    simplex = np.vstack([np.zeros(n_dim), np.eye(n_dim) * step])
+    errs = np.asarray(f_batch(list(simplex)), dtype=np.float64)
+
+    for it in range(max_iter):
+        order = np.argsort(errs)
+        simplex, errs = simplex[order], errs[order]
+        if callback is not None: callback(it, simplex[0].copy(), float(errs[0]))
+        if should_stop is not None and should_stop(): break
+        if np.isfinite(errs[-1]) and errs[-1] - errs[0] <= tol * max(abs(errs[0]), np.finfo(np.float64).tiny): break
+
+        centroid = simplex[:-1].mean(axis=0)
+        worst = simplex[-1]
+
+        # 다음 단계에서 쓰일 수 있는 후보를 모두 미리 평가
+        xr = centroid + alpha * (centroid - worst)
+        xe = centroid + gamma * (xr - centroid)
+        xoc = centroid + rho * (xr - centroid)
+        xic = centroid + rho * (worst - centroid)
+        fr, fe, foc, fic = f_batch([xr, xe, xoc, xic])
+
+        if errs[0] <= fr < errs[-2]:
+            simplex[-1], errs[-1] = xr, fr
+        elif fr < errs[0]:
+            if fe < fr: simplex[-1], errs[-1] = xe, fe
+            else:       simplex[-1], errs[-1] = xr, fr
+        elif fr < errs[-1] and foc <= fr:
+            simplex[-1], errs[-1] = xoc, foc
+        elif fr >= errs[-1] and fic < errs[-1]:
+            simplex[-1], errs[-1] = xic, fic
+        else:
+            # shrink: best를 제외한 모든 점을 best 쪽으로 당긴 뒤 동시에 평가
+            simplex[1:] = simplex[0] + sigma * (simplex[1:] - simplex[0])
+            errs[1:] = f_batch(list(simplex[1:]))
+
+    best = int(np.argmin(errs))
+    return simplex[best], float(errs[best])
+
+class ParamFitThread(QThread):
+
+    """
+        favorite params를 reference 측정 곡선에 맞추는 fitting 스레드.
+        후보 평가는 SimulationRunner가 서버에서 병렬로 수행하고, 모든 평가 결과는 캐시된다.
+
+        Args:
+            runner (SimulationRunner): 후보 시뮬레이션 실행기
+            fit_keys (list[str]): fitting할 파라미터 이름 리스트
+            init_values (dict[str, float]): fitting 시작 값
+            reference (pd.DataFrame): 측정 데이터
+            x_column (str): x축 컬럼 이름 (reference, 시뮬레이션 결과 공통)
+            y_columns (list[str]): 비교할 y축 컬럼 이름 리스트 (reference, 시뮬레이션 결과 공통)
+            log_scale (bool, optional): log10(|y|)로 비교할지 여부
+            max_iter (int, optional): 최대 iteration 수
+    """
+
+    # (평가 횟수, 오차, 후보 값)
+    evaluated = pyqtSignal(int, float, dict)
+    # (iteration, 최적 오차, 최적 값)
+    iterationDone = pyqtSignal(int, float, dict)
+    # (최적 값, 최적 오차)
+    fitFinished = pyqtSignal(dict, float)
+    fitFailed = pyqtSignal(str)
+
+    def __init__(
+            self,
+            runner: SimulationRunner,
+            fit_keys: list[str],
+            init_values: dict[str, float],
+            reference: pd.DataFrame,
+            x_column: str,
+            y_columns: list[str],
+            log_scale: bool = False,
+            max_iter: int = 50
+        ):
+
+        super().__init__()
+        self.runner = runner
+        self.fit_keys = list(fit_keys)
+        self.init_values = np.array([float(init_values[k]) for k in self.fit_keys], dtype=np.float64)
+        self.x_column = x_column
+        self.y_columns = list(y_columns)
+        self.log_scale = log_scale
+        self.max_iter = max_iter
+        self.running = True
+
+        self.x_ref = reference[x_column].to_numpy(dtype=np.float64)
+        self.Y_ref = reference[self.y_columns].to_numpy(dtype=np.float64)
+
+        # 후보 key -> 오차 (모든 평가 기록)
+        self.errorCache: dict[tuple, float] = {}
+        self.evalCount = 0
+
+    def stop(self): self.running = False
+
+    def values_of(self, u: np.ndarray) -> dict[str, str]:
+
+        """
+            정규화된 u를 실제 파라미터 값 문자열로 변환.
+            값이 0이 아니면 value = init * (1 + u), 0이면 value = u.
+        """
+
+        vals = np.where(self.init_values != 0, self.init_values * (1.0 + u), u)
+        return {k: format_param_value(float(v)) for k, v in zip(self.fit_keys, vals)}
+
+    def _score(self, data: pd.DataFrame | None) -> float:
+        if data is None: return float("inf")
+        cols = [self.x_column, *self.y_columns]
+        if any(c not in data.columns for c in cols): return float("inf")
+        return interpolated_error(
+            self.x_ref, self.Y_ref,
+            data[self.x_column].to_numpy(dtype=np.float64),
+            data[self.y_columns].to_numpy(dtype=np.float64),
+            log_scale=self.log_scale
+        )
+
+    def _f_batch(self, us: list[np.ndarray]) -> list[float]:
+        if not self.running: return [float("inf")] * len(us)
+
+        candidates = [self.values_of(u) for u in us]
+        keys = [SimulationRunner.cache_key(c) for c in candidates]
+
+        # 오차 캐시에 없는 후보만 시뮬레이션 (중복 제거는 runner가 처리)
+        todo = [(k, c) for k, c in zip(keys, candidates) if k not in self.errorCache]
+        if todo:
+            outputs = self.runner.run_many([c for _, c in todo])
+            for (key, cand), data in zip(todo, outputs):
+                if key in self.errorCache: continue
+                err = self._score(data)
+                self.errorCache[key] = err
+                self.evalCount += 1
+                self.evaluated.emit(self.evalCount, err, cand)
+
+        return [self.errorCache[k] for k in keys]
+
+    def run(self):
+        try:
+            def _callback(it, u, err):
+                self.iterationDone.emit(it, err, self.values_of(u))
+
+            u_best, err_best = nelder_mead(
+                self._f_batch,
+                len(self.fit_keys),
+                max_iter=self.max_iter,
+                callback=_callback,
+                should_stop=lambda: not self.running
+            )
+            best = self.values_of(u_best)
+            logging.info(f"ParamFitThread: finished. error={err_best}, params={best}, evaluations={self.evalCount}")
+            self.fitFinished.emit(best, err_best)
+        except Exception as e:
+            logging.info(f"ParamFitThread: fitting failed: {e}")
+            self.fitFailed.emit(str(e))
@@ -0,0 +1,85 @@
+from __future__ import annotations
+import threading, logging
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from utils.SSHManager import SSHManager
+
+class RemoteFileCache:
+
+    """
+        서버 파일 내용을 경로별로 메모리에 캐시하는 클래스.
+        get 할 때마다 sftp stat 한 번으로 크기/수정 시간을 확인하고, 바뀌지 않았으면 다시 내려받지 않는다.
+
+        Args:
+            ssh (SSHManager): SSHManager 인스턴스
+    """
+
+    def __init__(self, ssh: "SSHManager"):
+        self.ssh = ssh
+
+        # remote path -> (size, mtime, content)
+        self._entries: dict[str, tuple[int, int, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, remote_path: str) -> bytes:
+
+        """
+            서버 파일 내용을 반환. 캐시된 내용의 크기/수정 시간이 서버와 같으면 전송 없이 캐시를 반환.
+
+            Args:
+                remote_path (str): 서버 파일 경로
+
+            Returns:
+                bytes: 파일 내용
+        """
+
+        return self._fetch(self.ssh, remote_path)
+
+    def _fetch(self, ssh: "SSHManager", remote_path: str) -> bytes:
+        st = ssh.stat(remote_path)
+        with self._lock:
+            entry = self._entries.get(remote_path)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime:
+            logging.info(f"RemoteFileCache: hit {remote_path}")
+            return entry[2]
+
+        # 다운로드 중 파일이 바뀌어도, 다운로드 전에 본 mtime을 저장하므로 다음 get에서 다시 받게 됨
+        data = ssh.get_bytes(remote_path)
+        with self._lock:
+            self._entries[remote_path] = (st.st_size, st.st_mtime, data)
+        logging.info(f"RemoteFileCache: fetched {remote_path} ({len(data)} bytes)")
+        return data
+
+    def invalidate(self, remote_path: str):
+
+        """캐시에서 제거. 이 프로그램이 파일을 업로드한 뒤 호출 (sftp mtime은 초 단위라 stat만으로는 변경을 놓칠 수 있음)"""
+
+        with self._lock:
+            self._entries.pop(remote_path, None)
+
+    def prefetch(self, remote_paths: list[str]) -> threading.Thread:
+
+        """
+            주어진 경로들을 백그라운드 스레드에서 미리 캐시에 받아 둔다.
+
+            Args:
+                remote_paths (list[str]): 서버 파일 경로 리스트
+        """
+
+        def _worker(paths: list[str]):
+            # GUI 스레드의 Load Params / 저장과 SFTP 채널이 섞이지 않도록 prefetch 전용 채널 사용
+            try: ssh = self.ssh.open_session()
+            except Exception as e:
+                logging.info(f"RemoteFileCache: prefetch skipped, cannot open SFTP session: {e}")
+                return
+            try:
+                for path in paths:
+                    try: self._fetch(ssh, path)
+                    except Exception as e: logging.info(f"RemoteFileCache: prefetch failed for {path}: {e}")
+            finally:
+                ssh.close()
+
+        thread = threading.Thread(target=_worker, args=(list(remote_paths),), daemon=True)
+        thread.start()
+        return thread
@@ -1,4 +1,5 @@
-import paramiko, time, logging, uuid
+import paramiko, time, logging, uuid, io, copy, threading
+from concurrent.futures import ThreadPoolExecutor
 
 class SSHManager:
     
@@ -28,10 +29,32 @@ class SSHManager:
                 self.ssh.connect(host, port, userId, password=password)
 
             self.sftp = self.ssh.open_sftp()
+
+            # paramiko SFTPClient는 여러 스레드가 동시에 쓰면 응답이 섞이므로 self.sftp 사용은 lock으로 직렬화
+            # (백그라운드 작업은 open_session으로 자기 채널을 열어 씀)
+            self._sftpLock = threading.RLock()
+            # open_session으로 만든 객체는 SSH 연결을 빌려 쓰므로 close에서 채널만 닫음
+            self._ownsConnection = True
         except Exception as e:
             print(e)
             raise Exception("SSH 서버에 접속할 수 없습니다. 인터넷 연결 상태를 확인해주세요.")
         
+    def open_session(self) -> "SSHManager":
+
+        """
+        같은 SSH 연결 위에 SFTP 채널을 하나 더 연 SSHManager를 반환한다.
+        백그라운드 스레드(데이터 로드, prefetch, fitting 등)는 이것을 쓰고 끝나면 close()로 채널을 닫는다.
+
+        Returns:
+            SSHManager: 자기 SFTP 채널을 가진 SSHManager (SSH 연결은 공유)
+        """
+
+        session = copy.copy(self)
+        session.sftp = self.ssh.open_sftp()
+        session._sftpLock = threading.RLock()
+        session._ownsConnection = False
+        return session
+
     def invoke_shell(self) -> paramiko.Channel:
 
         """
@@ -89,7 +112,8 @@ class SSHManager:
             dst (str): 다운로드한 파일을 저장할 경로 (로컬)
         """
 
-        self.sftp.get(src, dst)
+        with self._sftpLock:
+            self.sftp.get(src, dst)
 
     def put_file(self, src: str, dst: str) -> None:
 
@@ -101,7 +125,86 @@ class SSHManager:
             dst (str): 업로드할 파일을 저장할 경로 (서버)
         """
 
-        self.sftp.put(src, dst)
+        with self._sftpLock:
+            self.sftp.put(src, dst)
+
+    def stat(self, path: str) -> paramiko.SFTPAttributes:
+
+        """
+        ssh 서버 파일의 크기, 수정 시간 등을 조회한다.
+
+        Args:
+            path (str): 조회할 파일의 경로 (서버)
+
+        Returns:
+            paramiko.SFTPAttributes: st_size, st_mtime 등을 가진 파일 정보
+        """
+
+        with self._sftpLock:
+            return self.sftp.stat(path)
+
+    def get_bytes(self, src: str) -> bytes:
+
+        """
+        ssh 서버의 파일 내용을 로컬 임시 파일 없이 메모리로 내려받는다.
+
+        Args:
+            src (str): 다운로드할 파일의 경로 (서버)
+
+        Returns:
+            bytes: 파일 내용
+        """
+
+        buf = io.BytesIO()
+        with self._sftpLock:
+            self.sftp.getfo(src, buf)
+        return buf.getvalue()
+
+    def put_bytes(self, data: bytes, dst: str, atomic: bool = True) -> None:
+
+        """
+        메모리의 내용을 로컬 임시 파일 없이 ssh 서버로 업로드한다.
+        atomic=True면 같은 디렉토리의 임시 이름으로 먼저 쓴 뒤 rename하므로,
+        서버에서 파일을 감시/실행하는 쪽이 반쯤 쓰인 파일을 보는 일이 없다.
+
+        Args:
+            data (bytes): 업로드할 내용
+            dst (str): 업로드할 파일을 저장할 경로 (서버)
+            atomic (bool, optional): 임시 이름 + rename 사용 여부. 기본값은 True.
+        """
+
+        with self._sftpLock:
+            if not atomic:
+                self.sftp.putfo(io.BytesIO(data), dst, file_size=len(data))
+                return
+
+            tmp = f"{dst}.tmp-{uuid.uuid4().hex[:8]}"
+            try:
+                self.sftp.putfo(io.BytesIO(data), tmp, file_size=len(data))
+                try:
+                    # posix-rename@openssh.com: 기존 파일이 있어도 원자적으로 교체
+                    self.sftp.posix_rename(tmp, dst)
+                except IOError:
+                    # 확장을 지원하지 않는 서버: 기존 파일 제거 후 rename
+                    try: self.sftp.remove(dst)
+                    except IOError: pass
+                    self.sftp.rename(tmp, dst)
+            except Exception:
+                try: self.sftp.remove(tmp)
+                except IOError: pass
+                raise
+
+    def put_bytes_batch(self, items: list[tuple[bytes, str]]) -> None:
+
+        """
+        여러 내용을 하나의 SFTP 세션으로 연달아 업로드한다.
+
+        Args:
+            items (list[tuple[bytes, str]]): (내용, 서버 경로) 리스트
+        """
+
+        for data, dst in items:
+            self.put_bytes(data, dst)
 
     def send_command(self, cmd) -> str:
 
@@ -118,7 +221,32 @@ class SSHManager:
         print("명령어:", cmd)
         stdin, stdout, stderr = self.ssh.exec_command(cmd)
         return stdout.read().decode()
-    
+
+    def send_commands_parallel(self, cmds: list[str], max_workers: int = 4) -> list[tuple[int, str]]:
+
+        """
+        여러 명령어를 하나의 SSH 연결 위에서 동시에 실행한다.
+        paramiko는 하나의 transport에 여러 channel을 열 수 있으므로, 명령마다 새 연결을 만들지 않는다.
+
+        Args:
+            cmds (list[str]): 실행할 명령어 리스트
+            max_workers (int, optional): 동시에 실행할 최대 명령어 수. 기본값은 4.
+
+        Returns:
+            list[tuple[int, str]]: 입력 순서대로 (exit status, stdout+stderr) 리스트
+        """
+
+        def _run(cmd: str) -> tuple[int, str]:
+            stdin, stdout, stderr = self.ssh.exec_command(cmd)
+            # stderr를 따로 읽지 않으면 출력이 많은 명령은 stderr window가 차서 멈추므로 stdout에 합침
+            stdout.channel.set_combine_stderr(True)
+            out = stdout.read().decode(errors="replace")
+            return stdout.channel.recv_exit_status(), out
+
+        if not cmds: return []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(cmds)))) as pool:
+            return list(pool.map(_run, cmds))
+
     def change_file_content(self, file_path, old, new) -> str:
 
         """
@@ -137,8 +265,9 @@ class SSHManager:
 
     def close(self) -> None:
         self.sftp.close()
-        self.ssh.close()
+        if self._ownsConnection: self.ssh.close()
 
     def __del__(self) -> None:
-        self.sftp.close()
-        self.ssh.close()
\ No newline at end of file
+        # 접속에 실패한 객체에는 sftp가 없을 수 있음
+        if getattr(self, "sftp", None) is None: return
+        self.close()
\ No newline at end of file
@@ -0,0 +1,191 @@
+from __future__ import annotations
+import logging
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from utils.utils import apply_percent
+from utils.SimulationRunner import SimulationRunner
+from utils.ParamFitter import interp_columns
+
+# 곡선 하나를 스칼라 지표로 줄이는 방법들: (2N, n_points, k) -> (2N, k)
+METRICS = {
+    "curve": None,                                   # 곡선 전체 (점별 민감도의 RMS)
+    "max":   lambda Y: np.nanmax(Y, axis=1),
+    "min":   lambda Y: np.nanmin(Y, axis=1),
+    "mean":  lambda Y: np.nanmean(Y, axis=1),
+    "last":  lambda Y: Y[:, -1],
+}
+
+def normalized_sensitivities(
+        x: np.ndarray,
+        Y_plus: list[np.ndarray | None],
+        Y_minus: list[np.ndarray | None],
+        dp_rel: np.ndarray,
+        x_plus: list[np.ndarray | None],
+        x_minus: list[np.ndarray | None],
+        metric: str = "curve",
+        log_scale: bool = False
+    ) -> np.ndarray:
+
+    """
+        중앙 차분으로 정규화 민감도 S = (ΔM / M) / (Δp / p) 를 계산.
+        M(기준 값)은 (M+ + M-) / 2 로 근사하므로 기준 시뮬레이션이 따로 필요 없다.
+        모든 결과를 공통 x 격자로 보간해 (2N, n_points, k) 배열로 쌓은 뒤 한 번에 계산한다.
+
+        Args:
+            x (np.ndarray): 공통 x 격자, shape (n,)
+            Y_plus (list): 파라미터별 + 섭동 결과 y, 각 shape (m_i, k) (실패 시 None)
+            Y_minus (list): 파라미터별 - 섭동 결과 y
+            dp_rel (np.ndarray): 파라미터별 (p+ - p-) / p0, shape (N,)
+            x_plus (list): 파라미터별 + 섭동 결과 x
+            x_minus (list): 파라미터별 - 섭동 결과 x
+            metric (str, optional): METRICS의 key. 기본값은 "curve".
+            log_scale (bool, optional): True면 log10(|y|) 기준 (M 대신 Δlog10|y|를 사용)
+
+        Returns:
+            np.ndarray: 파라미터별 민감도, shape (N,). 계산 불가면 nan.
+    """
+
+    n_params = len(Y_plus)
+    x = np.asarray(x, dtype=np.float64)
+
+    # 공통 x 격자로 보간해 쌓기: (2N, n, k)
+    grids = [
+        interp_columns(xs, Ys, x) if xs is not None and Ys is not None else None
+        for xs, Ys in zip(x_plus + x_minus, Y_plus + Y_minus)
+    ]
+    k = next((g.shape[1] for g in grids if g is not None), 1)
+    stack = np.stack([g if g is not None else np.full((len(x), k), np.nan) for g in grids])
+    P, M = stack[:n_params], stack[n_params:]
+
+    if log_scale:
+        P = np.log10(np.maximum(np.abs(P), 1e-30))
+        M = np.log10(np.maximum(np.abs(M), 1e-30))
+
+    reduce = METRICS[metric]
+    if reduce is not None:
+        # (N, n, k) -> (N, k): 곡선마다 스칼라 지표
+        P, M = reduce(P), reduce(M)
+
+    diff = P - M
+    if log_scale:
+        rel = diff
+    else:
+        # 점별로 나누면 0 근처에서 발산하므로, 곡선(또는 지표)의 크기로 정규화
+        base = 0.5 * np.abs(P + M)
+        scale = np.sqrt(np.nanmean(base * base, axis=tuple(range(1, base.ndim)), keepdims=True))
+        rel = np.divide(diff, scale, out=np.full_like(diff, np.nan), where=scale > 0)
+
+    dp = np.asarray(dp_rel, dtype=np.float64).reshape((-1,) + (1,) * (rel.ndim - 1))
+    S = np.divide(rel, dp, out=np.full_like(rel, np.nan), where=dp != 0)
+
+    # 곡선/컬럼 방향으로 RMS 집계
+    with np.errstate(invalid="ignore"):
+        S = S.reshape(n_params, -1)
+        valid = np.isfinite(S)
+        cnt = valid.sum(axis=1)
+        ss = np.where(valid, S * S, 0.0).sum(axis=1)
+        return np.where(cnt > 0, np.sqrt(ss / np.maximum(cnt, 1)), np.nan)
+
+class SensitivityThread(QThread):
+
+    """
+        favorite params 각각을 ±percent 섭동한 2N개 시뮬레이션을 한 번에(동시에) 실행하고
+        정규화 민감도를 계산하는 스레드.
+
+        Args:
+            runner (SimulationRunner): 후보 시뮬레이션 실행기 (하나의 연결/업로드 배치 사용)
+            keys (list[str]): 분석할 파라미터 이름 리스트
+            values (dict[str, str]): 현재 파라미터 값
+            x_column (str): x축 컬럼 이름
+            y_columns (list[str]): 분석할 y축 컬럼 이름 리스트
+            percent (float, optional): 섭동 크기. 기본값은 0.05 (= ±5% 버튼).
+            metric (str, optional): METRICS의 key
+            log_scale (bool, optional): log10(|y|) 기준으로 계산할지 여부
+    """
+
+    # (파라미터 이름 리스트, 민감도 리스트) - 민감도 내림차순
+    sensitivityFinished = pyqtSignal(list, list)
+    sensitivityFailed = pyqtSignal(str)
+
+    def __init__(
+            self,
+            runner: SimulationRunner,
+            keys: list[str],
+            values: dict[str, str],
+            x_column: str,
+            y_columns: list[str],
+            percent: float = 0.05,
+            metric: str = "curve",
+            log_scale: bool = False
+        ):
+
+        super().__init__()
+        self.runner = runner
+        self.keys = list(keys)
+        self.values = dict(values)
+        self.x_column = x_column
+        self.y_columns = list(y_columns)
+        self.percent = percent
+        self.metric = metric
+        self.log_scale = log_scale
+        self.running = True
+
+    def stop(self): self.running = False
+
+    def _xy(self, data: pd.DataFrame | None):
+        if data is None or any(c not in data.columns for c in [self.x_column, *self.y_columns]):
+            return None, None
+        return data[self.x_column].to_numpy(dtype=np.float64), data[self.y_columns].to_numpy(dtype=np.float64)
+
+    def run(self):
+        try:
+            # ParamRowWidget의 ±% 버튼과 같은 방식으로 섭동 값 생성
+            keys, plus, minus, dp_rel = [], [], [], []
+            for key in self.keys:
+                p = apply_percent(str(self.values[key]), +self.percent)
+                m = apply_percent(str(self.values[key]), -self.percent)
+                if p is None or m is None: continue
+                p0 = float(self.values[key])
+                keys.append(key)
+                plus.append({key: p})
+                minus.append({key: m})
+                dp_rel.append((float(p) - float(m)) / p0 if p0 != 0 else 0.0)
+            if not keys:
+                self.sensitivityFailed.emit("No numeric params to perturb.")
+                return
+
+            # 2N개를 한 번의 업로드 배치 + 동시 실행으로 처리
+            if not self.running: return
+            outputs = self.runner.run_many(plus + minus)
+            # 실행 중에 중지되었으면(창 닫기 등) 결과를 버림
+            if not self.running: return
+            xy = [self._xy(d) for d in outputs]
+            xs = [a for a, _ in xy]
+            Ys = [b for _, b in xy]
+
+            x_grid = next((a for a in xs if a is not None), None)
+            if x_grid is None:
+                self.sensitivityFailed.emit("All perturbed simulations failed.")
+                return
+            x_grid = np.unique(x_grid)
+
+            n = len(keys)
+            S = normalized_sensitivities(
+                x_grid,
+                Ys[:n], Ys[n:],
+                np.asarray(dp_rel),
+                xs[:n], xs[n:],
+                metric=self.metric,
+                log_scale=self.log_scale
+            )
+
+            order = np.argsort(np.nan_to_num(-S, nan=np.inf), kind="stable")
+            ranked_keys = [keys[i] for i in order]
+            ranked_S = [float(S[i]) for i in order]
+            logging.info(f"SensitivityThread: {dict(zip(ranked_keys, ranked_S))}")
+            self.sensitivityFinished.emit(ranked_keys, ranked_S)
+        except Exception as e:
+            logging.info(f"SensitivityThread: analysis failed: {e}")
+            self.sensitivityFailed.emit(str(e))
@@ -0,0 +1,145 @@
+from __future__ import annotations
+import os, io, hashlib, logging, threading
+import pandas as pd
+
+from utils.utils import lisToCSV
+from utils.ModelcardDocument import ModelcardDocument
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from utils.SSHManager import SSHManager
+
+class SimulationRunner:
+
+    """
+        파라미터 후보 조합들을 서버에서 병렬로 시뮬레이션하고, 결과를 캐시하는 클래스.
+
+        후보 하나당 다음 과정을 거친다:
+            1. 템플릿 modelcard에 후보 값을 덮어써 고유한 이름(cand_<tag>.txt)으로 업로드
+            2. command_template의 {params}, {output}, {tag}를 치환해 실행 (후보들끼리 동시에 실행)
+            3. 결과 파일을 내려받아 DataFrame으로 로드
+
+        Args:
+            ssh (SSHManager): SSHManager 인스턴스
+            template_content (str): 템플릿 params 파일 내용
+            base_params (dict[str, str]): 후보에 없는 key에 사용할 기본 key:value
+            command_template (str): 시뮬레이션 실행 명령어. 예) bash run.sh "{params}" "{output}"
+            remote_work_dir (str): 후보 params/결과 파일을 저장할 서버 측 디렉토리
+            output_ext (str, optional): 시뮬레이션 결과 파일 확장자 ("csv" 또는 "lis"). 기본값은 "csv".
+            max_workers (int, optional): 동시에 실행할 최대 시뮬레이션 수. 기본값은 4.
+    """
+
+    def __init__(
+            self,
+            ssh: "SSHManager",
+            template_content: str,
+            base_params: dict[str, str],
+            command_template: str,
+            remote_work_dir: str,
+            output_ext: str = "csv",
+            max_workers: int = 4
+        ):
+
+        self.ssh = ssh
+        self.template_content = template_content
+        self.base_params = {k: str(v) for k, v in base_params.items()}
+        self.document = ModelcardDocument(template_content, self.base_params.keys())
+        self.command_template = command_template
+        self.remote_work_dir = remote_work_dir.rstrip("/")
+        self.output_ext = output_ext.lstrip(".").lower()
+        self.max_workers = max_workers
+
+        self.local_work_dir = "./temp/sim_runs"
+
+        # (key, value) 튜플 -> 결과 DataFrame (실패 시 None)
+        self.cache: dict[tuple, pd.DataFrame | None] = {}
+        self._lock = threading.Lock()
+        self._remote_dir_ready = False
+
+    @staticmethod
+    def cache_key(overrides: dict[str, str]) -> tuple:
+        return tuple(sorted((k, str(v)) for k, v in overrides.items()))
+
+    @staticmethod
+    def tag_of(key: tuple) -> str:
+        return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+
+    def render(self, overrides: dict[str, str]) -> str:
+
+        """후보 값을 템플릿에 덮어쓴 modelcard 내용을 반환"""
+
+        params = dict(self.base_params)
+        params.update({k: str(v) for k, v in overrides.items()})
+        return self.document.render(params)
+
+    def run_many(self, candidates: list[dict[str, str]]) -> list[pd.DataFrame | None]:
+
+        """
+            후보들을 시뮬레이션하고, 입력 순서대로 결과 DataFrame 리스트를 반환.
+            캐시에 있는 후보는 다시 실행하지 않으며, 같은 후보가 여러 번 들어와도 한 번만 실행한다.
+        """
+
+        keys = [self.cache_key(c) for c in candidates]
+
+        with self._lock:
+            pending: dict[tuple, dict[str, str]] = {}
+            for key, cand in zip(keys, candidates):
+                if key not in self.cache and key not in pending:
+                    pending[key] = cand
+
+            if pending:
+                # fitting/민감도 스레드에서 실행되므로 GUI 스레드(저장 등)와 SFTP 채널이 섞이지 않도록 전용 채널 사용
+                ssh = self.ssh.open_session()
+                try: self._run_pending(pending, ssh)
+                finally: ssh.close()
+
+            return [self.cache.get(key) for key in keys]
+
+    def _run_pending(self, pending: dict[tuple, dict[str, str]], ssh: "SSHManager"):
+
+        if not self._remote_dir_ready:
+            self.ssh.send_command(f"mkdir -p \"{self.remote_work_dir}\"")
+            self._remote_dir_ready = True
+
+        # 1. 후보 params 파일 내용을 모두 만든 뒤 한 번에 업로드
+        jobs, uploads = [], []
+        for key, cand in pending.items():
+            tag = self.tag_of(key)
+            remote_params = f"{self.remote_work_dir}/cand_{tag}.txt"
+            remote_output = f"{self.remote_work_dir}/cand_{tag}.{self.output_ext}"
+
+            uploads.append((self.render(cand).encode("utf-8"), remote_params))
+
+            # str.format은 쉘 명령어의 중괄호와 충돌하므로 단순 치환
+            cmd = (self.command_template
+                   .replace("{params}", remote_params)
+                   .replace("{output}", remote_output)
+                   .replace("{tag}", tag))
+            jobs.append((key, tag, remote_output, cmd))
+        ssh.put_bytes_batch(uploads)
+
+        # 2. 시뮬레이션 동시 실행
+        logging.info(f"SimulationRunner: running {len(jobs)} simulations (max_workers={self.max_workers})")
+        results = self.ssh.send_commands_parallel([cmd for _, _, _, cmd in jobs], max_workers=self.max_workers)
+
+        # 3. 결과 다운로드 및 로드
+        for (key, tag, remote_output, _), (status, out) in zip(jobs, results):
+            if status != 0:
+                logging.info(f"SimulationRunner: simulation {tag} exited with status {status}: {out[-500:]}")
+            self.cache[key] = self._fetch_output(ssh, tag, remote_output)
+
+    def _fetch_output(self, ssh: "SSHManager", tag: str, remote_output: str) -> pd.DataFrame | None:
+        try:
+            data = ssh.get_bytes(remote_output)
+            if self.output_ext == "lis":
+                # eishin은 파일 경로를 받으므로 lis만 로컬에 기록
+                os.makedirs(self.local_work_dir, exist_ok=True)
+                local_output = os.path.join(self.local_work_dir, f"cand_{tag}.lis")
+                with open(local_output, "wb") as f:
+                    f.write(data)
+                lisToCSV(local_output)
+                return pd.read_csv(local_output[:-4] + ".csv", comment='#')
+            return pd.read_csv(io.BytesIO(data), comment='#')
+        except Exception as e:
+            logging.info(f"SimulationRunner: failed to load output {remote_output}: {e}")
+            return None
@@ -3,33 +3,33 @@ import os, subprocess, logging, re, math
 from PyQt6.QtWidgets import QLayout
 from PyQt6.QtGui import QImage
 import numpy as np
+import pandas as pd
 
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from utils.SSHManager import SSHManager
 
-def qimage_to_rgba_numpy(img_path: str) -> np.ndarray:
+def qimage_to_rgba_numpy(source: str | bytes) -> np.ndarray:
 
     """
         PNG/JPG 등 이미지를 RGBA uint8 numpy(H, W, 4)로 변환.
-        Qt 버퍼 lifetime/stride 이슈 방지 위해 반드시 copy() 수행.
+        source는 파일 경로 또는 파일 내용(bytes). Qt 버퍼는 QImage와 함께 해제되므로 마지막에 한 번만 copy() 수행.
     """
 
-    qimg = QImage(img_path)
+    qimg = QImage.fromData(source) if isinstance(source, (bytes, bytearray)) else QImage(source)
     if qimg.isNull():
-        raise FileNotFoundError(f"이미지 로드 실패: {img_path}")
+        raise FileNotFoundError(f"이미지 로드 실패: {source if isinstance(source, str) else f'{len(source)} bytes'}")
 
-    qimg = qimg.convertToFormat(QImage.Format.Format_ARGB32)
+    # RGBA8888은 메모리상 바이트 순서가 항상 R, G, B, A라 채널 스왑(추가 복사)이 필요 없음
+    qimg = qimg.convertToFormat(QImage.Format.Format_RGBA8888)
     w, h = qimg.width(), qimg.height()
 
-    ptr = qimg.bits()
+    ptr = qimg.constBits()
     ptr.setsize(qimg.sizeInBytes())
 
-    arr = np.frombuffer(ptr, dtype=np.uint8).reshape((h, w, 4)).copy()
-
-    # Qt ARGB32는 메모리상 BGRA인 경우가 많음 -> RGBA로 스왑
-    arr = arr[:, :, [2, 1, 0, 3]]
-    return arr
+    # 행 끝 padding(bytesPerLine)을 제외한 view
+    rows = np.frombuffer(ptr, dtype=np.uint8).reshape((h, qimg.bytesPerLine()))
+    return rows[:, :w * 4].reshape((h, w, 4)).copy()
 
 def lisToCSV(path: str) -> None:
 
@@ -205,6 +205,45 @@ def patch_modelcard_content_inplace(
 
     return "".join(out_lines)
 
+def format_param_value(v: float) -> str:
+
+    """
+        파라미터 값을 params 파일에 쓸 문자열로 변환 (ParamRowWidget의 ±% 버튼과 동일한 표기).
+        정수에 충분히 가까우면 정수로, 아니면 유효숫자 6자리로 표기한다.
+    """
+
+    return str(int(round(v))) if abs(v - round(v)) < 1e-12 else f"{v:.6g}"
+
+def apply_percent(raw: str, percent: float) -> str | None:
+
+    """
+        파라미터 값 문자열에 ±percent를 적용한 새 값 문자열을 반환 (숫자가 아니면 None).
+
+        Args:
+            raw (str): 현재 값 문자열
+            percent (float): 변화율. 예) -0.05 = -5%
+    """
+
+    try: x = float(raw.strip())
+    except ValueError: return None
+    return format_param_value(x * (1.0 + percent))
+
+def read_only_frame(df: pd.DataFrame) -> pd.DataFrame:
+
+    """
+        df와 메모리를 공유하는 읽기 전용 DataFrame을 반환 (복사 없음).
+        숫자 컬럼 배열을 writeable=False로 만들어, 여러 곳에서 같은 데이터를 공유해도 실수로 값을 바꾸지 못하게 한다.
+    """
+
+    arrays = {}
+    for c in df.columns:
+        array = df[c].to_numpy()
+        if array.dtype != object:
+            array = array.view()
+            array.flags.writeable = False
+        arrays[c] = array
+    return pd.DataFrame(arrays, index=df.index, copy=False)
+
 def fmt_hybrid(v: float,
                sci_digits: int = 3,     # scientific에서 소수자리
                fixed_digits: int = 6,   # 일반표기에서 소수자리(최대)